@@ -0,0 +1,68 @@
+# benchmarks/bench_async_control.py
+"""
+Hundreds of concurrent control requests through the async API against N
+simulated devices, served in-process over ASGI. Reports request rate,
+latency and how many threads the process needed.
+
+    python -m benchmarks.bench_async_control --devices 8 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+
+async def run(app, serials, total: int, concurrency: int):
+    import httpx
+
+    latencies = []
+    peak_threads = threading.active_count()
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def request(i: int):
+            nonlocal peak_threads
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(f"/devices/{serials[i % len(serials)]}/gain", json={"gain": i % 500})
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+                peak_threads = max(peak_threads, threading.active_count())
+
+        start = time.perf_counter()
+        await asyncio.gather(*(request(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies), peak_threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    # Must be set before ddrtlsdr is imported; see bench_simulated_load.
+    os.environ["DDRTLSDR_CONFIG_FILE"] = os.path.join(tempfile.mkdtemp(), "config.json")
+    from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+    from src.ddrtlsdr.simulation import SimulatedBackend
+
+    set_backend(SimulatedBackend(num_devices=args.devices))
+    from src.ddrtlsdr import api
+
+    serials = [device.serial for device in api.device_control.list_devices()]
+    threads_before = threading.active_count()
+    elapsed, latencies, peak_threads = asyncio.run(run(api.app, serials, args.requests, args.concurrency))
+
+    print(f"{args.requests} gain requests, {args.concurrency} in flight, {args.devices} devices")
+    print(f"{args.requests / elapsed:.0f} requests/s, median {latencies[len(latencies) // 2] * 1e3:.2f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} ms")
+    print(f"threads: {threads_before} before, {peak_threads} peak")
+
+
+if __name__ == "__main__":
+    main()
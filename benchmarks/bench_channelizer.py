@@ -0,0 +1,100 @@
+# benchmarks/bench_channelizer.py
+"""
+N narrowband consumers of one 2.4 MS/s stream. Each consumer doing its own
+conversion, frequency shift and decimation on the full-rate bytes (with
+NumPy, and with scipy.signal.upfirdn when scipy is installed) against one
+Channelizer serving all of them. Reports CPU seconds per second of input
+and the bytes handed to consumers per second.
+
+    python -m benchmarks.bench_channelizer --channels 8 --decimation 48
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.ddrtlsdr.channelizer import TAPS_PER_PHASE, Channelizer, design_lowpass
+from src.ddrtlsdr.iq_conversion import IQConverter
+
+SAMPLE_RATE = 2_400_000
+BLOCK_BYTES = 16 * 16384
+
+
+class NumpyConsumer:
+    """What a consumer of the raw stream does today: everything at full rate."""
+
+    def __init__(self, offset_hz: float, decimation: int, taps: np.ndarray):
+        self.decimation = decimation
+        self.taps = taps.astype(np.complex64)
+        self.step = offset_hz / SAMPLE_RATE
+        self.phase = 0.0
+        self.converter = IQConverter()
+
+    def mix(self, block: np.ndarray) -> np.ndarray:
+        samples = self.converter.convert(block)
+        n = np.arange(samples.shape[0])
+        mixed = samples * np.exp(-2j * np.pi * (self.phase + self.step * n)).astype(np.complex64)
+        self.phase = (self.phase + self.step * samples.shape[0]) % 1.0
+        return mixed
+
+    def __call__(self, block: np.ndarray):
+        return np.convolve(self.mix(block), self.taps, mode="same")[::self.decimation]
+
+
+class ScipyConsumer(NumpyConsumer):
+    def __call__(self, block: np.ndarray):
+        from scipy.signal import upfirdn
+
+        return upfirdn(self.taps, self.mix(block), down=self.decimation)
+
+
+def cpu_per_second(consume, blocks) -> float:
+    start = time.process_time()
+    for block in blocks:
+        consume(block)
+    return (time.process_time() - start) / (len(blocks) * BLOCK_BYTES / 2 / SAMPLE_RATE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--channels", type=int, default=8)
+    parser.add_argument("--decimation", type=int, default=48)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Seconds of input to process")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    blocks = [rng.integers(0, 256, BLOCK_BYTES, dtype=np.uint8)
+              for _ in range(int(args.seconds * SAMPLE_RATE * 2 / BLOCK_BYTES))]
+    output_rate = SAMPLE_RATE / args.decimation
+    offsets = np.linspace(-0.4, 0.4, args.channels) * SAMPLE_RATE
+    num_taps = TAPS_PER_PHASE * args.decimation + 1
+    taps = design_lowpass(num_taps, 0.4 / args.decimation)
+
+    print(f"{args.channels} channels at {output_rate / 1e3:.0f} kS/s from {SAMPLE_RATE / 1e6:.1f} MS/s, "
+          f"{num_taps} taps")
+    print(f"{'method':<22}{'CPU s per s':>12}{'MB/s to consumers':>20}")
+    full_rate = args.channels * SAMPLE_RATE * 2 / 1e6  # Every consumer gets the raw bytes
+
+    consumers = [NumpyConsumer(offset, args.decimation, taps) for offset in offsets]
+    load = cpu_per_second(lambda block: [consumer(block) for consumer in consumers], blocks)
+    print(f"{'per-consumer numpy':<22}{load:>12.3f}{full_rate:>20.1f}")
+
+    try:
+        import scipy  # noqa: F401
+    except ImportError:
+        print(f"{'per-consumer scipy':<22}{'skipped (scipy not installed)':>32}")
+    else:
+        consumers = [ScipyConsumer(offset, args.decimation, taps) for offset in offsets]
+        load = cpu_per_second(lambda block: [consumer(block) for consumer in consumers], blocks)
+        print(f"{'per-consumer scipy':<22}{load:>12.3f}{full_rate:>20.1f}")
+
+    channelizer = Channelizer(SAMPLE_RATE)
+    for offset in offsets:
+        channelizer.add_channel(offset, args.decimation, lambda samples: None)
+    load = cpu_per_second(channelizer, blocks)
+    print(f"{'channelizer':<22}{load:>12.3f}{args.channels * output_rate * 8 / 1e6:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
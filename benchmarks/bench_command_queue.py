@@ -0,0 +1,73 @@
+# benchmarks/bench_command_queue.py
+"""
+A UI-slider style burst of gain updates from several threads against one
+simulated dongle whose control transfers take ``--latency`` seconds.
+Compares calling the wrapper directly (serialized by a plain lock) with
+DeviceControl's coalescing command queue.
+
+    python -m benchmarks.bench_command_queue --threads 8 --updates 200 --latency 0.003
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend, set_gain
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+
+def burst(threads: int, updates: int, setter) -> float:
+    def worker(offset: int):
+        for i in range(updates):
+            setter((offset + i) % 50 * 10)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=200, help="Updates per thread")
+    parser.add_argument("--latency", type=float, default=0.003, help="Seconds per control transfer")
+    args = parser.parse_args()
+
+    backend = SimulatedBackend(num_devices=1, control_latency=args.latency)
+    set_backend(backend)
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    device = control.list_devices()[0]
+    handle = control.open_device_cached(device)
+    total = args.threads * args.updates
+
+    lock = threading.Lock()
+
+    def direct(gain):
+        with lock:
+            set_gain(handle, gain)
+
+    backend.control_transfers = 0
+    direct_time = burst(args.threads, args.updates, direct)
+    direct_transfers = backend.control_transfers
+
+    backend.control_transfers = 0
+    queued_time = burst(args.threads, args.updates, lambda gain: control.set_gain(device, gain))
+    queued_transfers = backend.control_transfers
+    stats = control.get_command_stats(device)
+
+    print(f"{total} gain updates from {args.threads} threads, {args.latency * 1e3:.1f} ms per transfer")
+    print(f"{'path':<16}{'wall s':>9}{'transfers':>11}")
+    print(f"{'direct + lock':<16}{direct_time:>9.2f}{direct_transfers:>11}")
+    print(f"{'command queue':<16}{queued_time:>9.2f}{queued_transfers:>11}")
+    print(f"coalesced {stats['coalesced']}, skipped {stats['skipped']}, applied {stats['applied']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_device_info.py
+"""
+A dashboard polling ``get_device_info`` for a farm of N simulated dongles,
+some of them busy with a stream of control transfers. Compares reading the
+tuner state back from the hardware (``refresh=True``, the old behaviour)
+with serving it from the state cache.
+
+    python -m benchmarks.bench_device_info --devices 32 --polls 20
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+
+def poll(control, devices, polls: int, **kwargs):
+    latencies = []
+    for _ in range(polls):
+        for device in devices:
+            start = time.perf_counter()
+            control.get_device_info(device, **kwargs)
+            latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=32)
+    parser.add_argument("--polls", type=int, default=20, help="Passes over the whole farm")
+    parser.add_argument("--busy", type=int, default=4, help="Devices receiving a constant stream of sets")
+    parser.add_argument("--open-latency", type=float, default=0.02)
+    parser.add_argument("--control-latency", type=float, default=0.003)
+    args = parser.parse_args()
+
+    backend = SimulatedBackend(
+        num_devices=args.devices, open_latency=args.open_latency, control_latency=args.control_latency,
+    )
+    set_backend(backend)
+    results = {}
+    for label, kwargs in (("hardware", {"refresh": True}), ("cache", {})):
+        control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+        devices = control.list_devices()
+        busy = devices[:args.busy]
+        for device in busy:
+            control.set_gain(device, 0)
+        stop = threading.Event()
+
+        def tweak(device):
+            gain = 0
+            while not stop.is_set():
+                gain = (gain + 10) % 500
+                control.set_gain(device, gain)
+
+        workers = [threading.Thread(target=tweak, args=(device,)) for device in busy]
+        for worker in workers:
+            worker.start()
+        start = time.perf_counter()
+        latencies = poll(control, devices, args.polls, **kwargs)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        for worker in workers:
+            worker.join()
+        results[label] = (elapsed, latencies, len(control.open_handles))
+        for device in devices:
+            control.close_device_cached(device)
+
+    print(f"{args.polls} polls x {args.devices} devices, {args.busy} busy, "
+          f"open {args.open_latency * 1e3:.0f} ms, transfer {args.control_latency * 1e3:.1f} ms")
+    print(f"{'source':<10}{'wall s':>9}{'median us':>11}{'p99 us':>10}{'open':>6}")
+    for label, (elapsed, latencies, opened) in results.items():
+        median = latencies[len(latencies) // 2] * 1e6
+        p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+        print(f"{label:<10}{elapsed:>9.2f}{median:>11.1f}{p99:>10.1f}{opened:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_device_inventory.py
+"""
+Startup cost of the device inventory with N simulated dongles whose open
+takes ``--open-latency`` seconds: a DeviceControl start (no probing), a
+parallel accessibility probe, a serial probe (the old behaviour) and a
+cached enumerate_devices call.
+
+    python -m benchmarks.bench_device_inventory --devices 32 --open-latency 0.05
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=32)
+    parser.add_argument("--open-latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    set_backend(SimulatedBackend(num_devices=args.devices, open_latency=args.open_latency))
+    config_file = os.path.join(tempfile.mkdtemp(), "config.json")
+
+    control = None
+
+    def startup():
+        nonlocal control
+        control = DeviceControl(config_file=config_file)
+
+    results = [("DeviceControl() startup", timed(startup))]
+    manager = control.manager
+    manager.probe_workers = args.workers
+    results.append((f"parallel probe ({args.workers} workers)", timed(manager.probe_devices)))
+    results.append(("serial probe", timed(lambda: [manager.verify_device_accessibility(d) for d in manager.present.values()])))
+    results.append(("cached enumerate_devices", timed(manager.enumerate_devices)))
+
+    print(f"{args.devices} devices, {args.open_latency * 1e3:.0f} ms per open")
+    for name, elapsed in results:
+        print(f"{name:<32}{elapsed * 1e3:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
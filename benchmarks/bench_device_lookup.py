@@ -0,0 +1,54 @@
+# benchmarks/bench_device_lookup.py
+"""
+Device lookup by serial at dongle-farm scale: the linear ``next(...)`` scan
+the API used to do versus the SDRConfig serial index, plus the cost of a
+full rescan/merge of N simulated devices.
+
+    python -m benchmarks.bench_device_lookup --devices 1000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import timeit
+
+from src.ddrtlsdr.device_manager import DeviceManager
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    set_backend(SimulatedBackend(num_devices=args.devices))
+    manager = DeviceManager(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    refresh = timeit.timeit(lambda: manager.enumerate_devices(force=True), number=3) / 3
+    devices = manager.config.devices
+    serials = [random.choice(devices).serial for _ in range(args.lookups)]
+
+    # The linear scan is slow enough that a tenth of the lookups is plenty.
+    linear_serials = serials[:max(1, args.lookups // 10)]
+
+    def linear():
+        for serial in linear_serials:
+            next((d for d in devices if d.serial == serial), None)
+
+    def indexed():
+        for serial in serials:
+            manager.get_device(serial)
+
+    linear_time = timeit.timeit(linear, number=1) / len(linear_serials)
+    indexed_time = timeit.timeit(indexed, number=1) / len(serials)
+
+    print(f"{args.devices} devices")
+    print(f"{'linear scan':<24}{linear_time * 1e6:>10.2f} us/lookup")
+    print(f"{'serial index':<24}{indexed_time * 1e6:>10.2f} us/lookup")
+    print(f"{'rescan + merge':<24}{refresh * 1e3:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_handle_pool.py
+"""
+Cold-start time for N simulated dongles: open every device and apply its
+settings (sample rate, frequency, gain) one device after another, as lazy
+opens on first use do, versus DeviceControl.open_devices, which opens and
+configures them side by side. Reports per-device open latency from the
+handle pool as well.
+
+    python -m benchmarks.bench_handle_pool --devices 1 4 16 --open-latency 0.2
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+
+def cold_start(count: int, args, parallel: bool) -> tuple:
+    set_backend(SimulatedBackend(num_devices=count, open_latency=args.open_latency,
+                                 control_latency=args.control_latency))
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    devices = control.list_devices()
+    settings = {device.serial: {"sample_rate": 2_048_000, "center_freq": 100_000_000 + 200_000 * i, "gain": 200}
+                for i, device in enumerate(devices)}
+    start = time.perf_counter()
+    if parallel:
+        errors = control.open_devices(devices, settings)
+        assert not any(errors.values()), errors
+    else:
+        for device in devices:
+            control.open_device_configured(device, settings[device.serial])
+    elapsed = time.perf_counter() - start
+    latencies = [entry["open_seconds"] for entry in control.get_handle_stats().values()]
+    control.pool.shutdown()
+    return elapsed, statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--open-latency", type=float, default=0.2)
+    parser.add_argument("--control-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'devices':>8}{'serial s':>11}{'parallel s':>12}{'speedup':>9}{'open p50 ms':>13}")
+    for count in args.devices:
+        serial, _ = cold_start(count, args, parallel=False)
+        parallel, open_p50 = cold_start(count, args, parallel=True)
+        print(f"{count:>8}{serial:>11.3f}{parallel:>12.3f}{serial / parallel:>8.1f}x{open_p50 * 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
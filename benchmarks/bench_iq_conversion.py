@@ -0,0 +1,60 @@
+# benchmarks/bench_iq_conversion.py
+"""
+Compare IQConverter against the naive ``(x - 127.5) / 127.5`` conversion.
+
+    python -m benchmarks.bench_iq_conversion
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.ddrtlsdr.iq_conversion import IQConverter
+
+
+def naive(raw: np.ndarray) -> np.ndarray:
+    x = (raw.astype(np.float32) - 127.5) / 127.5
+    return x[0::2] + 1j * x[1::2]
+
+
+def timed(fn, raw: np.ndarray, repeats: int) -> float:
+    fn(raw)  # Warm up lazily built tables and output arrays
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(raw)
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--block-size", type=int, default=16 * 16384, help="Block size in bytes")
+    parser.add_argument("--batch", type=int, default=16, help="Blocks per batch conversion")
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    block = rng.integers(0, 256, args.block_size, dtype=np.uint8)
+    batch = rng.integers(0, 256, (args.batch, args.block_size), dtype=np.uint8)
+    out = np.empty(args.block_size // 2, dtype=np.complex64)
+    byte_converter = IQConverter(lut="byte")
+
+    cases = [
+        ("naive formula", naive, block, 1),
+        ("byte LUT", lambda raw: byte_converter.convert(raw, out=out), block, 1),
+        ("pair LUT", IQConverter().convert, block, 1),
+        ("pair LUT + DC + IQ", IQConverter(dc_removal=True, gain_imbalance=1.05, phase_imbalance=0.02).convert, block, 1),
+        (f"pair LUT batch x{args.batch}", IQConverter().convert, batch, args.batch),
+    ]
+
+    samples_per_block = args.block_size // 2
+    baseline = None
+    print(f"{'method':<24}{'us/block':>12}{'MS/s':>10}{'speedup':>10}")
+    for name, fn, raw, blocks in cases:
+        per_block = timed(fn, raw, args.repeats) / blocks
+        baseline = baseline or per_block
+        print(f"{name:<24}{per_block * 1e6:>12.1f}{samples_per_block / per_block / 1e6:>10.1f}{baseline / per_block:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_iq_fanout.py
+"""
+Load-test the chunked-HTTP IQ endpoint: N local clients stream the same
+simulated device through uvicorn, optionally alongside deliberately slow
+clients that should be dropped without affecting the rest.
+
+    python -m benchmarks.bench_iq_fanout --clients 16 --rate 2400000
+    python -m benchmarks.bench_iq_fanout --clients 16 --slow-clients 2 --decimation 8
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def consume(httpx, url: str, duration: float, delay: float, results: list):
+    received = 0
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=None) as client:
+        async with client.stream("GET", url) as response:
+            async for chunk in response.aiter_raw():
+                received += len(chunk)
+                if delay:
+                    await asyncio.sleep(delay)
+                if time.perf_counter() - start >= duration:
+                    break
+    results.append((delay > 0, received, time.perf_counter() - start))
+
+
+async def run_clients(args, url: str) -> list:
+    import httpx
+
+    results = []
+    clients = [consume(httpx, url, args.duration, 0.0, results) for _ in range(args.clients)]
+    clients += [consume(httpx, url, args.duration, 0.5, results) for _ in range(args.slow_clients)]
+    await asyncio.gather(*clients)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--slow-clients", type=int, default=0, help="Clients that read one chunk every 0.5 s")
+    parser.add_argument("--rate", type=int, default=2_400_000)
+    parser.add_argument("--decimation", type=int, default=1)
+    parser.add_argument("--format", default="cu8", choices=("cu8", "cf32"))
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    # Must be set before ddrtlsdr is imported; see bench_simulated_load.
+    os.environ["DDRTLSDR_CONFIG_FILE"] = os.path.join(tempfile.mkdtemp(), "config.json")
+    import uvicorn
+    from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+    from src.ddrtlsdr.simulation import SimulatedBackend
+
+    set_backend(SimulatedBackend(num_devices=1, sample_rate=args.rate))
+    from src.ddrtlsdr import api
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    serial = api.device_control.list_devices()[0].serial
+    url = f"http://127.0.0.1:{port}/devices/{serial}/iq?decimation={args.decimation}&format={args.format}"
+    cpu_start = time.process_time()
+    results = asyncio.run(run_clients(args, url))
+    cpu = time.process_time() - cpu_start
+    server.should_exit = True
+    thread.join()
+
+    sample_bytes = 2 if args.format == "cu8" else 8
+    expected = args.rate / args.decimation * sample_bytes / 1e6
+    fast = [(n, t) for slow, n, t in results if not slow]
+    slow = [(n, t) for slow, n, t in results if slow]
+    per_client = [n / t / 1e6 for n, t in fast]
+    print(f"{args.clients} clients at {expected:.2f} MB/s each expected ({args.format}, decimation {args.decimation})")
+    print(f"per-client MB/s: min {min(per_client):.2f}  mean {sum(per_client) / len(per_client):.2f}  max {max(per_client):.2f}")
+    print(f"aggregate: {sum(per_client):.2f} MB/s, process CPU {cpu / args.duration * 100:.0f}% of one core")
+    if slow:
+        print(f"slow clients: {len(slow)}, received {sum(n for n, _ in slow) / 1e6:.2f} MB before being dropped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_iq_reader.py
+"""
+Offline processing of a large cu8 capture: IQFileReader blocks versus
+reading the whole file into RAM with np.fromfile. Reports throughput and
+the growth of peak RSS for each approach (each runs in a fresh process).
+
+    python -m benchmarks.bench_iq_reader --megabytes 1024
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def process(path: str, method: str, block_samples: int):
+    from src.ddrtlsdr.iq_conversion import IQConverter
+    from src.ddrtlsdr.iq_reader import IQFileReader
+
+    converter = IQConverter()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    power = 0.0
+    if method == "fromfile":
+        raw = np.fromfile(path, dtype=np.uint8)
+        for offset in range(0, raw.shape[0], block_samples * 2):
+            iq = converter.convert(raw[offset:offset + block_samples * 2])
+            power += float(np.vdot(iq, iq).real)
+    else:
+        for block in IQFileReader(path).blocks(block_samples):
+            iq = converter.convert(block)
+            power += float(np.vdot(iq, iq).real)
+    elapsed = time.perf_counter() - start
+    mb = os.path.getsize(path) / 1e6
+    print(f"{method:<10}{mb / elapsed:>10.1f}{peak_rss_mb() - baseline:>16.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=int, default=512)
+    parser.add_argument("--block-samples", type=int, default=131072)
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "METHOD"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        process(args.child[0], args.child[1], args.block_samples)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "capture.cu8")
+        chunk = np.random.default_rng(0).integers(0, 256, 1 << 20).astype(np.uint8)
+        with open(path, "wb") as f:
+            for _ in range(args.megabytes):
+                chunk.tofile(f)
+        print(f"{args.megabytes} MB cu8 capture, {args.block_samples}-sample blocks")
+        print(f"{'method':<10}{'MB/s':>10}{'peak RSS +MB':>16}")
+        for method in ("fromfile", "mmap"):
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_iq_reader", "--child", path, method,
+                 "--block-samples", str(args.block_samples)],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_logging.py
+"""
+Control-call latency on a simulated dongle under each logging setup: the
+old one handler pair per importing module, synchronous handlers at DEBUG
+and INFO, the queue listener, the queue with rate limiting, and logging
+off. Each call is a set_center_frequency + get_center_frequency pair
+through DeviceControl (two hardware calls and their log records).
+
+Console output goes to stderr; send it somewhere cheap or to a terminal
+depending on what you want to measure.
+
+    python -m benchmarks.bench_logging --calls 5000 2>/dev/null
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+
+def measure(control, device, calls: int) -> np.ndarray:
+    latencies = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        control.set_center_frequency(device, 100_000_000 + i)
+        control.get_center_frequency(device)
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--legacy-handlers", type=int, default=20, help="Modules that each added a handler pair")
+    args = parser.parse_args()
+
+    log_directory = tempfile.mkdtemp()
+    os.environ["DDRTLSDR_LOG_DIR"] = log_directory
+    from src.ddrtlsdr.device_control import DeviceControl
+    from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+    from src.ddrtlsdr.logging_config import LOG_FORMAT, setup_logging
+    from src.ddrtlsdr.simulation import SimulatedBackend
+
+    set_backend(SimulatedBackend(num_devices=1))
+    control = DeviceControl(config_file=os.path.join(log_directory, "config.json"))
+    device = control.list_devices()[0]
+    control.open_device_cached(device)
+    package_logger = logging.getLogger("ddrtlsdr")
+    legacy_handlers = []
+
+    def legacy():
+        setup_logging(force=True)
+        for _ in range(args.legacy_handlers - 1):
+            for handler in (logging.FileHandler(os.path.join(log_directory, "ddrtlsdr.log")), logging.StreamHandler()):
+                handler.setFormatter(logging.Formatter(LOG_FORMAT))
+                package_logger.addHandler(handler)
+                legacy_handlers.append(handler)
+
+    setups = [
+        (f"{args.legacy_handlers} handler pairs", legacy),
+        ("sync, DEBUG", lambda: setup_logging(level="DEBUG", force=True)),
+        ("sync, INFO", lambda: setup_logging(level="INFO", force=True)),
+        ("queue, DEBUG", lambda: setup_logging(level="DEBUG", use_queue=True, force=True)),
+        ("queue, INFO", lambda: setup_logging(level="INFO", use_queue=True, force=True)),
+        ("queue, INFO, 10/s", lambda: setup_logging(level="INFO", use_queue=True, rate_limit=10, force=True)),
+        ("off", lambda: setup_logging(level="WARNING", force=True)),
+    ]
+    print(f"{'logging':<22}{'median us':>11}{'p99 us':>9}{'calls/s':>10}")
+    for label, configure in setups:
+        configure()
+        measure(control, device, 200)  # Warm up
+        latencies = measure(control, device, args.calls)
+        setup_logging(level="WARNING", force=True)  # Drain any queue before the next setup
+        for handler in legacy_handlers:
+            package_logger.removeHandler(handler)
+            handler.close()
+        legacy_handlers.clear()
+        print(f"{label:<22}{np.median(latencies) * 1e6:>11.1f}{np.percentile(latencies, 99) * 1e6:>9.1f}"
+              f"{args.calls / latencies.sum():>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/bench_metrics.py
+"""
+Cost of leaving metrics on: nanoseconds per stream callback
+(interval/jitter/gap tracking plus the callback-time histogram) and per
+timed control call, with the share of one core that adds up to at full
+rate for several transfer sizes. Then the time to render /metrics for N
+streaming simulated devices.
+
+    python -m benchmarks.bench_metrics --devices 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.metrics import ControlCallMetrics, StreamMetrics, render_prometheus
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+
+def per_event_ns(fn, events: int) -> float:
+    start = time.perf_counter()
+    fn(events)
+    return (time.perf_counter() - start) / events * 1e9
+
+
+def stream_events(events: int):
+    metrics = StreamMetrics()
+    now = 0.0
+    for _ in range(events):
+        now += 0.001
+        metrics.block_arrived(now)
+        metrics.callback_seconds.observe(0.0002)
+
+
+def control_events(events: int):
+    calls = ControlCallMetrics()
+    handle = object()
+    calls.label_handle(handle, "SERIAL")
+    for _ in range(events):
+        calls.observe("get_center_freq", handle, 0.0003)
+
+
+def baseline(events: int):
+    now = 0.0
+    for _ in range(events):
+        now += 0.001
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--sample-rate", type=int, default=2_400_000)
+    args = parser.parse_args()
+
+    loop = per_event_ns(baseline, args.events)
+    stream = per_event_ns(stream_events, args.events) - loop
+    control = per_event_ns(control_events, args.events) - loop
+    print(f"stream callback: {stream:.0f} ns, control call: {control:.0f} ns (loop overhead removed)")
+    print(f"{'transfer bytes':>15}{'callbacks/s':>13}{'core share':>12}")
+    for buffer_size in (512, 4096, 16384, 262144):
+        rate = args.sample_rate * 2 / buffer_size
+        print(f"{buffer_size:>15}{rate:>13.0f}{rate * stream * 1e-9:>12.3%}")
+
+    set_backend(SimulatedBackend(num_devices=args.devices, sample_rate=args.sample_rate))
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    devices = control.list_devices()
+    for device in devices:
+        control.start_stream(device, lambda data: None, buffer_size=16384, output_format="uint8", ring_depth=16)
+    time.sleep(1.0)
+    start = time.perf_counter()
+    renders = 100
+    for _ in range(renders):
+        text = render_prometheus(control)
+    elapsed = (time.perf_counter() - start) / renders
+    for device in devices:
+        control.stop_stream(device)
+    print(f"/metrics for {args.devices} streams: {elapsed * 1e3:.2f} ms, {len(text) / 1e3:.1f} kB, "
+          f"{text.count(chr(10))} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_read_sync.py
+"""
+Latency and throughput of DeviceControl.read_samples for small and large n.
+
+Each size is read repeatedly into the pooled buffer and into a caller-supplied
+buffer; allocated bytes per call are measured with tracemalloc to confirm the
+read path does not allocate sample storage.
+
+    python -m benchmarks.bench_read_sync --device 0
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.ddrtlsdr.device_control import DeviceControl
+
+SIZES = (1024, 16384, 262144, 2097152)
+
+
+def bench_size(control, device, n: int, repeats: int, out=None) -> dict:
+    control.read_samples(device, n, out=out)  # Warm up the pool and the handle
+    latencies = []
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        control.read_samples(device, n, out=out)
+        latencies.append(time.perf_counter() - start)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    median = statistics.median(latencies)
+    return {
+        "n": n,
+        "buffer": "caller" if out is not None else "pooled",
+        "median_ms": median * 1e3,
+        "msps": n / median / 1e6,
+        "peak_alloc_bytes": peak - before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--device", type=int, default=0, help="Position in the configured device list")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    control = DeviceControl()
+    device = control.list_devices()[args.device]
+    try:
+        results = []
+        for n in SIZES:
+            results.append(bench_size(control, device, n, args.repeats))
+            results.append(bench_size(control, device, n, args.repeats, out=np.empty(2 * n, dtype=np.uint8)))
+    finally:
+        control.close_device_cached(device)
+
+    print(f"{'n':>10}{'buffer':>9}{'median ms':>12}{'MS/s':>9}{'peak alloc B':>14}")
+    for r in results:
+        print(f"{r['n']:>10}{r['buffer']:>9}{r['median_ms']:>12.2f}{r['msps']:>9.2f}{r['peak_alloc_bytes']:>14}")
+
+
+if __name__ == "__main__":
+    main()
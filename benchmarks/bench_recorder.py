@@ -0,0 +1,90 @@
+# benchmarks/bench_recorder.py
+"""
+Sustained disk throughput of IQRecorder per device, with several devices
+recording at once, compared with plain ``file.write`` of ``bytes`` blocks.
+
+Each device gets its own writer thread pushing 16 x 16384-byte blocks (the
+librtlsdr default) as fast as possible. 2.4 MS/s cu8 needs 4.8 MB/s per device.
+
+    python -m benchmarks.bench_recorder --devices 4 --megabytes 512 --dir /mnt/disk
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from src.ddrtlsdr.recorder import IQRecorder
+
+
+def write_plain(path_prefix: str, blocks: int, block: np.ndarray, fsync: bool):
+    with open(path_prefix + ".cu8", "wb") as f:
+        for _ in range(blocks):
+            f.write(block.tobytes())
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def write_recorder(path_prefix: str, blocks: int, block: np.ndarray, fsync: bool, mode: str, max_file_bytes: int):
+    recorder = IQRecorder(path_prefix, 2_400_000, 100_000_000, mode=mode, max_file_bytes=max_file_bytes)
+    for _ in range(blocks):
+        recorder(block)
+    recorder.close()
+    if fsync:
+        for path in recorder.files:
+            fd = os.open(path, os.O_RDONLY)
+            os.fsync(fd)
+            os.close(fd)
+
+
+def run(writer, directory: str, devices: int, blocks: int, block: np.ndarray, **kwargs) -> float:
+    threads = [
+        threading.Thread(target=writer, args=(os.path.join(directory, f"dev{i}"), blocks, block), kwargs=kwargs)
+        for i in range(devices)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--megabytes", type=int, default=256, help="Data written per device")
+    parser.add_argument("--block-size", type=int, default=16 * 16384)
+    parser.add_argument("--max-file-mb", type=int, default=128, help="Rotation size for the recorder")
+    parser.add_argument("--dir", default=None, help="Target directory (default: a temp dir)")
+    parser.add_argument("--fsync", action="store_true", help="Include the time to reach stable storage")
+    args = parser.parse_args()
+
+    block = (np.random.default_rng(0).integers(0, 256, args.block_size)).astype(np.uint8)
+    blocks = args.megabytes * (1 << 20) // args.block_size
+    mb_per_device = blocks * args.block_size / 1e6
+    variants = [
+        ("file.write(bytes)", write_plain, {}),
+        ("IQRecorder mmap", write_recorder, {"mode": "mmap", "max_file_bytes": args.max_file_mb << 20}),
+        ("IQRecorder buffered", write_recorder, {"mode": "buffered", "max_file_bytes": args.max_file_mb << 20}),
+    ]
+
+    print(f"{args.devices} devices x {mb_per_device:.0f} MB, {args.block_size}-byte blocks")
+    print(f"{'writer':<22}{'MB/s/device':>13}{'aggregate MB/s':>16}")
+    for name, writer, kwargs in variants:
+        directory = tempfile.mkdtemp(dir=args.dir)
+        try:
+            elapsed = run(writer, directory, args.devices, blocks, block, fsync=args.fsync, **kwargs)
+        finally:
+            shutil.rmtree(directory)
+        per_device = mb_per_device / elapsed
+        print(f"{name:<22}{per_device:>13.1f}{per_device * args.devices:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_rtl_tcp.py
+"""
+Throughput of the rtl_tcp server with several clients reading one simulated
+device over loopback.
+
+    python -m benchmarks.bench_rtl_tcp --clients 8 --rate 2400000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+async def client(port: int, duration: float, results: list):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await reader.readexactly(12)
+    received = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        chunk = await reader.read(1 << 20)
+        if not chunk:
+            break
+        received += len(chunk)
+    results.append(received / (time.perf_counter() - start))
+    writer.close()
+
+
+async def run(args, control, device) -> list:
+    from src.ddrtlsdr.rtl_tcp import RtlTcpServer
+
+    server = RtlTcpServer(control, device, port=0)
+    await server.start()
+    results = []
+    await asyncio.gather(*(client(server.port, args.duration, results) for _ in range(args.clients)))
+    await server.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--rate", type=int, default=2_400_000)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from src.ddrtlsdr.device_control import DeviceControl
+    from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+    from src.ddrtlsdr.simulation import SimulatedBackend
+
+    set_backend(SimulatedBackend(num_devices=1, sample_rate=args.rate))
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    device = control.list_devices()[0]
+
+    cpu_start = time.process_time()
+    results = asyncio.run(run(args, control, device))
+    cpu = time.process_time() - cpu_start
+
+    expected = args.rate * 2 / 1e6
+    print(f"{args.clients} rtl_tcp clients, {expected:.2f} MB/s each expected")
+    print(f"per-client MB/s: min {min(results) / 1e6:.2f}  max {max(results) / 1e6:.2f}")
+    print(f"aggregate: {sum(results) / 1e6:.2f} MB/s, process CPU {cpu / args.duration * 100:.0f}% of one core")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_scanner.py
+"""
+Frequency hopping on a simulated dongle: hops per second and the share of
+received samples that were usable, for the streaming scanner at several
+dwell times and block sizes, against the old way of restarting the stream
+for every hop.
+
+    python -m benchmarks.bench_scanner --seconds 2 --settle-ms 1
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+
+PLAN = [88_000_000 + i * 200_000 for i in range(100)]
+
+
+def restart_per_hop(control, device, dwell_samples: int, settle_samples: int, seconds: float):
+    """One stream per hop: retune, start, keep ``dwell`` after ``settle``, stop."""
+    hops = received = 0
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    while time.perf_counter() < deadline:
+        control.set_center_frequency(device, PLAN[hops % len(PLAN)])
+        done = threading.Event()
+        count = [0]
+
+        def collect(block):
+            count[0] += block.shape[0] // 2
+            if count[0] >= settle_samples + dwell_samples:
+                done.set()
+
+        control.start_stream(device, collect, buffer_size=16384, output_format="uint8")
+        done.wait()
+        control.stop_stream(device)
+        received += count[0]
+        hops += 1
+    elapsed = time.perf_counter() - start
+    return hops / elapsed, hops * dwell_samples / received
+
+
+def scan(control, device, dwell: float, settle: float, buffer_size: int, seconds: float):
+    scanner = control.start_scan(
+        device, PLAN, dwell=dwell, callback=lambda freq, samples: None,
+        settle_time=settle, buffer_size=buffer_size,
+    )
+    time.sleep(seconds)
+    control.stop_scan(device)
+    stats = scanner.stats()
+    return stats["hops_per_second"], stats["usable_ratio"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Run time per configuration")
+    parser.add_argument("--sample-rate", type=int, default=2_048_000)
+    parser.add_argument("--settle-ms", type=float, default=1.0)
+    parser.add_argument("--control-latency", type=float, default=0.0005, help="Seconds per control transfer")
+    args = parser.parse_args()
+
+    device = SimulatedDevice(
+        sample_rate=args.sample_rate, settle_time=args.settle_ms / 1e3, serial="SIM00000",
+    )
+    set_backend(SimulatedBackend(devices=[device], control_latency=args.control_latency))
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    device = control.list_devices()[0]
+    settle = args.settle_ms / 1e3
+
+    print(f"{args.sample_rate / 1e6:.3f} Msps, settle {args.settle_ms:.1f} ms, "
+          f"control transfer {args.control_latency * 1e3:.1f} ms")
+    print(f"{'method':<20}{'dwell ms':>9}{'block':>8}{'hops/s':>9}{'usable':>8}")
+    for dwell in (0.001, 0.005, 0.02):
+        rate, usable = restart_per_hop(
+            control, device, int(dwell * args.sample_rate), int(settle * args.sample_rate), args.seconds,
+        )
+        print(f"{'restart per hop':<20}{dwell * 1e3:>9.0f}{16384:>8}{rate:>9.1f}{usable:>8.1%}")
+        for buffer_size in (4096, 16384, 65536):
+            rate, usable = scan(control, device, dwell, settle, buffer_size, args.seconds)
+            print(f"{'scanner':<20}{dwell * 1e3:>9.0f}{buffer_size:>8}{rate:>9.1f}{usable:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
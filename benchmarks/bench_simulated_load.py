@@ -0,0 +1,87 @@
+# benchmarks/bench_simulated_load.py
+"""
+Load-test DeviceControl (and optionally the HTTP API) against N simulated
+devices and report per-device throughput, drops and CPU headroom.
+
+    python -m benchmarks.bench_simulated_load --devices 8 --rate 2400000
+    python -m benchmarks.bench_simulated_load --devices 8 --api-requests 200
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+
+def hammer_api(client, serials, num_requests: int, latencies: list):
+    for i in range(num_requests):
+        serial = serials[i % len(serials)]
+        start = time.perf_counter()
+        client.post(f"/devices/{serial}/gain", json={"gain": (i % 50) * 10})
+        latencies.append(time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--rate", type=int, default=2_400_000, help="Sample rate per device")
+    parser.add_argument("--buffer-size", type=int, default=16 * 16384)
+    parser.add_argument("--ring-depth", type=int, default=16)
+    parser.add_argument("--format", default="complex64", choices=("bytes", "uint8", "complex64"))
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--api-requests", type=int, default=0, help="Control requests sent through the API while streaming")
+    args = parser.parse_args()
+
+    # Keep the simulated devices out of the package config. This has to be in
+    # place before ddrtlsdr is imported, and the API builds its DeviceControl
+    # at import time, so everything is imported here.
+    os.environ["DDRTLSDR_CONFIG_FILE"] = os.path.join(tempfile.mkdtemp(), "config.json")
+    from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+    from src.ddrtlsdr.simulation import SimulatedBackend
+
+    set_backend(SimulatedBackend(num_devices=args.devices, sample_rate=args.rate))
+    from src.ddrtlsdr import api
+
+    control = api.device_control
+    devices = control.list_devices()
+    for device in devices:
+        control.start_stream(
+            device, lambda data: None, buffer_size=args.buffer_size,
+            output_format=args.format, ring_depth=args.ring_depth,
+        )
+
+    latencies = []
+    api_thread = None
+    if args.api_requests:
+        from fastapi.testclient import TestClient
+        api_thread = threading.Thread(
+            target=hammer_api,
+            args=(TestClient(api.app), [d.serial for d in devices], args.api_requests, latencies),
+        )
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    if api_thread:
+        api_thread.start()
+    time.sleep(args.duration)
+    stats = control.get_stream_throughput()
+    cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+    if api_thread:
+        api_thread.join()
+    for device in devices:
+        control.stop_stream(device)
+
+    print(f"{'serial':<12}{'MS/s':>8}{'callbacks/s':>13}{'drops':>8}")
+    for serial, entry in sorted(stats.items()):
+        print(f"{serial:<12}{entry['samples_per_s'] / 1e6:>8.2f}{entry['callbacks_per_s']:>13.1f}{entry['drops']:>8}")
+    total = sum(entry["samples_per_s"] for entry in stats.values())
+    print(f"\naggregate: {total / 1e6:.2f} MS/s of {args.devices * args.rate / 1e6:.2f} MS/s requested")
+    print(f"process CPU: {cpu * 100:.0f}% of one core (headroom {max(0.0, 1 - cpu) * 100:.0f}% of that core)")
+    if latencies:
+        latencies.sort()
+        print(f"API control requests: {len(latencies)}, median {latencies[len(latencies) // 2] * 1e3:.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
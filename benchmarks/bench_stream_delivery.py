@@ -0,0 +1,112 @@
+# benchmarks/bench_stream_delivery.py
+"""
+Measure copies and allocations per second for each SDRStream output format.
+
+A synthetic driver plays the role of librtlsdr: it owns a fixed set of
+transfer buffers and invokes the stream's C callback on them in turn, so the
+benchmark runs without a dongle.
+
+    python -m benchmarks.bench_stream_delivery
+"""
+
+import argparse
+import ctypes
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.ddrtlsdr.device_control import SDRStream
+
+CALLBACK_FUNC = ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.py_object)
+
+
+class SyntheticCallbackDriver:
+    """Cycles through preallocated transfer buffers like librtlsdr does."""
+
+    def __init__(self, buffer_size: int, num_buffers: int = 15):
+        rng = np.random.default_rng(0)
+        self.buffer_size = buffer_size
+        self.buffers = []
+        for _ in range(num_buffers):
+            buf = (ctypes.c_uint8 * buffer_size)()
+            np.ctypeslib.as_array(buf)[:] = rng.integers(0, 256, buffer_size, dtype=np.uint8)
+            self.buffers.append(buf)
+        self.pointers = [ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8)) for buf in self.buffers]
+        self.addresses = {ctypes.addressof(buf) for buf in self.buffers}
+
+    def run(self, c_callback, num_transfers: int):
+        pointers = self.pointers
+        for i in range(num_transfers):
+            c_callback(pointers[i % len(pointers)], self.buffer_size, None)
+
+
+def bench_format(driver: SyntheticCallbackDriver, output_format: str, copy: bool, num_transfers: int) -> dict:
+    stats = {"copies": 0, "allocated_bytes": 0}
+    baseline = [0]
+
+    def consumer(data):
+        if isinstance(data, bytes):
+            stats["copies"] += 1
+        elif data.__array_interface__["data"][0] not in driver.addresses and output_format == "uint8":
+            stats["copies"] += 1
+        elif copy:
+            stats["copies"] += 1
+        # Bytes still alive for this delivery that were allocated since the
+        # transfer started are what the delivery path cost us.
+        current, _ = tracemalloc.get_traced_memory()
+        stats["allocated_bytes"] += max(current - baseline[0], 0)
+
+    stream = SDRStream(None, driver.buffer_size, consumer, output_format=output_format, copy=copy)
+    c_callback = CALLBACK_FUNC(stream._c_callback)
+
+    def traced_callback(buf, length, ctx):
+        baseline[0] = tracemalloc.get_traced_memory()[0]
+        c_callback(buf, length, ctx)
+
+    # Warm up caches (buffer views, preallocated output) before measuring.
+    driver.run(traced_callback, len(driver.buffers))
+    stats["copies"] = stats["allocated_bytes"] = 0
+
+    start = time.perf_counter()
+    driver.run(traced_callback, num_transfers)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "format": output_format + (" (copy)" if copy else ""),
+        "transfers_per_s": num_transfers / elapsed,
+        "mb_per_s": num_transfers * driver.buffer_size / elapsed / 1e6,
+        "copies_per_s": stats["copies"] / elapsed,
+        "alloc_mb_per_s": stats["allocated_bytes"] / elapsed / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buffer-size", type=int, default=16 * 16384)
+    parser.add_argument("--transfers", type=int, default=2000)
+    args = parser.parse_args()
+
+    driver = SyntheticCallbackDriver(args.buffer_size)
+    tracemalloc.start()
+    try:
+        results = [
+            bench_format(driver, "bytes", False, args.transfers),
+            bench_format(driver, "uint8", False, args.transfers),
+            bench_format(driver, "uint8", True, args.transfers),
+            bench_format(driver, "complex64", False, args.transfers),
+            bench_format(driver, "complex64", True, args.transfers),
+        ]
+    finally:
+        tracemalloc.stop()
+
+    print(f"{'format':<18}{'transfers/s':>14}{'MB/s':>12}{'copies/s':>12}{'alloc MB/s':>12}")
+    for r in results:
+        print(
+            f"{r['format']:<18}{r['transfers_per_s']:>14.0f}{r['mb_per_s']:>12.1f}"
+            f"{r['copies_per_s']:>12.0f}{r['alloc_mb_per_s']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_sweep.py
+"""
+rtl_power-style sweep of 24 MHz - 1.7 GHz.
+
+First the spectrum math alone, over synthetic hops: a straightforward
+per-frame loop (float64 conversion, one FFT per frame, fftshift, crop,
+concatenate) against PowerSweep's batched complex64 pipeline, in CPU
+milliseconds per sweep. Then end-to-end sweeps on a simulated dongle,
+reporting sweep-cycle time against the time the samples alone take.
+
+    python -m benchmarks.bench_sweep --bin-hz 10000 --frames 16 --sweeps 2
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+from src.ddrtlsdr.sweep import PowerSweep, SweepPlan
+
+
+def naive_sweep(plan: SweepPlan, raw: np.ndarray) -> np.ndarray:
+    window = np.hanning(plan.fft_size)
+    rows = []
+    for _ in plan.centers:
+        power = np.zeros(plan.fft_size)
+        for frame in raw.reshape(plan.frames, -1):
+            iq = (frame[0::2] - 127.5) / 127.5 + 1j * (frame[1::2] - 127.5) / 127.5
+            power += np.abs(np.fft.fft(iq * window)) ** 2
+        shifted = np.fft.fftshift(power / plan.frames)
+        half = plan.keep // 2
+        rows.append(shifted[plan.fft_size // 2 - half:plan.fft_size // 2 + half])
+    return 10 * np.log10(np.concatenate(rows)[:plan.num_bins])
+
+
+def batched_sweep(plan: SweepPlan, raw: np.ndarray) -> np.ndarray:
+    sweep = PowerSweep(plan)
+    for center in plan.centers:
+        sweep(center, raw)
+        sweep.hop_complete(center)
+    return sweep._db
+
+
+def cpu_ms(fn, *args) -> float:
+    start = time.process_time()
+    fn(*args)
+    return (time.process_time() - start) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=float, default=24e6)
+    parser.add_argument("--stop", type=float, default=1.7e9)
+    parser.add_argument("--bin-hz", type=float, default=10_000)
+    parser.add_argument("--sample-rate", type=int, default=2_400_000)
+    parser.add_argument("--frames", type=int, default=16, help="FFT frames averaged per hop")
+    parser.add_argument("--crop", type=float, default=0.25)
+    parser.add_argument("--sweeps", type=int, default=2, help="End-to-end sweeps on the simulator")
+    parser.add_argument("--settle-ms", type=float, default=1.0)
+    parser.add_argument("--buffer-size", type=int, default=4096, help="Bytes per stream block")
+    args = parser.parse_args()
+
+    plan = SweepPlan(args.start, args.stop, args.bin_hz, args.sample_rate, args.crop, args.frames)
+    print(f"{len(plan)} hops, FFT {plan.fft_size}, {plan.num_bins} bins of {plan.bin_hz:.0f} Hz, "
+          f"{plan.frames} frames per hop")
+
+    rng = np.random.default_rng(0)
+    raw = rng.integers(0, 256, 2 * plan.dwell_samples, dtype=np.uint8)
+    naive = cpu_ms(naive_sweep, plan, raw)
+    batched = cpu_ms(batched_sweep, plan, raw)
+    print(f"{'spectrum math':<16}{'CPU ms/sweep':>14}")
+    print(f"{'per-frame loop':<16}{naive:>14.1f}")
+    print(f"{'batched':<16}{batched:>14.1f}  ({naive / batched:.1f}x)")
+
+    device = SimulatedDevice(sample_rate=args.sample_rate, settle_time=args.settle_ms / 1e3, serial="SIM00000")
+    set_backend(SimulatedBackend(devices=[device]))
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    sdr = control.list_devices()[0]
+    path = os.path.join(tempfile.mkdtemp(), "sweep.bin")
+    sweep = control.start_sweep(
+        sdr, plan, output_path=path, output_format="binary", sweeps=args.sweeps,
+        settle_time=args.settle_ms / 1e3, buffer_size=args.buffer_size,
+    )
+    sweep.scanner.wait()
+    control.stop_sweep(sdr)
+    stats = sweep.stats()
+    floor = len(plan) * (plan.dwell_samples / args.sample_rate + args.settle_ms / 1e3)
+    print(f"end to end: {stats['sweep_seconds']:.2f} s per sweep (samples alone {floor:.2f} s), "
+          f"{stats['cpu_seconds_per_sweep'] * 1e3:.0f} ms CPU per sweep, "
+          f"{os.path.getsize(path) / args.sweeps / 1e3:.0f} kB per sweep on disk")
+
+
+if __name__ == "__main__":
+    main()
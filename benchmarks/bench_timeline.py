@@ -0,0 +1,50 @@
+# benchmarks/bench_timeline.py
+"""
+Cost of per-block timestamps: nanoseconds per BlockTimeline.record (row
+write plus the running sample-clock fit) and the share of one core that
+comes to at full rate for several transfer sizes, then how long it takes
+to query the whole timeline and pick out the gaps.
+
+    python -m benchmarks.bench_timeline --capacity 4096
+"""
+
+import argparse
+import random
+import time
+
+from src.ddrtlsdr.timeline import BlockTimeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=500_000)
+    parser.add_argument("--capacity", type=int, default=4096)
+    parser.add_argument("--sample-rate", type=int, default=2_400_000)
+    args = parser.parse_args()
+
+    samples = 8192
+    period = samples / args.sample_rate
+    rng = random.Random(0)
+    arrivals = [i * period + rng.uniform(0, 0.0005) for i in range(args.blocks)]
+    timeline = BlockTimeline(args.sample_rate, args.capacity)
+    start = time.perf_counter()
+    for now in arrivals:
+        timeline.record(now, samples)
+    per_block = (time.perf_counter() - start) / args.blocks * 1e9
+    print(f"record: {per_block:.0f} ns per block, drift estimate {timeline.drift_ppm:+.2f} ppm, "
+          f"{timeline.gaps} false gaps")
+    print(f"{'transfer bytes':>15}{'blocks/s':>10}{'core share':>12}")
+    for buffer_size in (512, 4096, 16384, 262144):
+        rate = args.sample_rate * 2 / buffer_size
+        print(f"{buffer_size:>15}{rate:>10.0f}{rate * per_block * 1e-9:>12.3%}")
+
+    queries = 200
+    start = time.perf_counter()
+    for _ in range(queries):
+        timeline.gap_rows()
+    elapsed = (time.perf_counter() - start) / queries
+    print(f"query + gap scan of {len(timeline)} rows ({timeline.rows.nbytes / 1e3:.0f} kB): {elapsed * 1e6:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_worker_pool.py
+"""
+DSP scaling across simulated dongles: the same per-block work (conversion
+plus a windowed, averaged power spectrum, repeated --work times) run
+in-process on each stream's consumer thread, where every device shares one
+GIL, against a DSPWorkerPool of 1, 2, 4, ... worker processes per device.
+Reports the share of offered blocks that were processed and how many
+cores the work kept busy. Run it on a multi-core machine; with a single
+core the pool can only add overhead.
+
+    python -m benchmarks.bench_worker_pool --devices 4 --duration 5 --work 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+FFT_SIZE = 1024
+WORK = int(os.environ.get("BENCH_WORKER_POOL_WORK", "4"))
+
+
+def spectrum(block: np.ndarray) -> np.ndarray:
+    """Module-level so worker processes can unpickle it; WORK comes through the environment."""
+    iq = (block.astype(np.float32) - 127.5).view(np.complex64)
+    frames = iq[:iq.shape[0] - iq.shape[0] % FFT_SIZE].reshape(-1, FFT_SIZE) * np.hanning(FFT_SIZE)
+    for _ in range(WORK):
+        power = (np.abs(np.fft.fft(frames)) ** 2).mean(axis=0)
+    return power.astype(np.float32)
+
+
+def run_inline(control, devices, buffer_size: int, duration: float):
+    processed = [0]
+
+    def consume(block):
+        spectrum(block)
+        processed[0] += 1
+
+    for device in devices:
+        control.start_stream(device, consume, buffer_size=buffer_size, output_format="uint8", ring_depth=16)
+    time.sleep(duration)
+    offered = sum(control.streams[device.serial].blocks_received for device in devices)
+    done = processed[0]
+    for device in devices:
+        control.stop_stream(device)
+    return done, offered
+
+
+def run_pool(control, devices, workers: int, buffer_size: int, duration: float):
+    pools = [
+        control.start_offload(device, spectrum, num_workers=workers, num_slots=16, buffer_size=buffer_size)
+        for device in devices
+    ]
+    time.sleep(duration)
+    offered = sum(control.streams[device.serial].blocks_received for device in devices)
+    done = sum(pool.blocks_done for pool in pools)
+    for device in devices:
+        control.stop_offload(device)
+    return done, offered
+
+
+def cores_busy(fn, *args):
+    start_wall = time.perf_counter()
+    start = os.times()
+    processed, offered = fn(*args)
+    end = os.times()
+    cpu = (end.user + end.system + end.children_user + end.children_system) - (
+        start.user + start.system + start.children_user + start.children_system
+    )
+    return processed, offered, cpu / (time.perf_counter() - start_wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=4)
+    parser.add_argument("--rate", type=int, default=2_400_000)
+    parser.add_argument("--buffer-size", type=int, default=16 * 16384)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--work", type=int, default=4, help="Spectrum passes per block")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool per device")
+    args = parser.parse_args()
+
+    # Spawned workers re-import this module, so the work factor goes through the environment.
+    os.environ["BENCH_WORKER_POOL_WORK"] = str(args.work)
+    global WORK
+    WORK = args.work
+
+    set_backend(SimulatedBackend(num_devices=args.devices, sample_rate=args.rate))
+    control = DeviceControl(config_file=os.path.join(tempfile.mkdtemp(), "config.json"))
+    devices = control.list_devices()
+
+    print(f"{args.devices} devices at {args.rate / 1e6:.1f} Msps, {args.buffer_size} byte blocks, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'mode':<22}{'blocks/s':>10}{'processed':>11}{'cores busy':>12}")
+    processed, offered, cores = cores_busy(run_inline, control, devices, args.buffer_size, args.duration)
+    print(f"{'in-process':<22}{processed / args.duration:>10.1f}{processed / offered:>11.1%}{cores:>12.2f}")
+    workers = 1
+    while workers <= args.max_workers:
+        processed, offered, cores = cores_busy(run_pool, control, devices, workers, args.buffer_size, args.duration)
+        label = f"pool, {workers} per device"
+        print(f"{label:<22}{processed / args.duration:>10.1f}{processed / offered:>11.1%}{cores:>12.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ with open("README.md", "r", encoding="utf-8") as fh:
 # Define the package requirements
 install_requires = [
     'PyYAML',
+    'numpy',
     'pydantic>=2.0,<3.0',
     'fastapi',
     'uvicorn',
@@ -8,11 +8,48 @@ from .device_manager import DeviceManager
 from .device_control import DeviceControl
 from .models import SDRDevice, SDRConfig
 from .control_manager import DeviceControlManager
+from .handle_pool import HandlePool
+from .ring_buffer import SampleRingBuffer
+from .iq_conversion import IQConverter
+from .stream_supervisor import StreamSupervisor, StreamSpec
+from .recorder import IQRecorder
+from .iq_reader import IQFileReader, ReplayStream
+from .async_control import AsyncDeviceControl
+from .scanner import FrequencyScanner
+from .sweep import PowerSweep, SweepPlan, read_sweep_file
+from .channelizer import Channelizer
+from .worker_pool import DSPWorkerPool
+from .demod import Demodulator, WavAudioWriter
+from .metrics import render_prometheus
+from .timeline import BlockTimeline
+from .group_capture import GroupCapture, estimate_offsets, read_group_index
 
 __all__ = [
     "DeviceManager",
     "DeviceControl",
     "SDRDevice",
     "SDRConfig",
-    "DeviceControlManager"
+    "DeviceControlManager",
+    "HandlePool",
+    "SampleRingBuffer",
+    "IQConverter",
+    "StreamSupervisor",
+    "StreamSpec",
+    "IQRecorder",
+    "IQFileReader",
+    "ReplayStream",
+    "AsyncDeviceControl",
+    "FrequencyScanner",
+    "PowerSweep",
+    "SweepPlan",
+    "read_sweep_file",
+    "Channelizer",
+    "DSPWorkerPool",
+    "Demodulator",
+    "WavAudioWriter",
+    "render_prometheus",
+    "BlockTimeline",
+    "GroupCapture",
+    "estimate_offsets",
+    "read_group_index",
 ]
@@ -1,15 +1,26 @@
 # src/ddrtlsdr/api.py
 
-from fastapi import FastAPI, HTTPException
+import os
+
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 
+from .async_control import AsyncDeviceControl
 from .device_control import DeviceControl
+from .metrics import PROMETHEUS_CONTENT_TYPE, render_prometheus
 from .models import SDRDevice
 
 app = FastAPI(title="DDRTLSDR API")
 
-device_control = DeviceControl()
+# Handles stay open between requests; set DDRTLSDR_HANDLE_IDLE_TIMEOUT
+# (seconds) to close the ones nobody has used for that long.
+idle_timeout = os.environ.get("DDRTLSDR_HANDLE_IDLE_TIMEOUT")
+device_control = DeviceControl(handle_idle_timeout=float(idle_timeout) if idle_timeout else None)
+# Endpoints go through the async wrapper, which runs each device's blocking
+# calls on that device's own executor thread.
+async_control = AsyncDeviceControl(device_control)
 
 class FrequencyUpdate(BaseModel):
     frequency_hz: int
@@ -20,32 +31,118 @@ class SampleRateUpdate(BaseModel):
 class GainUpdate(BaseModel):
     gain: int
 
+class DeviceSettings(BaseModel):
+    sample_rate: Optional[int] = None
+    center_freq: Optional[int] = None
+    gain: Optional[int] = None
+
+def get_device_or_404(serial: str) -> SDRDevice:
+    device = async_control.get_device(serial)
+    if device is None:
+        raise HTTPException(status_code=404, detail="Device not found")
+    return device
+
 @app.get("/devices", response_model=List[SDRDevice])
-def list_devices():
-    return device_control.manager.config.devices
+async def list_devices():
+    return async_control.list_devices()
+
+@app.post("/devices/open")
+async def open_devices(settings: Optional[Dict[str, DeviceSettings]] = None):
+    """
+    Open every present device in parallel and apply the optional settings,
+    keyed by serial, so later requests find warm handles.
+    """
+    settings = {serial: entry.model_dump(exclude_none=True) for serial, entry in (settings or {}).items()}
+    results = await async_control.open_devices(settings=settings)
+    return {serial: (str(error) if error is not None else "ok") for serial, error in results.items()}
+
+@app.get("/devices/handles")
+async def handle_stats():
+    """Open state, open latency, tries and idle time of every device handle."""
+    return device_control.get_handle_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stream, command queue and librtlsdr call metrics in Prometheus text format."""
+    return PlainTextResponse(render_prometheus(device_control), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.get("/devices/{serial}/info")
+async def device_info(
+    serial: str,
+    refresh: bool = False,
+    max_age: Optional[float] = Query(None, ge=0),
+):
+    """Device description and last known tuner state, without touching USB unless asked."""
+    device = get_device_or_404(serial)
+    return await async_control.get_device_info(device, refresh=refresh, max_age=max_age)
 
 @app.post("/devices/{serial}/frequency")
-def set_frequency(serial: str, freq: FrequencyUpdate):
-    device = next((d for d in device_control.manager.config.devices if d.serial == serial), None)
-    if not device:
-        raise HTTPException(status_code=404, detail="Device not found")
-    device_control.set_center_frequency(device, freq.frequency_hz)
+async def set_frequency(serial: str, freq: FrequencyUpdate):
+    device = get_device_or_404(serial)
+    await async_control.set_center_frequency(device, freq.frequency_hz)
     return {"message": f"Frequency set to {freq.frequency_hz} Hz for device {serial}"}
 
 @app.post("/devices/{serial}/sample_rate")
-def set_sample_rate(serial: str, sample_rate: SampleRateUpdate):
-    device = next((d for d in device_control.manager.config.devices if d.serial == serial), None)
-    if not device:
-        raise HTTPException(status_code=404, detail="Device not found")
-    device_control.set_sample_rate(device, sample_rate.sample_rate_hz)
+async def set_sample_rate(serial: str, sample_rate: SampleRateUpdate):
+    device = get_device_or_404(serial)
+    await async_control.set_sample_rate(device, sample_rate.sample_rate_hz)
     return {"message": f"Sample rate set to {sample_rate.sample_rate_hz} Hz for device {serial}"}
 
 @app.post("/devices/{serial}/gain")
-def set_gain(serial: str, gain: GainUpdate):
-    device = next((d for d in device_control.manager.config.devices if d.serial == serial), None)
-    if not device:
-        raise HTTPException(status_code=404, detail="Device not found")
-    device_control.set_gain(device, gain.gain)
+async def set_gain(serial: str, gain: GainUpdate):
+    device = get_device_or_404(serial)
+    await async_control.set_gain(device, gain.gain)
     return {"message": f"Gain set to {gain.gain} for device {serial}"}
 
+async def subscribe_or_raise(serial: str, decimation: int, output_format: str):
+    device = get_device_or_404(serial)
+    try:
+        return await async_control.subscribe_iq(device, decimation=decimation, output_format=output_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (IOError, RuntimeError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@app.get("/devices/{serial}/iq")
+async def stream_iq(
+    serial: str,
+    decimation: int = Query(1, ge=1),
+    output_format: str = Query("cu8", alias="format"),
+):
+    """Chunked HTTP stream of raw IQ blocks (cu8 or cf32)."""
+    subscription = await subscribe_or_raise(serial, decimation, output_format)
+
+    async def blocks():
+        try:
+            async for payload in subscription:
+                yield payload
+        finally:
+            subscription.close()
+
+    return StreamingResponse(blocks(), media_type="application/octet-stream")
+
+@app.websocket("/devices/{serial}/iq")
+async def stream_iq_websocket(
+    websocket: WebSocket,
+    serial: str,
+    decimation: int = Query(1, ge=1),
+    output_format: str = Query("cu8", alias="format"),
+):
+    """WebSocket stream of raw IQ blocks, one binary message per block."""
+    try:
+        subscription = await subscribe_or_raise(serial, decimation, output_format)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=e.detail)
+        return
+    await websocket.accept()
+    try:
+        async for payload in subscription:
+            await websocket.send_bytes(payload)
+        if subscription.dropped:
+            await websocket.close(code=1013, reason="Client too slow")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        subscription.close()
+
 # Add more endpoints as needed
@@ -0,0 +1,188 @@
+# src/ddrtlsdr/async_control.py
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional
+
+import numpy as np
+
+from .broadcast import IQSubscription
+from .device_control import DeviceControl
+from .models import SDRDevice
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.async_control")
+
+BLOCK_DTYPES = {"cu8": np.uint8, "cf32": np.complex64}
+
+
+class AsyncDeviceControl:
+    """
+    asyncio front end for ``DeviceControl``.
+
+    Every blocking librtlsdr call for a device runs on that device's own
+    single-thread executor. Calls for one device are therefore serialized
+    (libusb handles are not meant to be used concurrently), different devices
+    proceed in parallel, and the thread count is bounded by the number of
+    devices rather than by the number of requests in flight. A set that is
+    still waiting for the executor absorbs newer values for the same
+    parameter, so a burst costs one call and every caller awaits it.
+
+    Args:
+        device_control (DeviceControl, optional): The instance to wrap. A new
+            one is created from ``config_file`` if omitted.
+        config_file (str, optional): Passed to ``DeviceControl``.
+    """
+
+    def __init__(self, device_control: Optional[DeviceControl] = None, config_file: Optional[str] = None):
+        if device_control is None:
+            device_control = DeviceControl(config_file) if config_file else DeviceControl()
+        self.control = device_control
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._pending_sets: Dict[tuple, list] = {}  # (serial, param) -> [value, future] not yet started
+        self._pending_lock = threading.Lock()
+
+    @property
+    def manager(self):
+        return self.control.manager
+
+    def _executor(self, device: SDRDevice) -> ThreadPoolExecutor:
+        executor = self._executors.get(device.serial)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ddrtlsdr-{device.serial}")
+            self._executors[device.serial] = executor
+        return executor
+
+    async def _call(self, device: SDRDevice, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor(device), functools.partial(fn, *args, **kwargs))
+
+    def get_device(self, serial: str) -> Optional[SDRDevice]:
+        return self.control.manager.get_device(serial)
+
+    def list_devices(self):
+        return self.control.list_devices()
+
+    async def open_device(self, device: SDRDevice):
+        return await self._call(device, self.control.open_device_cached, device)
+
+    async def close_device(self, device: SDRDevice):
+        await self._call(device, self.control.close_device_cached, device)
+
+    async def open_devices(self, devices=None, settings: Optional[Dict[str, dict]] = None) -> Dict[str, Optional[Exception]]:
+        """
+        ``DeviceControl.open_devices`` with each device opened and configured
+        on its own executor, so the opens run side by side without racing
+        that device's other calls.
+        """
+        devices = list(self.control.manager.present.values() if devices is None else devices)
+        settings = settings or {}
+        results = await asyncio.gather(
+            *(self._call(device, self.control.open_device_configured, device, settings.get(device.serial))
+              for device in devices),
+            return_exceptions=True,
+        )
+        return {device.serial: (result if isinstance(result, Exception) else None)
+                for device, result in zip(devices, results)}
+
+    async def _set(self, device: SDRDevice, param: str, setter, value: int):
+        key = (device.serial, param)
+        with self._pending_lock:
+            pending = self._pending_sets.get(key)
+            if pending is not None:
+                pending[0] = value
+        if pending is not None:
+            self.control.command_queue(device).record_coalesced()
+            # Shielded so one caller giving up does not cancel the shared set.
+            return await asyncio.shield(pending[1])
+
+        pending = [value, None]
+
+        def apply_latest():
+            with self._pending_lock:
+                self._pending_sets.pop(key, None)
+                latest = pending[0]
+            setter(device, latest)
+
+        # Registered and scheduled without awaiting in between, so followers
+        # on this loop always find the future.
+        with self._pending_lock:
+            self._pending_sets[key] = pending
+        pending[1] = asyncio.get_running_loop().run_in_executor(self._executor(device), apply_latest)
+        return await asyncio.shield(pending[1])
+
+    async def set_center_frequency(self, device: SDRDevice, freq_hz: int):
+        await self._set(device, "center_freq", self.control.set_center_frequency, freq_hz)
+
+    async def get_center_frequency(self, device: SDRDevice) -> int:
+        return await self._call(device, self.control.get_center_frequency, device)
+
+    async def set_sample_rate(self, device: SDRDevice, sample_rate_hz: int):
+        await self._set(device, "sample_rate", self.control.set_sample_rate, sample_rate_hz)
+
+    async def get_sample_rate(self, device: SDRDevice) -> int:
+        return await self._call(device, self.control.get_sample_rate, device)
+
+    async def set_gain(self, device: SDRDevice, gain: int):
+        await self._set(device, "gain", self.control.set_gain, gain)
+
+    async def get_gain(self, device: SDRDevice) -> int:
+        return await self._call(device, self.control.get_gain, device)
+
+    async def get_device_info(self, device: SDRDevice, refresh: bool = False, max_age: Optional[float] = None) -> dict:
+        if not refresh and max_age is None:
+            # Served from the state cache; no need to queue behind USB calls.
+            return self.control.get_device_info(device)
+        return await self._call(device, self.control.get_device_info, device, refresh=refresh, max_age=max_age)
+
+    async def read_samples(self, device: SDRDevice, n: int) -> np.ndarray:
+        # A fresh array: the pooled buffer would be overwritten by the next read.
+        return await self._call(device, lambda: self.control.read_samples(device, n).copy())
+
+    async def subscribe_iq(self, device: SDRDevice, **kwargs) -> IQSubscription:
+        """Awaitable ``DeviceControl.subscribe_iq`` bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        return await self._call(device, self.control.subscribe_iq, device, loop, **kwargs)
+
+    async def iq_blocks(
+        self,
+        device: SDRDevice,
+        decimation: int = 1,
+        output_format: str = "cf32",
+        max_queue: Optional[int] = None,
+    ) -> AsyncIterator[np.ndarray]:
+        """
+        Async iterator over a device's IQ blocks, shared with any other
+        subscribers of the same device.
+
+        Yields read-only NumPy views (uint8 for ``"cu8"``, complex64 for
+        ``"cf32"``) over each block's buffer. If the consumer falls too far
+        behind, the iterator simply ends; check ``DeviceControl`` logs.
+        """
+        subscription = await self.subscribe_iq(
+            device, decimation=decimation, output_format=output_format, max_queue=max_queue,
+        )
+        dtype = BLOCK_DTYPES[output_format]
+        try:
+            async for payload in subscription:
+                yield np.frombuffer(payload, dtype=dtype)
+        finally:
+            subscription.close()
+
+    async def stop_stream(self, device: SDRDevice):
+        await self._call(device, self.control.stop_stream, device)
+
+    async def close(self):
+        """Stop all streams and release the executors."""
+        for serial in list(self.control.streams):
+            device = self.get_device(serial)
+            if device is not None:
+                await self.stop_stream(device)
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        self._executors.clear()
@@ -0,0 +1,81 @@
+# src/ddrtlsdr/backend.py
+
+from abc import ABC, abstractmethod
+
+
+class SDRBackend(ABC):
+    """
+    Interface between the ``librtlsdr_wrapper`` functions and whatever
+    actually talks to the hardware.
+
+    Methods mirror the librtlsdr C API they stand in for and report errors
+    the same way, with librtlsdr-style integer result codes (0 on success).
+    Logging and raising on failure stay in ``librtlsdr_wrapper`` so every
+    backend behaves identically to callers. Every method is abstract, so a
+    backend that misses one fails when it is created.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get_device_count(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_device_name(self, index: int) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_device_usb_strings(self, index: int):
+        """Returns ``(result, manufacturer, product, serial)``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def open(self, index: int):
+        """Returns ``(result, handle)``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self, handle):
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_center_freq(self, handle, freq_hz: int) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_center_freq(self, handle) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_sample_rate(self, handle, rate_hz: int) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_sample_rate(self, handle) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_tuner_gain(self, handle, gain: int) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_tuner_gain(self, handle) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def reset_buffer(self, handle) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_sync(self, handle, buffer, length: int):
+        """Returns ``(result, n_read)``."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def read_async(self, handle, callback, context, num_buffers: int, buffer_size: int) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def cancel_async(self, handle):
+        raise NotImplementedError
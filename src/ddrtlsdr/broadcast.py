@@ -0,0 +1,226 @@
+# src/ddrtlsdr/broadcast.py
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .iq_conversion import IQConverter
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.broadcast")
+
+BROADCAST_FORMATS = ("cu8", "cf32")
+
+
+def decimate_block(iq: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Boxcar-filter and downsample complex64 samples by ``factor``.
+
+    Cheap enough to run per client group on the streaming path; trailing
+    samples that do not fill a whole output sample are dropped.
+    """
+    usable = iq.shape[0] - iq.shape[0] % factor
+    return iq[:usable].reshape(-1, factor).mean(axis=1, dtype=np.complex64)
+
+
+def complex_to_cu8(iq: np.ndarray) -> np.ndarray:
+    """Requantize complex64 in [-1, 1] back to interleaved uint8."""
+    flat = iq.view(np.float32)
+    return np.clip(np.rint(flat * 127.5 + 127.5), 0, 255).astype(np.uint8)
+
+
+def check_subscription(decimation: int, output_format: str):
+    """
+    Raise ValueError for subscription arguments ``IQSubscription`` would
+    reject, so callers can refuse a client before starting a stream for it.
+    """
+    if decimation < 1:
+        raise ValueError("decimation must be at least 1")
+    if output_format not in BROADCAST_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+
+class IQSubscription:
+    """
+    One client's view of a broadcast: a bounded asyncio queue of encoded
+    blocks, filled from the stream thread and drained on the client's loop.
+
+    If the client falls ``max_queue`` blocks behind it is disconnected
+    (``dropped`` is set and the iterator ends) rather than slowing down the
+    device or the other clients.
+    """
+
+    def __init__(
+        self,
+        broadcaster: "IQBroadcaster",
+        loop: asyncio.AbstractEventLoop,
+        decimation: int = 1,
+        output_format: str = "cu8",
+        max_queue: int = 32,
+    ):
+        check_subscription(decimation, output_format)
+        self.broadcaster = broadcaster
+        self.loop = loop
+        self.decimation = decimation
+        self.output_format = output_format
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.blocks_sent = 0
+        self.dropped = False
+        self.closed = False
+
+    @property
+    def key(self) -> Tuple[int, str]:
+        return self.decimation, self.output_format
+
+    def _put(self, payload: bytes):
+        # Runs on the subscriber's loop.
+        if self.closed:
+            return
+        if self.queue.full():
+            logger.warning(f"Dropping slow IQ client after {self.blocks_sent} blocks.")
+            self.dropped = True
+            self._finish()
+            return
+        self.queue.put_nowait(payload)
+        self.blocks_sent += 1
+
+    def _finish(self):
+        self.closed = True
+        self.broadcaster.unsubscribe(self)
+        # Make room for the end-of-stream marker.
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    def close(self):
+        """End the subscription. Safe to call from any thread."""
+        if self.closed:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._finish()
+        else:
+            self.loop.call_soon_threadsafe(self._finish)
+
+    async def get(self) -> Optional[bytes]:
+        """Next encoded block, or None once the subscription has ended."""
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        payload = await self.get()
+        if payload is None:
+            raise StopAsyncIteration
+        return payload
+
+
+class IQBroadcaster:
+    """
+    Fans one device stream out to many network clients.
+
+    Pass the broadcaster as the ``SDRStream`` callback (``output_format``
+    ``"uint8"`` or ``"bytes"``). Each block is encoded once per distinct
+    (decimation, format) pair into an immutable ``bytes`` object that every
+    matching subscriber shares, so adding clients costs a queue put each.
+
+    Args:
+        max_queue (int): Default per-client queue depth in blocks.
+        on_idle (callable, optional): Called after the last subscriber leaves,
+            e.g. to stop the device stream.
+    """
+
+    def __init__(self, max_queue: int = 32, on_idle: Optional[Callable[[], None]] = None):
+        self.max_queue = max_queue
+        self.on_idle = on_idle
+        self.blocks_in = 0
+        self.subscriptions_dropped = 0
+        self._subscriptions: List[IQSubscription] = []
+        self._lock = threading.Lock()
+        self._converter = IQConverter()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        decimation: int = 1,
+        output_format: str = "cu8",
+        max_queue: Optional[int] = None,
+    ) -> IQSubscription:
+        """
+        Add a client. ``loop`` defaults to the running loop, so call this from
+        the coroutine that will consume the subscription.
+        """
+        loop = loop or asyncio.get_running_loop()
+        subscription = IQSubscription(self, loop, decimation, output_format, max_queue or self.max_queue)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        logger.info(f"IQ client subscribed ({self.subscriber_count} total, decimation {decimation}, {output_format}).")
+        return subscription
+
+    def unsubscribe(self, subscription: IQSubscription):
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            # Copy-on-write, so the stream thread iterates without the lock.
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+            remaining = len(self._subscriptions)
+            if subscription.dropped:
+                self.subscriptions_dropped += 1
+        logger.info(f"IQ client unsubscribed ({remaining} remaining).")
+        if remaining == 0 and self.on_idle is not None:
+            self.on_idle()
+
+    def close(self):
+        """Disconnect every subscriber."""
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    def _encode(self, raw: np.ndarray, key: Tuple[int, str], iq: Optional[np.ndarray]) -> bytes:
+        decimation, output_format = key
+        if decimation == 1 and output_format == "cu8":
+            return raw.tobytes()
+        if decimation > 1:
+            iq = decimate_block(iq, decimation)
+        if output_format == "cf32":
+            return iq.tobytes()
+        return complex_to_cu8(iq).tobytes()
+
+    def __call__(self, data: Union[bytes, np.ndarray]):
+        self.blocks_in += 1
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+        raw = np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else data
+        payloads: Dict[Tuple[int, str], bytes] = {}
+        iq = None
+        for subscription in subscriptions:
+            payload = payloads.get(subscription.key)
+            if payload is None:
+                if iq is None and subscription.key != (1, "cu8"):
+                    iq = self._converter.convert(raw)
+                payload = payloads[subscription.key] = self._encode(raw, subscription.key, iq)
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, payload)
+            except RuntimeError:
+                # The client's loop is gone.
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "blocks_in": self.blocks_in,
+            "subscriptions_dropped": self.subscriptions_dropped,
+        }
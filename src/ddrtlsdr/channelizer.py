@@ -0,0 +1,231 @@
+# src/ddrtlsdr/channelizer.py
+
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .iq_conversion import IQConverter
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.channelizer")
+
+TAPS_PER_PHASE = 16  # Default filter length per unit of decimation
+
+
+def design_lowpass(num_taps: int, cutoff: float, window: str = "hamming") -> np.ndarray:
+    """
+    Windowed-sinc lowpass FIR with unity gain at DC.
+
+    Args:
+        num_taps (int): Filter length.
+        cutoff (float): Cutoff as a fraction of the sample rate (0 to 0.5).
+        window (str): ``"hamming"``, ``"hann"`` or ``"blackman"``.
+
+    Returns:
+        np.ndarray: float64 taps.
+    """
+    if not 0 < cutoff < 0.5:
+        raise ValueError(f"cutoff must be between 0 and 0.5 of the sample rate, got {cutoff}")
+    windows = {"hamming": np.hamming, "hann": np.hanning, "blackman": np.blackman}
+    if window not in windows:
+        raise ValueError(f"Unsupported window: {window}")
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * windows[window](num_taps)
+    return taps / taps.sum()
+
+
+class Channel:
+    """
+    One narrowband channel cut out of a wideband stream.
+
+    ``callback`` receives complex64 samples at ``sample_rate / decimation``,
+    centered on ``offset_hz`` from the stream's center frequency, as a fresh
+    contiguous array per block.
+    """
+
+    def __init__(
+        self,
+        offset_hz: float,
+        decimation: int,
+        taps: np.ndarray,
+        callback: Callable[[np.ndarray], None],
+    ):
+        self.offset_hz = offset_hz
+        self.decimation = decimation
+        self.taps = taps
+        self.callback = callback
+        self.samples_out = 0
+        self.phase = 0.0  # NCO phase in cycles at the start of the next block
+
+
+class _PolyphaseBank:
+    """
+    Decimating filters for every channel that shares a decimation factor and
+    filter length, computed together.
+
+    Channel c's lowpass taps are rotated up to its offset, making a complex
+    bandpass filter; it is evaluated only at the kept output instants, as
+    ``K = ceil(L / D)`` products of contiguous ``(outputs, D) @ (D, channels)``
+    matrices, so the cost is ``L`` MACs per output sample rather than per
+    input sample. Mixing the channel down to baseband then happens at the
+    output rate. Input history and the decimation phase carry across blocks.
+    """
+
+    def __init__(self, decimation: int, num_taps: int):
+        self.decimation = decimation
+        self.num_taps = num_taps
+        self.phases = -(-num_taps // decimation)  # K
+        self.history = np.zeros(self.phases * decimation - 1, dtype=np.complex64)
+        self.start = 0  # Index in the next block of the first kept sample
+        self.channels: List[Channel] = []
+        self._weights = None  # (K, D, channels)
+        self._steps = None  # Per-channel NCO advance per input sample, in cycles
+        self._phases = np.zeros(0)
+
+    def set_channels(self, channels: List[Channel], sample_rate: float):
+        for channel, phase in zip(self.channels, self._phases):
+            channel.phase = float(phase)
+        span = self.phases * self.decimation
+        weights = np.zeros((span, len(channels)), dtype=np.complex64)
+        k = np.arange(self.num_taps)
+        for column, channel in enumerate(channels):
+            bandpass = channel.taps * np.exp(2j * np.pi * channel.offset_hz / sample_rate * k)
+            # Reversed so the newest sample meets tap 0; zero-padded in front to K * D.
+            weights[span - self.num_taps:, column] = bandpass[::-1]
+        self._weights = weights.reshape(self.phases, self.decimation, len(channels))
+        self._steps = np.array([channel.offset_hz / sample_rate for channel in channels])
+        self._phases = np.array([channel.phase for channel in channels])
+        self.channels = channels
+
+    def process(self, x: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Filter and decimate one block. Returns ``(channels, outputs)``
+        complex64, or None if no output instant fell in this block.
+        """
+        D, K = self.decimation, self.phases
+        n = x.shape[0]
+        extended = np.concatenate((self.history, x))
+        self.history = extended[extended.shape[0] - self.history.shape[0]:]
+        start = self.start
+        phases = self._phases
+        self._phases = np.mod(phases + n * self._steps, 1.0)
+        if start >= n:
+            self.start = start - n
+            return None
+        outputs = (n - start + D - 1) // D
+        self.start = start + outputs * D - n
+        rows = extended[start:start + (outputs + K - 1) * D].reshape(outputs + K - 1, D)
+        out = rows[:outputs] @ self._weights[0]
+        for phase in range(1, K):
+            out += rows[phase:phase + outputs] @ self._weights[phase]
+        # Mix each channel down at the output rate: output j is input sample
+        # start + j * D, which the bandpass left rotated by the channel's NCO.
+        cycles = phases + np.outer(start + np.arange(outputs) * D, self._steps)
+        out *= np.exp(-2j * np.pi * cycles).astype(np.complex64)
+        return np.ascontiguousarray(out.T)
+
+
+class Channelizer:
+    """
+    Stream callback that extracts any number of narrow channels from a
+    wideband stream in one pass.
+
+    Channels sharing a decimation factor share a ``_PolyphaseBank``, so the
+    wideband block is converted once and read once per bank no matter how
+    many channels it carries. Channels can be added and removed while the
+    stream runs.
+
+    Accepts uint8 I/Q blocks (as delivered by ``SDRStream`` with
+    ``output_format="uint8"``) or complex64 arrays.
+
+    Args:
+        sample_rate (float): Input sample rate in Hz.
+        converter (IQConverter, optional): uint8 to complex64 conversion.
+    """
+
+    def __init__(self, sample_rate: float, converter: Optional[IQConverter] = None):
+        self.sample_rate = sample_rate
+        self.converter = converter or IQConverter()
+        self.samples_in = 0
+        self._banks: Dict[tuple, _PolyphaseBank] = {}
+        # Serializes channel changes against processing; reentrant so a
+        # channel callback may remove its own channel.
+        self._lock = threading.RLock()
+
+    @property
+    def channels(self) -> List[Channel]:
+        return [channel for bank in list(self._banks.values()) for channel in bank.channels]
+
+    def add_channel(
+        self,
+        offset_hz: float,
+        decimation: int,
+        callback: Callable[[np.ndarray], None],
+        bandwidth: Optional[float] = None,
+        num_taps: Optional[int] = None,
+    ) -> Channel:
+        """
+        Start delivering a channel.
+
+        Args:
+            offset_hz (float): Channel center relative to the stream's center.
+            decimation (int): Input samples per output sample.
+            callback: Receives complex64 output blocks.
+            bandwidth (float, optional): Passband width in Hz. Defaults to
+                80% of the output rate.
+            num_taps (int, optional): Filter length. Defaults to
+                ``TAPS_PER_PHASE * decimation + 1``.
+
+        Returns:
+            Channel: Handle for ``remove_channel``.
+
+        Raises:
+            ValueError: If the channel does not fit the input band.
+        """
+        if decimation < 1:
+            raise ValueError(f"decimation must be at least 1, got {decimation}")
+        output_rate = self.sample_rate / decimation
+        bandwidth = bandwidth if bandwidth is not None else 0.8 * output_rate
+        if abs(offset_hz) + bandwidth / 2 > self.sample_rate / 2:
+            raise ValueError(f"Channel at {offset_hz} Hz with {bandwidth} Hz bandwidth is outside the input band")
+        num_taps = num_taps or TAPS_PER_PHASE * decimation + 1
+        taps = design_lowpass(num_taps, min(bandwidth / 2 / self.sample_rate, 0.499))
+        channel = Channel(offset_hz, decimation, taps, callback)
+        with self._lock:
+            key = (decimation, num_taps)
+            bank = self._banks.get(key)
+            if bank is None:
+                bank = _PolyphaseBank(decimation, num_taps)
+                self._banks[key] = bank
+            bank.set_channels(bank.channels + [channel], self.sample_rate)
+        logger.info(f"Channel at {offset_hz:+.0f} Hz added, {output_rate:.0f} samples/s.")
+        return channel
+
+    def remove_channel(self, channel: Channel):
+        with self._lock:
+            key = (channel.decimation, channel.taps.shape[0])
+            bank = self._banks.get(key)
+            if bank is None or channel not in bank.channels:
+                return
+            remaining = [other for other in bank.channels if other is not channel]
+            if remaining:
+                bank.set_channels(remaining, self.sample_rate)
+            else:
+                del self._banks[key]
+        logger.info(f"Channel at {channel.offset_hz:+.0f} Hz removed.")
+
+    def __call__(self, block: np.ndarray):
+        samples = self.converter.convert(block) if block.dtype == np.uint8 else block
+        self.samples_in += samples.shape[0]
+        with self._lock:
+            for bank in list(self._banks.values()):
+                out = bank.process(samples)
+                if out is None:
+                    continue
+                for channel, chunk in zip(bank.channels, out):
+                    channel.samples_out += chunk.shape[0]
+                    channel.callback(chunk)
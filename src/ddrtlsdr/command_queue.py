@@ -0,0 +1,175 @@
+# src/ddrtlsdr/command_queue.py
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.command_queue")
+
+_UNSET = object()  # Marks a parameter that was never applied
+
+
+class DeviceCommandQueue:
+    """
+    Serializes parameter updates for one device and collapses bursts.
+
+    ``submit`` records the wanted value for a parameter, replacing any value
+    still waiting for the same parameter. Whichever caller gets there first
+    (the leader) applies every pending update; the others (followers) wait
+    until their update, or a newer one that superseded it, has been applied
+    and return without touching USB. A set whose value matches the last
+    applied value is skipped outright, unless another value for the same
+    parameter is being applied at that moment.
+
+    ``run`` executes any other call on the handle under the same lock, so
+    getters and setters never interleave on the wire.
+
+    Args:
+        apply: ``apply(param, value)`` performs one update on the hardware.
+    """
+
+    def __init__(self, apply: Callable[[str, Any], None]):
+        self.apply = apply
+        self.values: Dict[str, Any] = {}  # Last value applied or read back per parameter
+        self.updated_at: Dict[str, float] = {}  # time.monotonic() of each entry in values
+        self.submitted = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.failed = 0
+        self._pending: Dict[str, Tuple[Any, List[int]]] = {}  # param -> (value, tickets of the callers it covers)
+        self._in_flight: Dict[str, Any] = {}  # param -> value the drain is applying now
+        self._results: Dict[int, Optional[Exception]] = {}  # ticket -> outcome, until its caller collects it
+        self._tickets = 0
+        self._draining = False
+        self._state_lock = threading.Condition()  # Guards the dicts and counters
+        self._device_lock = threading.RLock()  # Held while talking to the device
+
+    def submit(self, param: str, value: Any, force: bool = False):
+        """
+        Set ``param`` to ``value``. Returns once this value, or a newer one
+        for the same parameter, has been applied.
+
+        Args:
+            param (str): Parameter name, e.g. ``"center_freq"``.
+            value: The new value.
+            force (bool): Apply even if the last applied value matches.
+
+        Raises:
+            Exception: Whatever ``apply`` raised for this value.
+        """
+        with self._state_lock:
+            self.submitted += 1
+            if param in self._pending:
+                self.coalesced += 1
+            elif not force and param not in self._in_flight and self.values.get(param, _UNSET) == value:
+                # With a set in flight the applied value is about to change,
+                # so matching it says nothing about where the device ends up.
+                self.skipped += 1
+                logger.debug("Skipping no-op %s=%s.", param, value)
+                return
+            self._tickets += 1
+            ticket = self._tickets
+            _, covered = self._pending.get(param, (None, []))
+            covered.append(ticket)
+            self._pending[param] = (value, covered)
+            # Followers wait for a result instead of the device lock, so
+            # everyone covered by one transfer is released together.
+            while True:
+                if ticket in self._results:
+                    # The outcome of the transfer that carried this value.
+                    error = self._results.pop(ticket)
+                    if error is not None:
+                        raise error
+                    return
+                if self._draining:
+                    self._state_lock.wait()
+                    continue
+                self._draining = True
+                self._state_lock.release()
+                try:
+                    with self._device_lock:
+                        self._drain()
+                finally:
+                    self._state_lock.acquire()
+                    self._draining = False
+                    self._state_lock.notify_all()
+
+    def _drain(self):
+        while True:
+            with self._state_lock:
+                if not self._pending:
+                    return
+                param = next(iter(self._pending))
+                value, covered = self._pending.pop(param)
+                self._in_flight[param] = value
+            try:
+                self.apply(param, value)
+            except Exception as e:
+                # Reported to the callers this value covered, not to the leader.
+                with self._state_lock:
+                    del self._in_flight[param]
+                    self.failed += 1
+                    # The device state is unknown after a failed set.
+                    self.values.pop(param, None)
+                    self.updated_at.pop(param, None)
+                    self._results.update(dict.fromkeys(covered, e))
+                    self._state_lock.notify_all()
+                continue
+            with self._state_lock:
+                del self._in_flight[param]
+                self.values[param] = value
+                self.updated_at[param] = time.monotonic()
+                self.applied += 1
+                self._results.update(dict.fromkeys(covered))
+                self._state_lock.notify_all()
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``fn`` with exclusive use of the device."""
+        with self._device_lock:
+            return fn(*args, **kwargs)
+
+    def record_coalesced(self, count: int = 1):
+        """Count updates collapsed before reaching the queue (e.g. by the async front end)."""
+        with self._state_lock:
+            self.submitted += count
+            self.coalesced += count
+
+    def record(self, param: str, value: Any):
+        """Remember a value read back from the device."""
+        with self._state_lock:
+            self.values[param] = value
+            self.updated_at[param] = time.monotonic()
+
+    def age(self, param: str) -> Optional[float]:
+        """Seconds since ``param`` was last applied or read, or None if unknown."""
+        updated_at = self.updated_at.get(param)
+        if updated_at is None:
+            return None
+        return time.monotonic() - updated_at
+
+    def invalidate(self, param: Optional[str] = None):
+        """Forget known values, e.g. after the handle is closed."""
+        with self._state_lock:
+            if param is None:
+                self.values.clear()
+                self.updated_at.clear()
+            else:
+                self.values.pop(param, None)
+                self.updated_at.pop(param, None)
+
+    def stats(self) -> dict:
+        with self._state_lock:
+            return {
+                "submitted": self.submitted,
+                "applied": self.applied,
+                "coalesced": self.coalesced,
+                "skipped": self.skipped,
+                "failed": self.failed,
+            }
+
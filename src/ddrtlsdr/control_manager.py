@@ -1,19 +1,31 @@
 # src/ddrtlsdr/control_manager.py
 
 import logging
-import time
-import threading
 from typing import Optional
 
 from .device_manager import SDRDevice
-from .librtlsdr_wrapper import open_device, close_device
+from .handle_pool import HandlePool
 
 logger = logging.getLogger("ddrtlsdr.control_manager")
 
 
 class DeviceControlManager:
-    def __init__(self):
-        self.open_handles = {}  # Cache of open device handles
+    """
+    Handle cache for code that needs open devices without a whole
+    ``DeviceControl``. A thin front end for ``HandlePool``, so handles,
+    retries and open statistics work the same way in both.
+
+    Args:
+        pool (HandlePool, optional): The pool to use; a new one by default.
+    """
+
+    def __init__(self, pool: Optional[HandlePool] = None):
+        self.pool = pool if pool is not None else HandlePool()
+
+    @property
+    def open_handles(self):
+        """Maps device serial to its open handle."""
+        return self.pool.handles
 
     def open_handle(self, device: SDRDevice, timeout: int = 10):
         """
@@ -29,23 +41,17 @@ class DeviceControlManager:
         Raises:
             OSError: If the device cannot be opened within the timeout.
         """
-        if device.serial in self.open_handles:
+        handle = self.pool.get(device.serial)
+        if handle is not None:
             logger.info(f"Device {device.serial} is already open.")
-            return self.open_handles[device.serial]
-
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                handle = open_device(device.index)
-                self.open_handles[device.serial] = handle
-                logger.info(f"Device {device.serial} opened successfully.")
-                return handle
-            except OSError as e:
-                logger.warning(f"Failed to open device {device.serial}: {e}. Retrying...")
-                time.sleep(0.5)
-
-        logger.error(f"Unable to open device {device.serial} within {timeout} seconds.")
-        raise OSError(f"Unable to open device at index {device.index}")
+            return handle
+        try:
+            handle = self.pool.open(device, timeout=timeout)
+        except OSError:
+            logger.error(f"Unable to open device {device.serial} within {timeout} seconds.")
+            raise
+        logger.info(f"Device {device.serial} opened successfully.")
+        return handle
 
     def close_handle(self, device: SDRDevice):
         """
@@ -54,9 +60,7 @@ class DeviceControlManager:
         Args:
             device (SDRDevice): The device to close.
         """
-        handle = self.open_handles.pop(device.serial, None)
-        if handle:
-            close_device(handle)
+        if self.pool.close(device):
             logger.info(f"Device {device.serial} closed and removed from cache.")
         else:
             logger.warning(f"Device {device.serial} was not open.")
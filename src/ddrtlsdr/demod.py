@@ -0,0 +1,233 @@
+# src/ddrtlsdr/demod.py
+
+import logging
+import wave
+from fractions import Fraction
+from typing import Callable, Optional
+
+import numpy as np
+
+from .channelizer import design_lowpass
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.demod")
+
+# mode: (channel rate the demodulator wants at least, FM deviation in Hz,
+#        de-emphasis time constant in seconds, audio bandwidth in Hz)
+DEMOD_MODES = {
+    "wfm": (200_000, 75_000.0, 75e-6, 15_000.0),
+    "fm": (32_000, 5_000.0, None, 4_000.0),
+    "am": (16_000, None, None, 5_000.0),
+}
+AM_CARRIER_TIME = 0.05  # Seconds of averaging for the AM carrier level
+
+
+def one_pole(x: np.ndarray, a: float, state: float = 0.0):
+    """
+    ``y[n] = a * y[n-1] + (1 - a) * x[n]`` over a whole block.
+
+    Evaluated as a log-depth prefix scan (``log2(len(x))`` vectorized passes)
+    rather than a per-sample loop.
+
+    Args:
+        x (np.ndarray): Real input block.
+        a (float): Pole, between 0 and 1.
+        state (float): ``y[-1]`` carried over from the previous block.
+
+    Returns:
+        tuple: Output block (float64) and the state for the next block.
+    """
+    y = (1.0 - a) * np.asarray(x, dtype=np.float64)
+    if y.shape[0] == 0:
+        return y, state
+    y[0] += a * state
+    shift, coefficient = 1, a
+    while shift < y.shape[0] and coefficient:
+        y[shift:] += coefficient * y[:-shift]
+        shift *= 2
+        coefficient *= coefficient
+    return y, float(y[-1])
+
+
+class RationalResampler:
+    """
+    Streaming polyphase resampler for real signals, by ``up / down``.
+
+    Only the kept output samples are computed: each is a dot product of
+    ``K`` input samples with one of ``up`` polyphase branches, gathered for
+    the whole block at once. Input history and the output phase carry
+    across blocks.
+
+    Args:
+        up (int): Interpolation factor.
+        down (int): Decimation factor.
+        cutoff (float, optional): Lowpass cutoff as a fraction of the input
+            rate. Defaults to 90% of the lower of the two Nyquist frequencies.
+        taps_per_phase (int): Filter length per unit of ``max(up, down)``.
+    """
+
+    def __init__(self, up: int, down: int, cutoff: Optional[float] = None, taps_per_phase: int = 16):
+        if up < 1 or down < 1:
+            raise ValueError(f"Resampling factors must be positive, got {up}/{down}")
+        self.up = up
+        self.down = down
+        cutoff = cutoff if cutoff is not None else 0.45 * min(1.0, up / down)
+        K = -(-taps_per_phase * max(up, down) // up)
+        # The filter runs at the upsampled rate, with the interpolation gain folded in.
+        taps = design_lowpass(K * up, min(cutoff / up, 0.499)) * up
+        # branches[p, k] = taps[p + k * up]
+        self._branches = taps.reshape(K, up).T.astype(np.float32)
+        self._history = np.zeros(K - 1, dtype=np.float32)
+        self._t = 0  # Upsampled index of the next output, relative to the next block
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        n = x.shape[0]
+        K = self._branches.shape[1]
+        extended = np.concatenate((self._history, x.astype(np.float32, copy=False)))
+        self._history = extended[extended.shape[0] - K + 1:]
+        t0, end = self._t, n * self.up
+        count = max(0, -(-(end - t0) // self.down))
+        self._t = t0 + count * self.down - end
+        if count == 0:
+            return np.zeros(0, dtype=np.float32)
+        t = t0 + np.arange(count) * self.down
+        newest = t // self.up + K - 1
+        gathered = extended[newest[:, None] - np.arange(K)]
+        return np.einsum("ok,ok->o", gathered, self._branches[t % self.up])
+
+
+class Demodulator:
+    """
+    Streaming FM/AM demodulator for one channel.
+
+    Takes complex64 baseband blocks at ``input_rate``, typically from a
+    ``Channelizer`` channel, which has already shifted and decimated the
+    channel, and produces float32 audio at ``audio_rate``:
+
+    * ``"fm"``/``"wfm"``: polar discriminator (phase difference of
+      consecutive samples), scaled so full deviation is 1.0, then
+      de-emphasis;
+    * ``"am"``: envelope divided by a slowly tracked carrier level, minus 1.
+
+    Everything is vectorized per block; the discriminator's previous
+    sample, the IIR states and the resampler carry across blocks, so the
+    output does not depend on how the stream is split.
+
+    Args:
+        mode (str): ``"fm"``, ``"wfm"`` or ``"am"``.
+        input_rate (float): Channel sample rate in Hz.
+        audio_rate (int): Output sample rate in Hz.
+        callback (callable, optional): Receives each float32 audio block.
+        deviation (float, optional): FM deviation in Hz; per-mode default.
+        deemphasis (float, optional): De-emphasis time constant in seconds
+            (75e-6 in the Americas, 50e-6 elsewhere); per-mode default,
+            0 disables it.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        input_rate: float,
+        audio_rate: int = 48_000,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+        deviation: Optional[float] = None,
+        deemphasis: Optional[float] = None,
+    ):
+        if mode not in DEMOD_MODES:
+            raise ValueError(f"Unsupported demodulation mode: {mode}")
+        _, default_deviation, default_deemphasis, audio_bandwidth = DEMOD_MODES[mode]
+        self.mode = mode
+        self.input_rate = input_rate
+        self.audio_rate = audio_rate
+        self.callback = callback
+        self.deviation = deviation or default_deviation
+        self.deemphasis = default_deemphasis if deemphasis is None else deemphasis
+        self.samples_in = 0
+        self.samples_out = 0
+        # Set by DeviceControl.start_demod: the Channelizer channel feeding
+        # this demodulator and its WAV sink, if any.
+        self.channel = None
+        self.writer = None
+
+        self._previous = np.complex64(1)  # Last input sample, for the discriminator
+        if self.deviation:
+            self._fm_gain = np.float32(input_rate / (2 * np.pi * self.deviation))
+        self._deemphasis_pole = np.exp(-1.0 / (input_rate * self.deemphasis)) if self.deemphasis else None
+        self._deemphasis_state = 0.0
+        self._carrier_pole = np.exp(-1.0 / (input_rate * AM_CARRIER_TIME))
+        self._carrier_state = None
+
+        ratio = Fraction(audio_rate / input_rate).limit_denominator(1000)
+        if abs(float(ratio) * input_rate - audio_rate) > 1e-6 * audio_rate:
+            logger.warning(f"Audio rate approximated as {float(ratio) * input_rate:.1f} Hz.")
+        cutoff = min(audio_bandwidth, 0.45 * audio_rate) / input_rate
+        self._resampler = RationalResampler(ratio.numerator, ratio.denominator, cutoff=cutoff)
+
+    def _demodulate(self, iq: np.ndarray) -> np.ndarray:
+        if self.mode == "am":
+            envelope = np.abs(iq)
+            if self._carrier_state is None:
+                self._carrier_state = float(envelope[0])
+            carrier, self._carrier_state = one_pole(envelope, self._carrier_pole, self._carrier_state)
+            return envelope / np.maximum(carrier, 1e-9) - 1.0
+        delayed = np.empty_like(iq)
+        delayed[0] = self._previous
+        delayed[1:] = iq[:-1]
+        self._previous = iq[-1]
+        audio = np.angle(iq * np.conj(delayed)) * self._fm_gain
+        if self._deemphasis_pole is not None:
+            audio, self._deemphasis_state = one_pole(audio, self._deemphasis_pole, self._deemphasis_state)
+        return audio
+
+    def __call__(self, iq: np.ndarray) -> np.ndarray:
+        if iq.shape[0] == 0:
+            return np.zeros(0, dtype=np.float32)
+        self.samples_in += iq.shape[0]
+        audio = self._resampler(self._demodulate(iq))
+        self.samples_out += audio.shape[0]
+        if self.callback is not None and audio.shape[0]:
+            self.callback(audio)
+        return audio
+
+
+def channel_decimation(sample_rate: float, mode: str) -> int:
+    """Largest decimation that keeps a ``mode`` channel at or above its minimum rate."""
+    if mode not in DEMOD_MODES:
+        raise ValueError(f"Unsupported demodulation mode: {mode}")
+    return max(1, int(sample_rate // DEMOD_MODES[mode][0]))
+
+
+class WavAudioWriter:
+    """
+    Mono 16-bit WAV sink for ``Demodulator`` output. Callable, so it can be
+    the demodulator's callback.
+
+    Args:
+        path (str): Output file.
+        sample_rate (int): Audio sample rate in Hz.
+        gain (float): Applied before clipping to [-1, 1].
+    """
+
+    def __init__(self, path: str, sample_rate: int, gain: float = 1.0):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.gain = gain
+        self.samples_written = 0
+        self._wav = wave.open(path, "wb")
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def __call__(self, audio: np.ndarray):
+        pcm = np.clip(audio * (self.gain * 32767), -32767, 32767).astype("<i2")
+        self._wav.writeframesraw(pcm.tobytes())
+        self.samples_written += pcm.shape[0]
+
+    def close(self):
+        if self._wav is None:
+            return
+        self._wav.close()
+        self._wav = None
+        logger.info(f"Wrote {self.samples_written / self.sample_rate:.1f} s of audio to {self.path}.")
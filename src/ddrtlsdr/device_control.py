@@ -1,15 +1,18 @@
 # src/ddrtlsdr/device_control.py
 
+import asyncio
 import logging
+import os
 import threading
+import time
 import ctypes
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Union
 
-from .device_manager import DeviceManager, SDRDevice
-from .device_control import DeviceControlManager
+import numpy as np
+
+from .device_manager import CONFIG_FILE, DEVICE_REMOVED, DeviceManager, SDRDevice
+from .handle_pool import HandlePool
 from .librtlsdr_wrapper import (
-    open_device,
-    close_device,
     set_center_freq,
     get_center_freq,
     set_sample_rate,
@@ -18,61 +21,315 @@ from .librtlsdr_wrapper import (
     get_gain,
     read_async,
     cancel_async,
+    read_sync,
+    reset_buffer,
 )
 from .models import SDRConfig
+from .ring_buffer import SampleRingBuffer
+from .iq_conversion import IQConverter
+from .recorder import IQRecorder
+from .broadcast import IQBroadcaster, IQSubscription, check_subscription
+from .command_queue import DeviceCommandQueue
+from .metrics import StreamMetrics
+from .timeline import BlockTimeline
+from .group_capture import GroupCapture, StartGate
+from .scanner import DEFAULT_SETTLE_TIME, FrequencyScanner
+from .channelizer import Channel, Channelizer
+from .worker_pool import DSPWorkerPool
+from .demod import Demodulator, WavAudioWriter, channel_decimation
+from .sweep import SWEEP_FORMATS, BinarySweepWriter, CsvSweepWriter, PowerSweep, SweepPlan
+from .stream_supervisor import StreamSpec, StreamSupervisor
 from .logging_config import setup_logging
 
 # Initialize centralized logging
 setup_logging()
 logger = logging.getLogger("ddrtlsdr.device_control")
 
+STREAM_OUTPUT_FORMATS = ("bytes", "uint8", "complex64")
+SYNC_READ_ALIGNMENT = 512  # USB bulk transfers must be a multiple of this
+DEVICE_SETTINGS = ("sample_rate", "center_freq", "gain")  # Accepted by open_devices, applied in this order
+
+def _pin_current_thread(cpus: Optional[Iterable[int]]):
+    """Restrict the calling thread to ``cpus`` (Linux only; a no-op elsewhere)."""
+    if not cpus:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU pinning is not supported on this platform.")
+        return
+    try:
+        # On Linux, pid 0 refers to the calling thread, not the whole process.
+        os.sched_setaffinity(0, set(cpus))
+    except OSError as e:
+        logger.warning(f"Failed to pin thread to CPUs {sorted(cpus)}: {e}")
+
 class SDRStream:
-    def __init__(self, device_handle, buffer_size: int = 16 * 16384, callback: Optional[Callable[[bytes], None]] = None):
+    """
+    Asynchronous sample stream for a single open device.
+
+    ``output_format`` selects what the consumer callback receives:
+
+    - ``"bytes"``: a fresh ``bytes`` copy of every transfer (legacy behaviour).
+    - ``"uint8"``: a NumPy view over the librtlsdr transfer buffer. No data is
+      copied; the view is only valid until the callback returns.
+    - ``"complex64"``: samples converted by ``converter`` (an ``IQConverter``,
+      which may also remove DC and correct IQ imbalance) into a preallocated
+      complex64 array that is reused for every transfer.
+
+    With ``copy=True`` the consumer gets an array it owns instead of a view
+    or the reused output array.
+
+    With ``ring_depth`` set, the librtlsdr thread only copies each transfer
+    into a preallocated ``SampleRingBuffer`` and the callback runs on a
+    separate consumer thread, so a slow consumer can no longer stall the USB
+    transfer loop. Blocks that arrive while the ring is full are dropped and
+    counted; see ``stats()``.
+
+    ``cpus`` and ``consumer_cpus`` pin the async read thread and the ring
+    consumer thread to the given CPUs.
+
+    Given the device's ``sample_rate``, every transfer is also recorded in
+    ``timeline``, a ``BlockTimeline`` of the last ``timeline_capacity``
+    blocks: sequence number, sample index, arrival time, estimated sample
+    clock time and lost samples. With ``metadata=True`` the callback is
+    called as ``callback(data, row)`` with that block's row.
+
+    With a ``start_gate`` (a ``StartGate``), the stream thread resets the
+    device's buffer and then waits at the gate before starting the async
+    read, so several devices can be released at the same moment.
+    """
+
+    def __init__(
+        self,
+        device_handle,
+        buffer_size: int = 16 * 16384,
+        callback: Optional[Callable[[Union[bytes, np.ndarray]], None]] = None,
+        output_format: str = "bytes",
+        copy: bool = False,
+        ring_depth: Optional[int] = None,
+        num_buffers: int = 0,
+        converter: Optional[IQConverter] = None,
+        cpus: Optional[Iterable[int]] = None,
+        consumer_cpus: Optional[Iterable[int]] = None,
+        sample_rate: Optional[float] = None,
+        timeline_capacity: int = 4096,
+        metadata: bool = False,
+        start_gate: Optional[StartGate] = None,
+    ):
+        if output_format not in STREAM_OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        if metadata and not sample_rate:
+            raise ValueError("Block metadata needs the stream's sample rate")
         self.device_handle = device_handle
         self.buffer_size = buffer_size
         self.callback = callback
+        self.output_format = output_format
+        self.copy = copy
+        self.converter = converter or IQConverter()
+        self.num_buffers = num_buffers
+        self.cpus = cpus
+        self.consumer_cpus = consumer_cpus
+        self.ring = SampleRingBuffer(ring_depth, buffer_size) if ring_depth else None
         self.running = False
         self.thread = None
+        self.consumer_thread = None
         self.c_callback = None  # Ensure callback remains referenced
+        self._views = {}  # Maps librtlsdr buffer address to a cached uint8 view
+        self.blocks_received = 0
+        self.bytes_received = 0
+        self.metrics = StreamMetrics()
+        self.timeline = BlockTimeline(sample_rate, timeline_capacity) if sample_rate else None
+        self.metadata = metadata
+        self.start_gate = start_gate
+        self.gate_aborted = False  # Set when the gate was aborted before the read started
 
-    def _c_callback(self, buf, length, ctx):
-        if self.callback:
-            data = ctypes.string_at(buf, length)
+    def _buffer_view(self, buf, length: int) -> np.ndarray:
+        # librtlsdr cycles through a fixed set of transfer buffers, so the
+        # views are built once per buffer and reused for every transfer.
+        key = (ctypes.addressof(buf.contents), length)
+        view = self._views.get(key)
+        if view is None:
+            view = np.ctypeslib.as_array(buf, shape=(length,))
+            self._views[key] = view
+        return view
+
+    def _deliver(self, raw: np.ndarray, seq: int):
+        if self.output_format == "bytes":
+            data = raw.tobytes()
+        elif self.output_format == "uint8":
+            data = raw.copy() if self.copy else raw
+        else:
+            data = self.converter.convert(raw)
+            if self.copy:
+                data = data.copy()
+        if self.metadata:
+            self.callback(data, self.timeline.row(seq))
+        else:
             self.callback(data)
 
+    def _c_callback(self, buf, length, ctx):
+        arrived = time.perf_counter()
+        self.metrics.block_arrived(arrived)
+        seq = self.blocks_received
+        if self.timeline is not None:
+            seq = self.timeline.record(arrived, length // 2)
+        self.blocks_received += 1
+        self.bytes_received += length
+        if self.ring is not None:
+            if not self.ring.write(self._buffer_view(buf, length), seq) and self.timeline is not None:
+                self.timeline.mark_dropped(seq)
+            return
+        if not self.callback:
+            return
+        if self.output_format == "bytes" and not self.metadata:
+            self.callback(ctypes.string_at(buf, length))
+        else:
+            self._deliver(self._buffer_view(buf, length), seq)
+        self.metrics.callback_seconds.observe(time.perf_counter() - arrived)
+
+    def _consumer_thread(self):
+        _pin_current_thread(self.consumer_cpus)
+        ring = self.ring
+        while self.running:
+            block = ring.read(timeout=0.1)
+            if block is None:
+                continue
+            start = time.perf_counter()
+            try:
+                if self.callback:
+                    self._deliver(block, ring.read_tag())
+            except Exception as e:
+                logger.error(f"Stream consumer callback failed: {e}")
+            finally:
+                ring.release()
+            self.metrics.callback_seconds.observe(time.perf_counter() - start)
+
     def _stream_thread(self):
         CALLBACK_FUNC = ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.py_object)
         self.c_callback = CALLBACK_FUNC(self._c_callback)
+        _pin_current_thread(self.cpus)
+        if self.start_gate is not None:
+            reset_buffer(self.device_handle)
+            if not self.start_gate.wait():
+                # Deliberate, so the supervisor must not restart it as dead.
+                self.gate_aborted = True
+                logger.debug("Start gate aborted; not starting the asynchronous read.")
+                return
         logger.debug("Starting asynchronous read.")
+        try:
+            self._read_async()
+        except Exception as e:
+            logger.error(f"Asynchronous read failed: {e}")
+        logger.debug("Asynchronous read ended.")
+
+    def _read_async(self):
         read_async(
             self.device_handle,
             self.c_callback,
             None,
-            1,  # Realtime flag
+            self.num_buffers,  # 0 lets librtlsdr use its default buffer count
             self.buffer_size
         )
-        logger.debug("Asynchronous read ended.")
+
+    def _cancel_async(self):
+        cancel_async(self.device_handle)
+
+    @property
+    def died(self) -> bool:
+        """True if the async read ended on its own while the stream was running."""
+        return self.running and not self.gate_aborted and self.thread is not None and not self.thread.is_alive()
 
     def start(self):
         if not self.running:
             self.running = True
+            if self.ring is not None:
+                self.consumer_thread = threading.Thread(target=self._consumer_thread, daemon=True)
+                self.consumer_thread.start()
             self.thread = threading.Thread(target=self._stream_thread, daemon=True)
             self.thread.start()
             logger.info("Stream started.")
 
     def stop(self):
         if self.running:
-            cancel_async(self.device_handle)
+            if self.thread.is_alive():
+                # A read that already died has nothing to cancel.
+                self._cancel_async()
             self.thread.join()
             self.running = False
+            if self.consumer_thread is not None:
+                self.ring.wake()
+                self.consumer_thread.join()
+                self.consumer_thread = None
             logger.info("Stream stopped.")
 
+    def stats(self) -> dict:
+        """Ring buffer counters for this stream (empty without a ring)."""
+        return self.ring.stats() if self.ring is not None else {}
+
 class DeviceControl:
-    def __init__(self):
-        self.manager = DeviceManager()
-        self.manager.initialize_devices()
-        self.streams = {}  # Maps device serial to SDRStream
-        self.open_handles = {}  # Cache of open device handles
+    def __init__(
+        self,
+        config_file: str = CONFIG_FILE,
+        monitor_interval: Optional[float] = None,
+        handle_idle_timeout: Optional[float] = None,
+    ):
+        # Accessibility is probed lazily (DeviceManager.is_accessible) so that
+        # startup does not open and close every dongle.
+        self.manager = DeviceManager(config_file)
+        self.manager.initialize_devices(probe=False)
+        self.manager.add_listener(self._on_device_event)
+        if monitor_interval:
+            self.manager.start_monitor(monitor_interval)
+        # Handles stay open between calls; idle ones are closed after
+        # handle_idle_timeout seconds, unless the device is streaming.
+        self.pool = HandlePool(idle_timeout=handle_idle_timeout, in_use=self._handle_in_use,
+                               release=self._release_idle_handle)
+        self.supervisor = StreamSupervisor(self._create_stream, release=self.close_device_cached)
+        self._sync_buffers = {}  # Maps device serial to its pooled read_samples buffer
+        self._sync_ready = set()  # Serials whose handle has been reset for sync reads
+        self.recorders = {}  # Maps device serial to its active IQRecorder
+        self.broadcasters = {}  # Maps device serial to the IQBroadcaster feeding network clients
+        self._broadcast_lock = threading.Lock()
+        self.command_queues = {}  # Maps device serial to its DeviceCommandQueue
+        self.scanners = {}  # Maps device serial to its active FrequencyScanner
+        self.sweeps = {}  # Maps device serial to its active PowerSweep
+        self.channelizers = {}  # Maps device serial to the Channelizer feeding channel subscribers
+        self.worker_pools = {}  # Maps device serial to the DSPWorkerPool processing its stream
+        self.timelines = {}  # Maps device serial to its latest stream's BlockTimeline, kept after stop
+        self.groups = {}  # Maps device serial to the GroupCapture it belongs to
+        self._queues_lock = threading.Lock()
+
+    @property
+    def streams(self):
+        """Maps device serial to its running SDRStream."""
+        return self.supervisor.streams
+
+    @property
+    def open_handles(self):
+        """Maps device serial to its open handle."""
+        return self.pool.handles
+
+    def _on_device_event(self, event: str, device: SDRDevice):
+        if event != DEVICE_REMOVED:
+            return
+        # The handle is dead once the dongle is unplugged; drop everything tied to it.
+        broadcaster = self.broadcasters.pop(device.serial, None)
+        if broadcaster is not None:
+            broadcaster.close()
+        self.channelizers.pop(device.serial, None)
+        if device.serial in self.groups:
+            # The rest of the group is no use for coherent work without it.
+            self.stop_group_capture(self.groups[device.serial])
+        elif device.serial in self.recorders:
+            self.stop_recording(device)
+        elif device.serial in self.sweeps:
+            self.stop_sweep(device)
+        elif device.serial in self.scanners:
+            self.stop_scan(device)
+        elif device.serial in self.worker_pools:
+            self.stop_offload(device)
+        elif device.serial in self.streams:
+            self.stop_stream(device)
+        self.close_device_cached(device)
 
     def list_devices(self):
         """List all devices managed by the DeviceManager"""
@@ -82,84 +339,832 @@ class DeviceControl:
         """Check if a device is currently open."""
         return device.serial in self.open_handles
 
+    def command_queue(self, device: SDRDevice) -> DeviceCommandQueue:
+        """The queue every call touching this device's handle goes through."""
+        queue = self.command_queues.get(device.serial)
+        if queue is None:
+            with self._queues_lock:
+                queue = self.command_queues.get(device.serial)
+                if queue is None:
+                    queue = DeviceCommandQueue(lambda param, value: self._apply_setting(device, param, value))
+                    self.command_queues[device.serial] = queue
+        return queue
+
     def open_device_cached(self, device: SDRDevice):
-        if device.serial not in self.open_handles:
-            handle = open_device(device.index)
-            self.open_handles[device.serial] = handle
+        handle = self.pool.get(device.serial)
+        if handle is None:
+            # Under the device's command lock, so racing callers open it once
+            # and the idle reaper cannot close it before it is handed out.
+            handle = self.command_queue(device).run(self._open_device, device)
+        return handle
+
+    def _open_device(self, device: SDRDevice):
+        handle = self.pool.get(device.serial)
+        if handle is None:
+            handle = self.pool.open(device)
             logger.info(f"Device {device.serial} opened and cached.")
-        return self.open_handles[device.serial]
+        return handle
 
     def close_device_cached(self, device: SDRDevice):
-        handle = self.open_handles.pop(device.serial, None)
-        if handle:
-            close_device(handle)
+        self._sync_ready.discard(device.serial)
+        queue = self.command_queues.get(device.serial)
+        if queue is not None:
+            # A reopened dongle starts from librtlsdr's defaults.
+            queue.invalidate()
+        if self.pool.close(device):
             logger.info(f"Device {device.serial} closed and removed from cache.")
 
-    def set_center_frequency(self, device: SDRDevice, freq_hz: int):
+    def _handle_in_use(self, serial: str) -> bool:
+        return serial in self.streams or serial in self.groups
+
+    def _release_idle_handle(self, device: SDRDevice):
+        # Called by the pool's reaper. Re-checked under the command lock, so
+        # a call that picked the handle up in the meantime keeps it.
+        def release():
+            if self.pool.is_idle(device.serial):
+                self.close_device_cached(device)
+        self.command_queue(device).run(release)
+
+    def open_device_configured(self, device: SDRDevice, settings: Optional[Mapping[str, int]] = None):
+        """
+        Open a device and apply ``settings`` (``DEVICE_SETTINGS`` names to
+        values) through its command queue. Returns the handle.
+
+        Raises:
+            ValueError: For a setting name not in ``DEVICE_SETTINGS``.
+        """
+        settings = settings or {}
+        unknown = set(settings) - set(DEVICE_SETTINGS)
+        if unknown:
+            raise ValueError(f"Unknown device settings: {sorted(unknown)}")
         handle = self.open_device_cached(device)
-        set_center_freq(handle, freq_hz)
-        logger.info(f"Set center frequency to {freq_hz} Hz for device {device.serial}.")
+        queue = self.command_queue(device)
+        for param in DEVICE_SETTINGS:
+            if param in settings:
+                queue.submit(param, settings[param])
+        return handle
 
-    def get_center_frequency(self, device: SDRDevice) -> int:
+    def open_devices(
+        self,
+        devices: Optional[Iterable[SDRDevice]] = None,
+        settings: Optional[Mapping[str, Mapping[str, int]]] = None,
+    ) -> Dict[str, Optional[Exception]]:
+        """
+        Open and configure several devices in parallel, e.g. to warm every
+        handle at startup instead of paying each open on its first request.
+
+        Each device is opened with the pool's retry and backoff, then gets
+        its entry of ``settings``. A device that fails does not hold up the
+        others.
+
+        Args:
+            devices: Devices to open (default: those present at the last scan).
+            settings: Maps device serial to ``DEVICE_SETTINGS`` values.
+
+        Returns:
+            Dict[str, Optional[Exception]]: By serial, None on success,
+            otherwise the error that device hit.
+        """
+        devices = list(self.manager.present.values() if devices is None else devices)
+        settings = settings or {}
+        return self.pool.open_many(
+            devices, lambda device: self.open_device_configured(device, settings.get(device.serial)))
+
+    def get_handle_stats(self, device: Optional[SDRDevice] = None) -> dict:
+        """Open latency, tries, failures and idle time, per device or for one."""
+        return self.pool.stats(device.serial if device is not None else None)
+
+    def _apply_setting(self, device: SDRDevice, param: str, value: int):
+        handle = self.open_device_cached(device)
+        if param == "center_freq":
+            set_center_freq(handle, value)
+            logger.info("Set center frequency to %d Hz for device %s.", value, device.serial)
+        elif param == "sample_rate":
+            set_sample_rate(handle, value)
+            stream = self.streams.get(device.serial)
+            if stream is not None and stream.timeline is not None:
+                stream.timeline.reset(value)
+            logger.info("Set sample rate to %d Hz for device %s.", value, device.serial)
+        elif param == "gain":
+            set_gain(handle, value)
+            logger.info("Set gain to %d for device %s.", value, device.serial)
+        else:
+            raise ValueError(f"Unknown device parameter: {param}")
+        recorder = self.recorders.get(device.serial)
+        if recorder is not None:
+            recorder.retune(**{param: value})
+
+    def _read_setting(self, device: SDRDevice, param: str, getter: Callable):
         handle = self.open_device_cached(device)
-        freq = get_center_freq(handle)
-        logger.info(f"Current center frequency for device {device.serial}: {freq} Hz.")
+        queue = self.command_queue(device)
+        value = queue.run(getter, handle)
+        queue.record(param, value)
+        return value
+
+    def set_center_frequency(self, device: SDRDevice, freq_hz: int):
+        self.command_queue(device).submit("center_freq", freq_hz)
+
+    def get_center_frequency(self, device: SDRDevice) -> int:
+        freq = self._read_setting(device, "center_freq", get_center_freq)
+        logger.debug("Current center frequency for device %s: %d Hz.", device.serial, freq)
         return freq
 
     def set_sample_rate(self, device: SDRDevice, sample_rate_hz: int):
-        handle = self.open_device_cached(device)
-        set_sample_rate(handle, sample_rate_hz)
-        logger.info(f"Set sample rate to {sample_rate_hz} Hz for device {device.serial}.")
+        self.command_queue(device).submit("sample_rate", sample_rate_hz)
 
     def get_sample_rate(self, device: SDRDevice) -> int:
-        handle = self.open_device_cached(device)
-        rate = get_sample_rate(handle)
-        logger.info(f"Current sample rate for device {device.serial}: {rate} Hz.")
+        rate = self._read_setting(device, "sample_rate", get_sample_rate)
+        logger.debug("Current sample rate for device %s: %d Hz.", device.serial, rate)
         return rate
 
     def set_gain(self, device: SDRDevice, gain: int):
-        handle = self.open_device_cached(device)
-        set_gain(handle, gain)
-        logger.info(f"Set gain to {gain} for device {device.serial}.")
+        self.command_queue(device).submit("gain", gain)
 
     def get_gain(self, device: SDRDevice) -> int:
-        handle = self.open_device_cached(device)
-        gain = get_gain(handle)
-        logger.info(f"Current gain for device {device.serial}: {gain}.")
+        gain = self._read_setting(device, "gain", get_gain)
+        logger.debug("Current gain for device %s: %d.", device.serial, gain)
         return gain
 
-    def get_device_info(self, device: SDRDevice) -> dict:
+    def get_command_stats(self, device: Optional[SDRDevice] = None) -> dict:
+        """
+        Submitted, applied, coalesced, skipped and failed parameter updates,
+        for one device or keyed by serial for all of them.
+        """
+        if device is not None:
+            queue = self.command_queues.get(device.serial)
+            return queue.stats() if queue is not None else {}
+        return {serial: queue.stats() for serial, queue in list(self.command_queues.items())}
+
+    def get_device_info(self, device: SDRDevice, refresh: bool = False, max_age: Optional[float] = None) -> dict:
+        """
+        Device description plus its last known tuner state.
+
+        The tuner values come from the state cache, which every successful set
+        and read keeps current, so by default this neither opens the device
+        nor talks to it. Values never set or read since the device was opened
+        are None.
+
+        Args:
+            device (SDRDevice): The device to describe.
+            refresh (bool): Read every value back from the hardware, opening
+                the device if needed.
+            max_age (float, optional): Re-read values older than this many
+                seconds, or unknown, if the device is already open. A closed
+                device is never opened for this.
+
+        Returns:
+            dict: serial, manufacturer, product, name, center_frequency,
+            sample_rate, gain, ``open`` and ``state_age`` (seconds since the
+            oldest tuner value was confirmed, None if any is unknown).
+        """
+        tuner = {  # param -> (info key, hardware getter)
+            "center_freq": ("center_frequency", self.get_center_frequency),
+            "sample_rate": ("sample_rate", self.get_sample_rate),
+            "gain": ("gain", self.get_gain),
+        }
+        queue = self.command_queue(device)
+        is_open = self.is_device_open(device)
         info = {
             "serial": device.serial,
             "manufacturer": device.manufacturer,
             "product": device.product,
             "name": device.name,
-            "center_frequency": self.get_center_frequency(device),
-            "sample_rate": self.get_sample_rate(device),
-            "gain": self.get_gain(device),
         }
+        ages = []
+        for param, (key, getter) in tuner.items():
+            age = queue.age(param)
+            if refresh or (is_open and max_age is not None and (age is None or age > max_age)):
+                getter(device)
+                age = queue.age(param)
+            info[key] = queue.values.get(param)
+            ages.append(age)
+        info["open"] = self.is_device_open(device)
+        info["state_age"] = None if None in ages else max(ages)
         return info
 
-    def start_stream(self, device: SDRDevice, callback: Callable[[bytes], None], buffer_size: int = 16 * 16384):
+    def _sync_buffer(self, device: SDRDevice, nbytes: int) -> np.ndarray:
+        buffer = self._sync_buffers.get(device.serial)
+        if buffer is None or buffer.shape[0] < nbytes:
+            buffer = np.empty(nbytes, dtype=np.uint8)
+            self._sync_buffers[device.serial] = buffer
+        return buffer
+
+    def read_samples(self, device: SDRDevice, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read ``n`` interleaved I/Q samples (``2 * n`` bytes) in one blocking call.
+
+        Args:
+            device (SDRDevice): The device to read from.
+            n (int): Number of I/Q samples to read.
+            out (np.ndarray, optional): Contiguous uint8 array of at least
+                ``2 * n`` bytes to fill. If omitted, a per-device pooled
+                buffer is used and overwritten by the next call.
+
+        Returns:
+            np.ndarray: A uint8 view of the ``2 * n`` bytes read.
+
+        Raises:
+            RuntimeError: If the device is currently streaming.
+            ValueError: If ``out`` is not a large enough contiguous uint8 array.
+            IOError: If the read fails.
+        """
         if device.serial in self.streams:
-            logger.warning(f"Stream already running for device {device.serial}.")
-            return
+            raise RuntimeError(f"Device {device.serial} is streaming; stop the stream before reading synchronously.")
+        nbytes = 2 * n
+        if out is not None and (
+            out.dtype != np.uint8 or out.ndim != 1 or not out.flags.c_contiguous or out.shape[0] < nbytes
+        ):
+            raise ValueError(f"out must be a contiguous uint8 array of at least {nbytes} bytes")
 
         handle = self.open_device_cached(device)
-        stream = SDRStream(handle, buffer_size, callback)
-        self.streams[device.serial] = stream
-        stream.start()
+        if device.serial not in self._sync_ready:
+            # librtlsdr requires a buffer reset before the first synchronous read.
+            reset_buffer(handle)
+            self._sync_ready.add(device.serial)
+
+        aligned = -(-nbytes // SYNC_READ_ALIGNMENT) * SYNC_READ_ALIGNMENT
+        if out is not None and out.shape[0] >= aligned:
+            target = out
+        else:
+            target = self._sync_buffer(device, aligned)
+
+        address = target.ctypes.data
+        filled = 0
+        while filled < aligned:
+            n_read = read_sync(handle, address + filled, aligned - filled)
+            if n_read <= 0:
+                raise IOError(f"Short read from device {device.serial}: {filled} of {aligned} bytes")
+            filled += n_read
+
+        if out is None:
+            return target[:nbytes]
+        if target is not out:
+            out[:nbytes] = target[:nbytes]
+        return out[:nbytes]
+
+    def _create_stream(self, device: SDRDevice, spec: StreamSpec) -> SDRStream:
+        handle = self.open_device_cached(device)
+        stream = SDRStream(handle, sample_rate=self.get_sample_rate(device), **spec.stream_kwargs())
+        self.timelines[device.serial] = stream.timeline
+        return stream
+
+    def start_stream(
+        self,
+        device: SDRDevice,
+        callback: Callable[[Union[bytes, np.ndarray]], None],
+        buffer_size: int = 16 * 16384,
+        output_format: str = "bytes",
+        copy: bool = False,
+        ring_depth: Optional[int] = None,
+        converter: Optional[IQConverter] = None,
+        cpus: Optional[Iterable[int]] = None,
+        consumer_cpus: Optional[Iterable[int]] = None,
+        metadata: bool = False,
+        timeline_capacity: int = 4096,
+        start_gate: Optional[StartGate] = None,
+    ):
+        """
+        Start streaming from a device; see ``SDRStream`` for the arguments.
+        With ``metadata=True`` the callback also gets the block's timeline
+        row; see ``get_block_timeline``.
+        """
+        spec = StreamSpec(
+            callback,
+            buffer_size=buffer_size,
+            output_format=output_format,
+            copy=copy,
+            ring_depth=ring_depth,
+            converter=converter,
+            cpus=cpus,
+            consumer_cpus=consumer_cpus,
+            metadata=metadata,
+            timeline_capacity=timeline_capacity,
+            start_gate=start_gate,
+        )
+        self.supervisor.start(device, spec)
         logger.info(f"Stream started for device {device.serial}.")
 
     def stop_stream(self, device: SDRDevice):
+        if self.supervisor.stop(device):
+            logger.info(f"Stream stopped for device {device.serial}.")
+
+    def get_block_timeline(self, device: SDRDevice) -> Optional[BlockTimeline]:
+        """
+        Per-block arrival and sample-clock timestamps of the device's running
+        stream, or of its last one once stopped. A supervised restart starts
+        a new timeline. None if the device never streamed.
+        """
+        return self.timelines.get(device.serial)
+
+    def start_recording(
+        self,
+        device: SDRDevice,
+        path_prefix: str,
+        buffer_size: int = 16 * 16384,
+        ring_depth: int = 32,
+        **recorder_kwargs,
+    ) -> IQRecorder:
+        """
+        Stream a device's raw samples to SigMF files on disk.
+
+        The tuner's current frequency, sample rate and gain are written to the
+        metadata, and changes made while recording are noted there too (see
+        ``IQRecorder.retune``). Disk writes run on the ring buffer's consumer thread, so a
+        slow disk shows up as ring drops rather than stalling librtlsdr.
+
+        Args:
+            device (SDRDevice): The device to record.
+            path_prefix (str): Prefix for the ``.sigmf-data``/``.sigmf-meta`` files.
+            buffer_size (int): Bytes per librtlsdr transfer.
+            ring_depth (int): Blocks buffered between librtlsdr and the disk.
+            **recorder_kwargs: Passed on to ``IQRecorder`` (rotation, mode, ...).
+
+        Returns:
+            IQRecorder: The active recorder.
+        """
+        if device.serial in self.recorders:
+            raise RuntimeError(f"Device {device.serial} is already recording.")
+        recorder = IQRecorder(
+            path_prefix,
+            sample_rate=self.get_sample_rate(device),
+            center_freq=self.get_center_frequency(device),
+            gain=self.get_gain(device),
+            hw=f"{device.manufacturer} {device.product} ({device.serial})",
+            **recorder_kwargs,
+        )
+        self.recorders[device.serial] = recorder
+        try:
+            self.start_stream(device, recorder, buffer_size=buffer_size, output_format="uint8", ring_depth=ring_depth)
+        except Exception:
+            self.recorders.pop(device.serial, None)
+            raise
+        logger.info(f"Recording started for device {device.serial} to {path_prefix}.")
+        return recorder
+
+    def start_group_capture(
+        self,
+        devices: List[SDRDevice],
+        path_prefix: str,
+        sample_rate: int,
+        center_freq: int,
+        gain: Optional[int] = None,
+        **group_kwargs,
+    ) -> GroupCapture:
+        """
+        Record several devices together with an aligned start; see
+        ``GroupCapture`` for the output and the remaining arguments.
+
+        Raises:
+            RuntimeError: If a device is already streaming or in a group.
+        """
+        busy = [device.serial for device in devices if device.serial in self.streams or device.serial in self.groups]
+        if busy:
+            raise RuntimeError(f"Devices already streaming: {busy}")
+        group = GroupCapture(self, devices, path_prefix, sample_rate, center_freq, gain=gain, **group_kwargs)
+        for device in devices:
+            self.groups[device.serial] = group
+        try:
+            group.start()
+        except Exception:
+            for device in devices:
+                self.groups.pop(device.serial, None)
+            raise
+        return group
+
+    def stop_group_capture(self, group: GroupCapture) -> Optional[dict]:
+        """Stop a group capture and write its metadata; returns the metadata."""
+        for device in group.devices:
+            self.groups.pop(device.serial, None)
+        if not group.running:
+            return None
+        return group.stop()
+
+    def stop_recording(self, device: SDRDevice) -> Optional[IQRecorder]:
+        """Stop a device's recording and finalize its files."""
+        recorder = self.recorders.pop(device.serial, None)
+        if recorder is None:
+            logger.warning(f"Device {device.serial} is not recording.")
+            return None
+        self.stop_stream(device)
+        recorder.close()
+        logger.info(f"Recording stopped for device {device.serial} ({recorder.bytes_written} bytes).")
+        return recorder
+
+    def start_scan(
+        self,
+        device: SDRDevice,
+        frequencies: Iterable[int],
+        dwell: float,
+        callback: Callable[[int, np.ndarray], None],
+        settle_time: float = DEFAULT_SETTLE_TIME,
+        sweeps: Optional[int] = None,
+        buffer_size: int = 4096,
+        ring_depth: int = 64,
+        on_dwell_complete: Optional[Callable[[int], None]] = None,
+    ) -> FrequencyScanner:
+        """
+        Hop a device across a frequency plan while it keeps streaming.
+
+        Retunes bypass the per-call logging of ``set_center_frequency`` but
+        still go through the device's command queue and state cache.
+
+        Args:
+            device (SDRDevice): The device to scan with.
+            frequencies (Iterable[int]): Frequencies to visit, in Hz.
+            dwell (float): Seconds of usable samples per frequency.
+            callback: ``callback(freq_hz, samples)``; see ``FrequencyScanner``.
+            settle_time (float): Seconds dropped after each retune while the
+                PLL locks. Should also cover samples still in flight in
+                librtlsdr's transfer buffers.
+            sweeps (int, optional): Passes over the plan; forever if omitted.
+                Call ``stop_scan`` once ``FrequencyScanner.wait`` returns.
+            buffer_size (int): Bytes per block. Hops happen between blocks,
+                so smaller blocks waste fewer samples per hop.
+            ring_depth (int): Blocks buffered between librtlsdr and the scanner.
+            on_dwell_complete: Called with each frequency as its dwell ends.
+
+        Returns:
+            FrequencyScanner: The running scanner.
+
+        Raises:
+            RuntimeError: If the device is already streaming.
+            ValueError: If the plan is empty or the dwell is too short.
+        """
+        if device.serial in self.streams:
+            raise RuntimeError(f"Device {device.serial} is already streaming.")
+        frequencies = list(frequencies)
+        sample_rate = self.get_sample_rate(device)
+        scanner = FrequencyScanner(
+            frequencies,
+            dwell_samples=round(dwell * sample_rate),
+            retune=lambda freq: self._scan_retune(device, freq),
+            callback=callback,
+            settle_samples=round(settle_time * sample_rate),
+            sweeps=sweeps,
+            on_dwell_complete=on_dwell_complete,
+        )
+        self.set_center_frequency(device, scanner.frequency)
+        self.scanners[device.serial] = scanner
+        try:
+            self.start_stream(device, scanner, buffer_size=buffer_size, output_format="uint8", ring_depth=ring_depth)
+        except Exception:
+            self.scanners.pop(device.serial, None)
+            raise
+        logger.info(f"Scan of {len(frequencies)} frequencies started on device {device.serial}.")
+        return scanner
+
+    def _scan_retune(self, device: SDRDevice, freq_hz: int) -> int:
+        # Runs on the stream's consumer thread once per hop.
+        handle = self.open_handles[device.serial]
+        queue = self.command_queue(device)
+        queue.run(set_center_freq, handle, freq_hz, log=False)
+        queue.record("center_freq", freq_hz)
+        stream = self.streams.get(device.serial)
+        ring = stream.ring if stream is not None else None
+        if ring is None:
+            return 0
+        # Blocks queued behind the one being processed predate the retune.
+        return max(len(ring) - 1, 0) * (ring.block_size // 2)
+
+    def stop_scan(self, device: SDRDevice) -> Optional[FrequencyScanner]:
+        """Stop a device's scan. Returns the scanner, whose ``stats()`` stay readable."""
+        scanner = self.scanners.pop(device.serial, None)
+        if scanner is None:
+            logger.warning(f"Device {device.serial} is not scanning.")
+            return None
+        self.stop_stream(device)
+        logger.info(f"Scan stopped on device {device.serial} after {scanner.hops} hops.")
+        return scanner
+
+    def start_sweep(
+        self,
+        device: SDRDevice,
+        plan: SweepPlan,
+        output_path: Optional[str] = None,
+        output_format: str = "csv",
+        on_sweep: Optional[Callable[[float, np.ndarray], None]] = None,
+        window: str = "hann",
+        sweeps: Optional[int] = None,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+        buffer_size: int = 4096,
+    ) -> PowerSweep:
+        """
+        Sweep a band continuously, rtl_power style.
+
+        The device is set to ``plan.sample_rate`` and hops across
+        ``plan.centers`` with a ``FrequencyScanner``; spectra are computed on
+        the stream's consumer thread as each hop completes.
+
+        Args:
+            device (SDRDevice): The device to sweep with.
+            plan (SweepPlan): Band layout, FFT size and averaging.
+            output_path (str, optional): File to stream results to.
+            output_format (str): ``"csv"`` (one rtl_power line per hop) or
+                ``"binary"`` (one float32 row per sweep; see ``read_sweep_file``).
+            on_sweep: Called with the timestamp and dB spectrum of every sweep.
+            window (str): FFT window.
+            sweeps (int, optional): Sweeps to run; forever if omitted. Call
+                ``stop_sweep`` once ``scanner.wait`` returns.
+            settle_time (float): Seconds dropped after each retune.
+            buffer_size (int): Bytes per stream block.
+
+        Returns:
+            PowerSweep: The running sweep; ``stats()`` reports cycle time and CPU.
+
+        Raises:
+            RuntimeError: If the device is already streaming.
+            ValueError: If ``output_format`` is not supported.
+        """
+        if output_format not in SWEEP_FORMATS:
+            raise ValueError(f"Unsupported sweep output format: {output_format}")
+        if device.serial in self.streams:
+            raise RuntimeError(f"Device {device.serial} is already streaming.")
+        writer = None
+        if output_path is not None:
+            writer = CsvSweepWriter(output_path) if output_format == "csv" else BinarySweepWriter(output_path, plan)
+        sweep = PowerSweep(plan, writer=writer, on_sweep=on_sweep, window=window)
+        try:
+            self.set_sample_rate(device, plan.sample_rate)
+            sweep.scanner = self.start_scan(
+                device,
+                plan.centers,
+                dwell=plan.dwell_samples / plan.sample_rate,
+                callback=sweep,
+                settle_time=settle_time,
+                sweeps=sweeps,
+                buffer_size=buffer_size,
+                on_dwell_complete=sweep.hop_complete,
+            )
+        except Exception:
+            sweep.close()
+            raise
+        self.sweeps[device.serial] = sweep
+        logger.info(
+            f"Sweep of {plan.start_hz:.0f}-{plan.stop_hz:.0f} Hz in {len(plan)} hops "
+            f"started on device {device.serial}."
+        )
+        return sweep
+
+    def stop_sweep(self, device: SDRDevice) -> Optional[PowerSweep]:
+        """Stop a device's sweep and close its output file."""
+        sweep = self.sweeps.pop(device.serial, None)
+        if sweep is None:
+            logger.warning(f"Device {device.serial} is not sweeping.")
+            return None
+        self.stop_scan(device)
+        sweep.close()
+        logger.info(f"Sweep stopped on device {device.serial} after {sweep.sweeps} sweeps.")
+        return sweep
+
+    def subscribe_iq(
+        self,
+        device: SDRDevice,
+        loop: asyncio.AbstractEventLoop,
+        decimation: int = 1,
+        output_format: str = "cu8",
+        max_queue: Optional[int] = None,
+        buffer_size: int = 16 * 16384,
+        ring_depth: int = 32,
+    ) -> IQSubscription:
+        """
+        Subscribe a network client to a device's samples.
+
+        The first subscriber starts a stream feeding an ``IQBroadcaster``;
+        later ones share it, and the stream stops once the last one leaves.
+
+        Args:
+            device (SDRDevice): The device to stream from.
+            loop (asyncio.AbstractEventLoop): Loop the client consumes on.
+            decimation (int): Server-side decimation factor.
+            output_format (str): ``"cu8"`` or ``"cf32"``.
+            max_queue (int, optional): Blocks the client may fall behind before
+                it is dropped.
+            buffer_size (int): Bytes per block when the stream is started.
+            ring_depth (int): Ring depth when the stream is started.
+
+        Returns:
+            IQSubscription: Async iterator over encoded blocks.
+
+        Raises:
+            ValueError: For an unsupported format or decimation.
+            RuntimeError: If the device is already streaming for something else.
+        """
+        # Before any stream starts: a refused client must not leave the
+        # dongle streaming into a broadcaster nobody will ever leave.
+        check_subscription(decimation, output_format)
+        with self._broadcast_lock:
+            broadcaster = self.broadcasters.get(device.serial)
+            started = broadcaster is None
+            if started:
+                if device.serial in self.streams:
+                    raise RuntimeError(f"Device {device.serial} is already streaming.")
+                broadcaster = IQBroadcaster(on_idle=lambda: self._release_broadcaster(device))
+                self.start_stream(device, broadcaster, buffer_size=buffer_size, output_format="uint8", ring_depth=ring_depth)
+                self.broadcasters[device.serial] = broadcaster
+            try:
+                return broadcaster.subscribe(loop, decimation=decimation, output_format=output_format, max_queue=max_queue)
+            except Exception:
+                if started:
+                    del self.broadcasters[device.serial]
+                    self.stop_stream(device)
+                raise
+
+    def _release_broadcaster(self, device: SDRDevice):
+        # on_idle can fire on the stream's own consumer thread, which
+        # stop_stream joins, so the stop happens on a thread of its own.
+        threading.Thread(target=self._stop_idle_broadcast, args=(device,), daemon=True).start()
+
+    def _stop_idle_broadcast(self, device: SDRDevice):
+        with self._broadcast_lock:
+            broadcaster = self.broadcasters.get(device.serial)
+            if broadcaster is None or broadcaster.subscriber_count:
+                return
+            del self.broadcasters[device.serial]
+            self.stop_stream(device)
+        logger.info(f"Broadcast for device {device.serial} stopped; no clients left.")
+
+    def subscribe_channel(
+        self,
+        device: SDRDevice,
+        offset_hz: float,
+        decimation: int,
+        callback: Callable[[np.ndarray], None],
+        bandwidth: Optional[float] = None,
+        num_taps: Optional[int] = None,
+        buffer_size: int = 16 * 16384,
+        ring_depth: int = 32,
+    ) -> Channel:
+        """
+        Receive one narrow channel of a device's stream, decimated.
+
+        All channel subscribers of a device share one stream and one
+        ``Channelizer``, which filters every channel in a single pass; the
+        stream stops when the last channel is unsubscribed.
+
+        Args:
+            device (SDRDevice): The device to stream from.
+            offset_hz (float): Channel center relative to the tuned frequency.
+            decimation (int): Input samples per output sample.
+            callback: Receives complex64 blocks at the decimated rate, on the
+                stream's consumer thread.
+            bandwidth (float, optional): Passband width in Hz.
+            num_taps (int, optional): Filter length.
+            buffer_size (int): Bytes per block when the stream is started.
+            ring_depth (int): Ring depth when the stream is started.
+
+        Returns:
+            Channel: Handle for ``unsubscribe_channel``.
+
+        Raises:
+            RuntimeError: If the device is already streaming for something else.
+            ValueError: If the channel does not fit the device's band.
+        """
+        with self._broadcast_lock:
+            channelizer = self.channelizers.get(device.serial)
+            if channelizer is not None:
+                return channelizer.add_channel(offset_hz, decimation, callback, bandwidth, num_taps)
+            if device.serial in self.streams:
+                raise RuntimeError(f"Device {device.serial} is already streaming.")
+            channelizer = Channelizer(self.get_sample_rate(device))
+            channel = channelizer.add_channel(offset_hz, decimation, callback, bandwidth, num_taps)
+            self.start_stream(device, channelizer, buffer_size=buffer_size, output_format="uint8", ring_depth=ring_depth)
+            self.channelizers[device.serial] = channelizer
+            return channel
+
+    def unsubscribe_channel(self, device: SDRDevice, channel: Channel):
+        """Stop delivering a channel; stops the stream if it was the last one."""
+        with self._broadcast_lock:
+            channelizer = self.channelizers.get(device.serial)
+            if channelizer is None:
+                return
+            channelizer.remove_channel(channel)
+            if not channelizer.channels:
+                del self.channelizers[device.serial]
+                self.stop_stream(device)
+
+    def start_demod(
+        self,
+        device: SDRDevice,
+        offset_hz: float,
+        mode: str = "fm",
+        audio_rate: int = 48_000,
+        callback: Optional[Callable[[np.ndarray], None]] = None,
+        wav_path: Optional[str] = None,
+        **demod_kwargs,
+    ) -> Demodulator:
+        """
+        Demodulate one channel of a device's stream to audio.
+
+        The channel is cut out by the device's shared ``Channelizer`` (see
+        ``subscribe_channel``), so any number of demodulators on one device
+        share a single stream and a single pass over the wideband samples.
+
+        Args:
+            device (SDRDevice): The device to stream from.
+            offset_hz (float): Channel center relative to the tuned frequency.
+            mode (str): ``"fm"``, ``"wfm"`` or ``"am"``.
+            audio_rate (int): Audio sample rate in Hz.
+            callback: Receives float32 audio blocks on the stream's consumer thread.
+            wav_path (str, optional): Also write the audio to this WAV file.
+            **demod_kwargs: Passed on to ``Demodulator`` (deviation, de-emphasis).
+
+        Returns:
+            Demodulator: The running demodulator, for ``stop_demod``.
+        """
+        sample_rate = self.get_sample_rate(device)
+        decimation = channel_decimation(sample_rate, mode)
+        writer = WavAudioWriter(wav_path, audio_rate) if wav_path else None
+
+        def deliver(audio: np.ndarray):
+            if writer is not None:
+                writer(audio)
+            if callback is not None:
+                callback(audio)
+
+        demod = Demodulator(mode, sample_rate / decimation, audio_rate, deliver, **demod_kwargs)
+        demod.writer = writer
+        try:
+            demod.channel = self.subscribe_channel(device, offset_hz, decimation, demod)
+        except Exception:
+            if writer is not None:
+                writer.close()
+            raise
+        logger.info(f"{mode.upper()} demodulation at {offset_hz:+.0f} Hz started on device {device.serial}.")
+        return demod
+
+    def stop_demod(self, device: SDRDevice, demod: Demodulator):
+        """Stop a demodulator and finalize its WAV file, if any."""
+        self.unsubscribe_channel(device, demod.channel)
+        if demod.writer is not None:
+            demod.writer.close()
+        logger.info(f"Demodulation stopped on device {device.serial} after {demod.samples_out} audio samples.")
+
+    def start_offload(
+        self,
+        device: SDRDevice,
+        func: Callable[[np.ndarray], Any],
+        on_result: Optional[Callable[[int, Any], None]] = None,
+        num_workers: Optional[int] = None,
+        num_slots: int = 64,
+        buffer_size: int = 16 * 16384,
+    ) -> DSPWorkerPool:
+        """
+        Stream a device into a pool of worker processes.
+
+        Each block is copied once into shared memory on the librtlsdr thread
+        and processed by ``func`` in a worker; see ``DSPWorkerPool``. Use this
+        for per-block work heavy enough to saturate one core, especially
+        with several dongles streaming.
+
+        Args:
+            device (SDRDevice): The device to stream from.
+            func: Picklable function of one uint8 block, run in a worker.
+            on_result: Receives ``(seq, result)`` in stream order.
+            num_workers (int, optional): Worker processes; defaults to the CPU count.
+            num_slots (int): Blocks queued or in flight before new ones are dropped.
+            buffer_size (int): Bytes per block.
+
+        Returns:
+            DSPWorkerPool: The running pool.
+
+        Raises:
+            RuntimeError: If the device is already streaming.
+        """
+        if device.serial in self.streams:
+            raise RuntimeError(f"Device {device.serial} is already streaming.")
+        pool = DSPWorkerPool(func, on_result, num_workers=num_workers, num_slots=num_slots, slot_size=buffer_size)
+        self.worker_pools[device.serial] = pool
+        try:
+            self.start_stream(device, pool, buffer_size=buffer_size, output_format="uint8")
+        except Exception:
+            self.worker_pools.pop(device.serial, None)
+            pool.close()
+            raise
+        logger.info(f"DSP offload to {pool.num_workers} workers started for device {device.serial}.")
+        return pool
+
+    def stop_offload(self, device: SDRDevice) -> Optional[DSPWorkerPool]:
+        """Stop a device's stream, drain its worker pool and shut the workers down."""
+        pool = self.worker_pools.pop(device.serial, None)
+        if pool is None:
+            logger.warning(f"Device {device.serial} has no DSP offload running.")
+            return None
+        self.stop_stream(device)
+        pool.close()
+        logger.info(f"DSP offload stopped for device {device.serial} after {pool.blocks_done} blocks.")
+        return pool
+
+    def get_stream_throughput(self, device: Optional[SDRDevice] = None) -> dict:
+        """Samples/s, callbacks/s, drops and restarts per streaming device."""
+        return self.supervisor.throughput(device)
+
+    def get_stream_stats(self, device: SDRDevice) -> dict:
+        """Overrun, drop and high-water-mark counters for a device's stream."""
         stream = self.streams.get(device.serial)
         if not stream:
             logger.warning(f"No active stream for device {device.serial}.")
-            return
-        stream.stop()
-        self.close_device_cached(device)
-        del self.streams[device.serial]
-        logger.info(f"Stream stopped for device {device.serial}.")
+            return {}
+        return stream.stats()
         
     # def set_direct_sampling(self, device: SDRDevice, enable: bool):
     #     handle = self.open_device_cached(device)
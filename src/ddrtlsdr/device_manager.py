@@ -3,12 +3,15 @@
 import json
 import logging
 import os
-import ctypes
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
 
 from .librtlsdr_wrapper import (
-    rtl,  # Import the rtl library instance from the wrapper
     get_device_count,
+    get_device_name,
+    get_device_usb_strings,
     open_device,
     close_device
 )
@@ -19,12 +22,41 @@ from .logging_config import setup_logging
 setup_logging()
 logger = logging.getLogger("ddrtlsdr.device_manager")
 
-CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
+CONFIG_FILE = os.environ.get("DDRTLSDR_CONFIG_FILE", os.path.join(os.path.dirname(__file__), "config.json"))
+DEVICE_ADDED = "added"
+DEVICE_REMOVED = "removed"
 
 class DeviceManager:
-    def __init__(self, config_file: str = CONFIG_FILE):
+    """
+    Keeps the device inventory and the persisted configuration.
+
+    Enumeration results are cached for ``inventory_ttl`` seconds, so repeated
+    ``enumerate_devices`` calls do not go back to librtlsdr. Each scan is
+    diffed by serial against the devices seen last time and listeners
+    registered with ``add_listener`` are told about devices that appeared or
+    disappeared; ``start_monitor`` rescans in the background to catch
+    hotplugs. Accessibility probes open each dongle, so they only run on
+    request (``probe_devices``) or lazily (``is_accessible``), in parallel.
+
+    Args:
+        config_file (str): Path of the JSON configuration.
+        inventory_ttl (float): Seconds an enumeration result stays fresh.
+        probe_workers (int): Threads used for parallel accessibility probes.
+    """
+
+    def __init__(self, config_file: str = CONFIG_FILE, inventory_ttl: float = 5.0, probe_workers: int = 8):
         self.config_file = config_file
         self.config: SDRConfig = SDRConfig()
+        self.inventory_ttl = inventory_ttl
+        self.probe_workers = probe_workers
+        self.present: Dict[str, SDRDevice] = {}  # Devices attached at the last scan, by serial
+        self.present_by_index: Dict[int, SDRDevice] = {}  # The same devices, by librtlsdr index
+        self.accessibility: Dict[str, bool] = {}  # Probe results, by serial
+        self._scanned_at = None  # time.monotonic() of the last scan
+        self._listeners: List[Callable[[str, SDRDevice], None]] = []
+        self._lock = threading.RLock()
+        self._monitor = None
+        self._monitor_stop = threading.Event()
         self.load_config()
 
     def load_config(self):
@@ -48,36 +80,36 @@ class DeviceManager:
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
 
-    def enumerate_devices(self) -> List[SDRDevice]:
+    def add_listener(self, listener: Callable[[str, SDRDevice], None]):
+        """Call ``listener(event, device)`` with ``"added"``/``"removed"`` on hotplug."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, SDRDevice], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _scan(self) -> List[SDRDevice]:
         count = get_device_count()
         logger.info(f"Number of RTL-SDR devices found: {count}")
         discovered_devices = []
         for i in range(count):
             # Retrieve device name
             try:
-                name_ptr = rtl.rtlsdr_get_device_name(i)
-                name = name_ptr.decode("utf-8") if isinstance(name_ptr, bytes) else "Unknown"
+                name = get_device_name(i) or "Unknown"
             except Exception as e:
                 logger.error(f"Failed to get device name for index {i}: {e}")
                 name = "Unknown"
 
-            # Prepare buffers for USB strings
-            serial = ctypes.create_string_buffer(256)
-            manufacturer = ctypes.create_string_buffer(256)
-            product = ctypes.create_string_buffer(256)
-
             # Retrieve USB strings
             try:
-                result = rtl.rtlsdr_get_device_usb_strings(i, manufacturer, product, serial)
-                if result != 0:
-                    raise IOError(f"Failed to retrieve USB strings for device {i}.")
+                manufacturer, product, serial = get_device_usb_strings(i)
             except Exception as e:
                 logger.error(f"Failed to retrieve USB strings for device {i}: {e}")
                 serial_value = manufacturer_value = product_value = "Unknown"
             else:
-                serial_value = serial.value.decode("utf-8") if serial.value else "Unknown"
-                manufacturer_value = manufacturer.value.decode("utf-8") if manufacturer.value else "Unknown"
-                product_value = product.value.decode("utf-8") if product.value else "Unknown"
+                serial_value = serial or "Unknown"
+                manufacturer_value = manufacturer or "Unknown"
+                product_value = product or "Unknown"
 
             # Create and validate SDRDevice
             try:
@@ -88,26 +120,114 @@ class DeviceManager:
                     manufacturer=manufacturer_value,
                     product=product_value,
                 )
-                logger.debug(f"Enumerated Device: {device.json()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Enumerated Device: {device.model_dump_json()}")
                 discovered_devices.append(device)
             except ValueError as ve:
                 logger.error(f"Validation failed for device {i}: {ve}")
+        return discovered_devices
 
-        # Merge new devices with existing config
-        existing_serials = {dev.serial for dev in self.config.devices}
+    def _merge(self, discovered_devices: List[SDRDevice]) -> bool:
+        """Fold a scan into the config. Returns True if the config changed."""
+        changed = False
         for device in discovered_devices:
-            if device.serial not in existing_serials:
-                self.config.devices.append(device)
+            existing = self.config.get_device(device.serial)
+            if existing is None:
+                self.config.add_device(device)
+                changed = True
                 logger.info(f"New device {device.serial} added to configuration.")
+            elif existing.index != device.index:
+                # librtlsdr indexes shift as dongles come and go.
+                logger.info(f"Device {device.serial} moved from index {existing.index} to {device.index}.")
+                existing.index = device.index
+                changed = True
             else:
                 logger.debug(f"Device {device.serial} is already recognized.")
-        self.save_config()
+        return changed
+
+    def refresh(self) -> List[tuple]:
+        """
+        Rescan the bus now, update the config and notify listeners.
+
+        Returns:
+            List[tuple]: The ``(event, device)`` pairs emitted by this scan.
+        """
+        discovered_devices = self._scan()
+        with self._lock:
+            changed = self._merge(discovered_devices)
+            current = {dev.serial: self.config.get_device(dev.serial) for dev in discovered_devices}
+            events = [(DEVICE_ADDED, dev) for serial, dev in current.items() if serial not in self.present]
+            events += [(DEVICE_REMOVED, dev) for serial, dev in self.present.items() if serial not in current]
+            for event, dev in events:
+                if event == DEVICE_REMOVED:
+                    self.accessibility.pop(dev.serial, None)
+            self.present = current
+            self.present_by_index = {dev.index: dev for dev in current.values()}
+            self._scanned_at = time.monotonic()
+            if changed:
+                self.save_config()
+
+        for event, device in events:
+            logger.info(f"Device {device.serial} {event}.")
+            for listener in list(self._listeners):
+                try:
+                    listener(event, device)
+                except Exception as e:
+                    logger.error(f"Device listener failed for {event} {device.serial}: {e}")
+        return events
+
+    @property
+    def inventory_age(self) -> Optional[float]:
+        """Seconds since the last scan, or None if the bus was never scanned."""
+        if self._scanned_at is None:
+            return None
+        return time.monotonic() - self._scanned_at
+
+    def enumerate_devices(self, force: bool = False) -> List[SDRDevice]:
+        """
+        Configured devices, rescanning the bus first if the cached inventory
+        is older than ``inventory_ttl`` (or ``force`` is set).
+        """
+        age = self.inventory_age
+        if force or age is None or age >= self.inventory_ttl:
+            self.refresh()
         return self.config.devices
 
+    def start_monitor(self, interval: Optional[float] = None):
+        """Rescan every ``interval`` seconds (default: the TTL) on a background thread."""
+        if self._monitor is not None and self._monitor.is_alive():
+            return
+        interval = interval or self.inventory_ttl
+        self._monitor_stop.clear()
+        self._monitor = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
+        self._monitor.start()
+        logger.info(f"Device monitor started ({interval} s interval).")
+
+    def stop_monitor(self):
+        if self._monitor is not None:
+            self._monitor_stop.set()
+            self._monitor.join()
+            self._monitor = None
+            logger.info("Device monitor stopped.")
+
+    def _monitor_loop(self, interval: float):
+        while not self._monitor_stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Background device scan failed: {e}")
+
+    def get_device(self, serial: str) -> Optional[SDRDevice]:
+        """Configured device with this serial, or None."""
+        return self.config.get_device(serial)
+
+    def get_device_by_index(self, index: int) -> Optional[SDRDevice]:
+        """Device currently attached at this librtlsdr index, or None."""
+        return self.present_by_index.get(index)
+
     def add_device_if_unrecognized(self, device: SDRDevice):
-        if not any(dev.serial == device.serial for dev in self.config.devices):
+        if self.config.add_device(device):
             logger.info(f"Unrecognized device found: {device.serial}. Adding to config.")
-            self.config.devices.append(device)
             self.save_config()
         else:
             logger.debug(f"Device {device.serial} is already recognized.")
@@ -117,10 +237,35 @@ class DeviceManager:
             handle = open_device(device.index)
             logger.info(f"Device {device.serial} is accessible.")
             close_device(handle)
-            return True
+            accessible = True
         except IOError as e:
             logger.error(f"Device {device.serial} is locked or inaccessible. Error: {e}")
-            return False
+            accessible = False
+        self.accessibility[device.serial] = accessible
+        return accessible
+
+    def probe_devices(self, devices: Optional[Iterable[SDRDevice]] = None) -> Dict[str, bool]:
+        """
+        Check that devices can be opened, probing them in parallel.
+
+        Args:
+            devices: Devices to probe (default: those present at the last scan).
+
+        Returns:
+            Dict[str, bool]: Accessibility by serial.
+        """
+        devices = list(self.present.values() if devices is None else devices)
+        if not devices:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.probe_workers, len(devices))) as pool:
+            results = list(pool.map(self.verify_device_accessibility, devices))
+        return {device.serial: accessible for device, accessible in zip(devices, results)}
+
+    def is_accessible(self, device: SDRDevice, refresh: bool = False) -> bool:
+        """Cached accessibility of a device, probing it the first time it is asked about."""
+        if refresh or device.serial not in self.accessibility:
+            return self.verify_device_accessibility(device)
+        return self.accessibility[device.serial]
 
     def log_device_info(self, device: SDRDevice):
         logger.info(
@@ -128,15 +273,22 @@ class DeviceManager:
             f"Serial: {device.serial}"
         )
 
-    def initialize_devices(self):
-        devices = self.enumerate_devices()
+    def initialize_devices(self, probe: bool = True):
+        """
+        Scan the bus and log what was found. With ``probe`` the devices are
+        also checked for accessibility, in parallel; without it the check is
+        deferred to ``is_accessible``.
+        """
+        self.enumerate_devices(force=True)
+        devices = list(self.present.values())
         for device in devices:
-            self.add_device_if_unrecognized(device)
-            accessible = self.verify_device_accessibility(device)
             self.log_device_info(device)
+        if not probe:
+            return
+        for serial, accessible in self.probe_devices(devices).items():
             if not accessible:
                 logger.warning(
-                    f"Device {device.serial} is not accessible and may be in use."
+                    f"Device {serial} is not accessible and may be in use."
                 )
 
 if __name__ == "__main__":
@@ -0,0 +1,455 @@
+# src/ddrtlsdr/group_capture.py
+
+import json
+import logging
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+import numpy as np
+
+from .models import SDRDevice
+from .recorder import IQRecorder
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.group_capture")
+
+if TYPE_CHECKING:
+    from .device_control import DeviceControl
+
+GROUP_INDEX_DTYPE = np.dtype([
+    ("device", "<i4"),  # Position of the device in the group
+    ("seq", "<i8"),  # Block number in the device's stream
+    ("output_sample", "<i8"),  # Aligned sample at which the block was written
+    ("num_samples", "<i4"),  # Samples of the block written (the part after the common start)
+    ("fill_samples", "<i8"),  # Mid-scale samples written just before it for missing data
+    ("host_time", "<f8"),  # time.perf_counter() when the block arrived
+    ("sample_time", "<f8"),  # Estimated capture time of the block's first sample
+])
+_INDEX_ROW = struct.Struct("<iqqiqdd")  # Same layout, for appending a row in one write
+GROUP_INDEX_EXT = ".index"
+GROUP_META_EXT = ".group.json"
+FILL_VALUE = 127  # cu8 mid-scale, written where a device has no samples
+DEFAULT_SETTLE_TIME = 0.25
+DEFAULT_CORRELATION_SAMPLES = 1 << 16
+
+
+class StartGate:
+    """
+    Holds several stream threads just before their async reads until every
+    one of them is ready, then lets them all go at once.
+
+    Stream threads call ``wait()``; the coordinator calls ``wait_armed()``
+    and then ``release()`` (or ``abort()`` to send them home). Once
+    released the gate stays open, so a restarted stream passes straight
+    through.
+    """
+
+    def __init__(self, parties: int):
+        self.parties = parties
+        self.arrived = 0
+        self.released_at = None  # time.perf_counter() of release()
+        self._aborted = False
+        self._open = threading.Event()
+        self._cond = threading.Condition()
+
+    def wait(self) -> bool:
+        """Arrive and block until released. Returns False if the gate was aborted."""
+        with self._cond:
+            self.arrived += 1
+            self._cond.notify_all()
+        self._open.wait()
+        return not self._aborted
+
+    def wait_armed(self, timeout: Optional[float] = None) -> bool:
+        """Block until every party has arrived. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.arrived >= self.parties, timeout)
+
+    def release(self) -> float:
+        self.released_at = time.perf_counter()
+        self._open.set()
+        return self.released_at
+
+    def abort(self):
+        self._aborted = True
+        self._open.set()
+
+
+def estimate_offsets(signals: np.ndarray, reference: int = 0, max_lag: Optional[int] = None) -> dict:
+    """
+    Sample offsets between simultaneous captures of a shared signal, from
+    the peak of their cross-correlation with one reference capture. Every
+    capture is transformed in one batched FFT, so the cost is one FFT per
+    device and one inverse FFT per device, whatever the lag range.
+
+    Device ``d`` lines up with the reference at ``offsets[d]``: its sample
+    ``m`` matches the reference's sample ``m + offsets[d]``. The integer
+    peak is refined to a fraction of a sample by parabolic interpolation.
+
+    Args:
+        signals (np.ndarray): ``(devices, samples)`` complex baseband.
+        reference (int): Row the others are measured against.
+        max_lag (int, optional): Largest offset searched, in samples.
+            Defaults to the capture length minus one.
+
+    Returns:
+        dict: ``offsets`` (samples, float), ``phases`` (radians of the
+        reference relative to each device at the peak) and ``quality``
+        (peak normalized to 1 for identical signals) arrays, one entry per
+        device.
+
+    Raises:
+        ValueError: If ``signals`` is not a 2-D array of at least two samples.
+    """
+    signals = np.asarray(signals)
+    if signals.ndim != 2 or signals.shape[1] < 2:
+        raise ValueError("Offsets need a (devices, samples) array")
+    count, length = signals.shape
+    max_lag = length - 1 if max_lag is None else max(0, min(max_lag, length - 1))
+
+    centered = signals - signals.mean(axis=1, keepdims=True)
+    size = 1 << (2 * length - 1).bit_length()  # Linear, not circular, correlation
+    spectra = np.fft.fft(centered, n=size, axis=1)
+    # correlation[d, k] = sum over m of reference[m + k] * conj(signal_d[m])
+    correlation = np.fft.ifft(spectra[reference] * np.conj(spectra), axis=1)
+    lags = np.arange(-max_lag, max_lag + 1)
+    window = correlation[:, lags % size]
+    magnitude = np.abs(window)
+
+    rows = np.arange(count)
+    peak = magnitude.argmax(axis=1)
+    left = magnitude[rows, np.maximum(peak - 1, 0)]
+    center = magnitude[rows, peak]
+    right = magnitude[rows, np.minimum(peak + 1, lags.shape[0] - 1)]
+    curvature = left - 2 * center + right
+    interior = (peak > 0) & (peak < lags.shape[0] - 1) & (curvature < 0)
+    fraction = np.zeros(count)
+    fraction[interior] = 0.5 * (left - right)[interior] / curvature[interior]
+
+    energy = np.sum(np.abs(centered) ** 2, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quality = np.nan_to_num(center / np.sqrt(energy[reference] * energy))
+    return {
+        "offsets": lags[peak] + fraction,
+        "phases": np.angle(window[rows, peak]),
+        "quality": quality,
+    }
+
+
+def read_group_index(path_prefix: str) -> np.ndarray:
+    """Load the block index a ``GroupCapture`` wrote to ``<path_prefix>.index``."""
+    return np.fromfile(path_prefix + GROUP_INDEX_EXT, dtype=GROUP_INDEX_DTYPE)
+
+
+class _AlignedMember:
+    """
+    Stream callback for one device of a group. Writes the device's samples
+    from the group's common start time on, placing every block at its
+    position on the device's sample clock and filling samples that never
+    arrived (lost upstream or dropped by the ring) with mid-scale, so
+    sample ``n`` of every device's output is the same instant.
+    """
+
+    def __init__(self, group: "GroupCapture", position: int, device: SDRDevice, recorder: IQRecorder):
+        self.group = group
+        self.position = position
+        self.device = device
+        self.recorder = recorder
+        self.timeline = None  # The stream timeline the current anchor refers to
+        self.start_sample = 0  # Device sample clock position of aligned sample 0
+        self.written = 0  # Aligned samples written, fill included
+        self.fill_samples = 0
+        self.restarts = 0
+        self._anchored = False
+        self.head = np.empty(2 * group.correlation_samples, dtype=np.uint8)  # First aligned samples, cu8
+        self.head_bytes = 0
+        self._fill_block = np.full(group.buffer_size, FILL_VALUE, dtype=np.uint8)
+
+    def __call__(self, data: np.ndarray, row):
+        group = self.group
+        num_samples = data.shape[0] // 2
+        timeline = group.control.get_block_timeline(self.device)
+        # Sample clock position: everything recorded before this block,
+        # including blocks the ring dropped, plus the losses before it. Not
+        # timeline.lost_samples, which includes gaps after a late block.
+        clock = int(row["sample_index"]) + int(row["lost_total"])
+        if timeline is not self.timeline or not self._anchored:
+            # A new stream, or a supervised restart with a fresh sample
+            # clock: anchor it by timestamp. Until its first sample is
+            # written, every block refines the anchor as the fit settles.
+            if timeline is not self.timeline and self.timeline is not None:
+                self.restarts += 1
+                logger.warning(f"Group stream for device {self.device.serial} restarted; re-aligning by timestamp.")
+            self.timeline = timeline
+            self._anchored = False
+            aligned = round((float(row["sample_time"]) - group.start_time) * group.sample_rate)
+            self.start_sample = clock - aligned
+            if aligned + num_samples <= self.written:
+                return
+            self._anchored = True
+
+        aligned = clock - self.start_sample
+        if aligned < self.written:
+            # Starts before the common start (or overlaps after a re-anchor).
+            data = data[2 * (self.written - aligned):]
+            aligned = self.written
+        fill = aligned - self.written
+        if fill:
+            self._fill(fill)
+        self._write(data)
+        group._index(self.position, int(row["seq"]), aligned, data.shape[0] // 2, fill,
+                     float(row["host_time"]), float(row["sample_time"]))
+
+    def _write(self, data: np.ndarray):
+        if not data.shape[0]:
+            return
+        self.recorder.write(data)
+        self.written += data.shape[0] // 2
+        if self.head_bytes < self.head.shape[0]:
+            n = min(data.shape[0], self.head.shape[0] - self.head_bytes)
+            self.head[self.head_bytes:self.head_bytes + n] = data[:n]
+            self.head_bytes += n
+
+    def _fill(self, num_samples: int):
+        self.fill_samples += num_samples
+        remaining = 2 * num_samples
+        while remaining:
+            chunk = self._fill_block[:remaining]
+            self._write(chunk)
+            remaining -= chunk.shape[0]
+
+
+class GroupCapture:
+    """
+    Coordinated capture from several dongles, for direction finding and
+    diversity reception.
+
+    ``start()`` opens and tunes every device in parallel, creates their
+    streams held at a ``StartGate`` just before the async read, and
+    releases them together once all are armed, so the start skew is a
+    thread wake-up and a ``read_async`` call rather than a device open and
+    three control transfers per dongle.
+
+    The remaining skew is removed in the output. Each device's samples are
+    written from a common start time, ``settle_time`` after the release, by
+    the per-block sample clock estimates of the stream timelines. Missing
+    samples are filled with mid-scale, so every device's SigMF recording
+    is aligned sample for sample, up to the timestamp accuracy. A group
+    block index (``<path_prefix>.index``, see ``read_group_index``) maps
+    every written block to its aligned position. ``estimate_offsets()``
+    then measures what is left by cross-correlating the first
+    ``correlation_samples`` aligned samples of a signal all dongles share,
+    such as a noise source split to every antenna input.
+
+    Without a shared clock the dongles still drift apart by their crystal
+    errors, so offsets are best measured near the time they are used.
+
+    Args:
+        control (DeviceControl): Owner of the devices.
+        devices (Sequence[SDRDevice]): The group; the first one is the
+            reference for offsets.
+        path_prefix (str): Data goes to ``<path_prefix>-<serial>-NNNN.sigmf-data``,
+            the index and group metadata to ``<path_prefix>.index`` and
+            ``<path_prefix>.group.json``.
+        sample_rate (int): Sample rate set on every device, in Hz.
+        center_freq (int): Center frequency set on every device, in Hz.
+        gain (int, optional): Tuner gain set on every device.
+        buffer_size (int): Bytes per librtlsdr transfer.
+        ring_depth (int): Blocks buffered between librtlsdr and the disk.
+        settle_time (float): Seconds from the release to the common start.
+        correlation_samples (int): Aligned samples kept per device for ``estimate_offsets``.
+        arm_timeout (float): Seconds to wait for every stream to arm.
+        **recorder_kwargs: Passed on to each device's ``IQRecorder``.
+    """
+
+    def __init__(
+        self,
+        control: "DeviceControl",
+        devices: Sequence[SDRDevice],
+        path_prefix: str,
+        sample_rate: int,
+        center_freq: int,
+        gain: Optional[int] = None,
+        buffer_size: int = 16 * 16384,
+        ring_depth: int = 32,
+        settle_time: float = DEFAULT_SETTLE_TIME,
+        correlation_samples: int = DEFAULT_CORRELATION_SAMPLES,
+        arm_timeout: float = 5.0,
+        **recorder_kwargs,
+    ):
+        if not devices:
+            raise ValueError("A group capture needs at least one device")
+        if len({device.serial for device in devices}) != len(devices):
+            raise ValueError("Group capture devices must be distinct")
+        self.control = control
+        self.devices = list(devices)
+        self.path_prefix = path_prefix
+        self.sample_rate = sample_rate
+        self.center_freq = center_freq
+        self.gain = gain
+        self.buffer_size = buffer_size
+        self.ring_depth = ring_depth
+        self.settle_time = settle_time
+        self.correlation_samples = correlation_samples
+        self.arm_timeout = arm_timeout
+        self.recorder_kwargs = recorder_kwargs
+        self.members: List[_AlignedMember] = []
+        self.gate = None
+        self.start_time = None  # time.perf_counter() of aligned sample 0
+        self.setup_seconds = None  # Time taken to open and configure every device
+        self._index_file = None
+        self._index_lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        """Configure every device in parallel, arm their streams and release them together."""
+        began = time.perf_counter()
+        settings = {"sample_rate": self.sample_rate, "center_freq": self.center_freq}
+        if self.gain is not None:
+            settings["gain"] = self.gain
+        errors = self.control.open_devices(self.devices, {device.serial: settings for device in self.devices})
+        failed = {serial: error for serial, error in errors.items() if error is not None}
+        if failed:
+            raise RuntimeError("Could not open and configure group devices: "
+                               + ", ".join(f"{serial} ({error})" for serial, error in failed.items()))
+        self.setup_seconds = time.perf_counter() - began
+
+        self.gate = StartGate(len(self.devices))
+        self._index_file = open(self.path_prefix + GROUP_INDEX_EXT, "wb")
+        started = []
+        try:
+            for position, device in enumerate(self.devices):
+                recorder = IQRecorder(
+                    f"{self.path_prefix}-{device.serial}",
+                    sample_rate=self.sample_rate,
+                    center_freq=self.center_freq,
+                    gain=self.gain,
+                    hw=f"{device.manufacturer} {device.product} ({device.serial})",
+                    **self.recorder_kwargs,
+                )
+                member = _AlignedMember(self, position, device, recorder)
+                self.members.append(member)
+                self.control.start_stream(
+                    device,
+                    member,
+                    buffer_size=self.buffer_size,
+                    output_format="uint8",
+                    ring_depth=self.ring_depth,
+                    metadata=True,
+                    start_gate=self.gate,
+                )
+                started.append(device)
+            if not self.gate.wait_armed(self.arm_timeout):
+                raise RuntimeError(
+                    f"Only {self.gate.arrived} of {len(self.devices)} group streams armed within {self.arm_timeout} s")
+        except Exception:
+            self.gate.abort()
+            for device in started:
+                self.control.stop_stream(device)
+            self._close_outputs()
+            raise
+
+        self.start_time = time.perf_counter() + self.settle_time
+        self.gate.release()
+        self.running = True
+        logger.info(f"Group capture of {len(self.devices)} devices started after {self.setup_seconds:.3f} s of setup.")
+
+    def _index(self, position: int, seq: int, output_sample: int, num_samples: int, fill: int,
+               host_time: float, sample_time: float):
+        row = _INDEX_ROW.pack(position, seq, output_sample, num_samples, fill, host_time, sample_time)
+        with self._index_lock:
+            self._index_file.write(row)
+
+    def estimate_offsets(self, max_lag: Optional[int] = None) -> dict:
+        """
+        Residual offsets of every device against the first one, from the
+        first ``correlation_samples`` aligned samples; see ``estimate_offsets``.
+
+        Returns:
+            dict: Per serial, ``offset_samples``, ``phase`` and ``quality``.
+
+        Raises:
+            RuntimeError: If some device has not written enough samples yet.
+        """
+        if any(member.head_bytes < member.head.shape[0] for member in self.members) or not self.members:
+            raise RuntimeError(f"Offsets need {self.correlation_samples} aligned samples from every device")
+        raw = np.stack([member.head for member in self.members]).astype(np.float32)
+        raw -= 127.5
+        signals = raw.view(np.complex64)
+        result = estimate_offsets(signals, reference=0, max_lag=max_lag)
+        offsets = {}
+        for position, member in enumerate(self.members):
+            offsets[member.device.serial] = {
+                "offset_samples": float(result["offsets"][position]),
+                "phase": float(result["phases"][position]),
+                "quality": float(result["quality"][position]),
+            }
+        weak = [serial for serial, offset in offsets.items() if offset["quality"] < 0.1]
+        if weak:
+            logger.warning(f"Weak correlation for {weak}; is a shared reference signal present?")
+        return offsets
+
+    def stats(self) -> dict:
+        return {
+            member.device.serial: {
+                "samples_written": member.written,
+                "fill_samples": member.fill_samples,
+                "start_sample": member.start_sample,
+                "restarts": member.restarts,
+            }
+            for member in self.members
+        }
+
+    def _close_outputs(self):
+        for member in self.members:
+            member.recorder.close()
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def stop(self) -> dict:
+        """
+        Stop every stream, finalize the recordings and write the group
+        metadata (including offsets when enough samples were captured).
+
+        Returns:
+            dict: The metadata written to ``<path_prefix>.group.json``.
+        """
+        if not self.running:
+            raise RuntimeError("Group capture is not running")
+        self.running = False
+        for device in self.devices:
+            self.control.stop_stream(device)
+        self._close_outputs()
+
+        try:
+            offsets = self.estimate_offsets()
+        except RuntimeError as e:
+            logger.warning(f"No offsets for group {self.path_prefix}: {e}")
+            offsets = None
+        wall_offset = time.time() - time.perf_counter()
+        stats = self.stats()
+        meta = {
+            "sample_rate": self.sample_rate,
+            "center_freq": self.center_freq,
+            "gain": self.gain,
+            "datatype": "cu8",
+            "fill_value": FILL_VALUE,
+            "start_time": self.start_time + wall_offset,
+            "released_at": self.gate.released_at + wall_offset,
+            "setup_seconds": self.setup_seconds,
+            "index": {"path": self.path_prefix + GROUP_INDEX_EXT, "dtype": GROUP_INDEX_DTYPE.descr},
+            "devices": [
+                {"serial": member.device.serial, "files": list(member.recorder.files), **stats[member.device.serial]}
+                for member in self.members
+            ],
+            "offsets": offsets,
+        }
+        with open(self.path_prefix + GROUP_META_EXT, "w") as f:
+            json.dump(meta, f, indent=2)
+        logger.info(f"Group capture stopped; metadata in {self.path_prefix + GROUP_META_EXT}.")
+        return meta
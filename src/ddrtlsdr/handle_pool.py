@@ -0,0 +1,270 @@
+# src/ddrtlsdr/handle_pool.py
+
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .librtlsdr_wrapper import close_device, open_device
+from .metrics import control_calls
+from .models import SDRDevice
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.handle_pool")
+
+DEFAULT_OPEN_ATTEMPTS = 3  # Tries per open when no timeout is given
+DEFAULT_RETRY_BACKOFF = 0.05  # Seconds before the first retry; doubles after each failure
+MAX_RETRY_BACKOFF = 1.0
+DEFAULT_OPEN_WORKERS = 16  # Parallel opens; one per dongle on a fully populated hub
+
+
+def _open_labeled(device: SDRDevice):
+    handle = open_device(device.index)
+    control_calls.label_handle(handle, device.serial)
+    return handle
+
+
+class HandlePool:
+    """
+    Open librtlsdr handles, keyed by device serial.
+
+    Opens are retried with exponential backoff, jittered so that dongles
+    which failed together (a hub resetting, another process letting go) do
+    not retry in lockstep. ``open_many`` opens a set of devices side by side,
+    since each open spends most of its time waiting on USB. Handles stay
+    open between calls; with an ``idle_timeout``, a reaper thread hands
+    handles nobody used for that long to ``release``, skipping devices
+    ``in_use`` reports busy (e.g. streaming).
+
+    The pool does not serialize calls for one device; callers that may race
+    on the same device hold their own per-device lock around ``open`` and
+    ``close``, as ``DeviceControl`` does with its command queues.
+
+    Args:
+        idle_timeout (float, optional): Seconds unused before a handle is
+            released. None keeps handles open until closed.
+        open_attempts (int): Tries per open when ``open`` gets no timeout.
+        retry_backoff (float): Seconds before the first retry.
+        max_backoff (float): Longest wait between two tries.
+        workers (int): Most devices ``open_many`` opens at once.
+        in_use: Called with a serial; True keeps an idle handle open.
+        release: Called with the device to release an idle handle.
+            Defaults to ``close``.
+        opener: Opens one try's handle for a device, raising IOError on
+            failure. Defaults to ``open_device`` on its index.
+        closer: Closes a handle. Defaults to ``close_device``.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: Optional[float] = None,
+        open_attempts: int = DEFAULT_OPEN_ATTEMPTS,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        max_backoff: float = MAX_RETRY_BACKOFF,
+        workers: int = DEFAULT_OPEN_WORKERS,
+        in_use: Optional[Callable[[str], bool]] = None,
+        release: Optional[Callable[[SDRDevice], None]] = None,
+        opener: Optional[Callable[[SDRDevice], object]] = None,
+        closer: Optional[Callable[[object], None]] = None,
+    ):
+        if open_attempts < 1:
+            raise ValueError("open_attempts must be at least 1")
+        self.idle_timeout = idle_timeout
+        self.open_attempts = open_attempts
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.workers = workers
+        self.in_use = in_use
+        self.release = release if release is not None else self.close
+        self.opener = opener if opener is not None else _open_labeled
+        self.closer = closer if closer is not None else close_device
+        self.handles: Dict[str, object] = {}  # serial -> open handle
+        self._devices: Dict[str, SDRDevice] = {}
+        self._last_used: Dict[str, float] = {}  # serial -> time.monotonic() of the last get/open
+        self._stats: Dict[str, dict] = {}  # serial -> open counters, kept after close
+        self._lock = threading.Lock()  # Guards the dicts, not the device
+        self._shutdown = threading.Event()
+        self._reaper = None
+
+    def get(self, serial: str):
+        """The open handle for ``serial``, or None. Counts as a use."""
+        handle = self.handles.get(serial)
+        if handle is not None:
+            self._last_used[serial] = time.monotonic()
+        return handle
+
+    def open(self, device: SDRDevice, timeout: Optional[float] = None):
+        """
+        Open a device, or return its handle if it is already open.
+
+        Args:
+            device (SDRDevice): The device to open.
+            timeout (float, optional): Keep retrying for this many seconds
+                instead of ``open_attempts`` times.
+
+        Returns:
+            The device handle.
+
+        Raises:
+            IOError: If every try failed.
+        """
+        handle = self.get(device.serial)
+        if handle is not None:
+            return handle
+        stats = self._stats.setdefault(device.serial, {
+            "opens": 0, "failures": 0, "open_seconds": None, "attempts": 0, "last_error": None})
+        began = time.perf_counter()
+        deadline = began + timeout if timeout is not None else None
+        backoff = self.retry_backoff
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                handle = self.opener(device)
+                break
+            except IOError as e:
+                stats["failures"] += 1
+                stats["last_error"] = str(e)
+                delay = random.uniform(0.5, 1.0) * backoff
+                if deadline is None:
+                    if attempt >= self.open_attempts:
+                        raise
+                else:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise IOError(f"Unable to open device {device.serial} within {timeout} seconds") from e
+                    delay = min(delay, remaining)
+                logger.warning(f"Failed to open device {device.serial} (try {attempt}): {e}. "
+                               f"Retrying in {delay:.3f} s.")
+                time.sleep(delay)
+                backoff = min(2 * backoff, self.max_backoff)
+
+        stats["opens"] += 1
+        stats["attempts"] = attempt
+        stats["open_seconds"] = time.perf_counter() - began
+        with self._lock:
+            self.handles[device.serial] = handle
+            self._devices[device.serial] = device
+            self._last_used[device.serial] = time.monotonic()
+        self._ensure_reaper()
+        return handle
+
+    def close(self, device: SDRDevice) -> bool:
+        """Close a device's handle. Returns False if it was not open."""
+        with self._lock:
+            handle = self.handles.pop(device.serial, None)
+            self._devices.pop(device.serial, None)
+            self._last_used.pop(device.serial, None)
+        if handle is None:
+            return False
+        self.closer(handle)
+        return True
+
+    def close_all(self):
+        for device in list(self._devices.values()):
+            self.close(device)
+
+    def open_many(
+        self,
+        devices: Iterable[SDRDevice],
+        task: Optional[Callable[[SDRDevice], object]] = None,
+    ) -> Dict[str, Optional[Exception]]:
+        """
+        Open several devices in parallel.
+
+        Args:
+            devices: The devices to open.
+            task: Called once per device on a worker thread, e.g. to open
+                and then configure it. Defaults to ``open``.
+
+        Returns:
+            Dict[str, Optional[Exception]]: By serial, None if the device
+            opened, otherwise what ``task`` raised.
+        """
+        devices = list(devices)
+        task = task if task is not None else self.open
+        if not devices:
+            return {}
+
+        def run(device: SDRDevice) -> Optional[Exception]:
+            try:
+                task(device)
+            except Exception as e:
+                logger.error(f"Could not open device {device.serial}: {e}")
+                return e
+            return None
+
+        began = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(devices)),
+                                thread_name_prefix="ddrtlsdr-open") as pool:
+            results = list(pool.map(run, devices))
+        failed = sum(error is not None for error in results)
+        logger.info(f"Opened {len(devices) - failed} of {len(devices)} devices in {time.perf_counter() - began:.3f} s.")
+        return {device.serial: error for device, error in zip(devices, results)}
+
+    def idle_seconds(self, serial: str) -> Optional[float]:
+        """Seconds since the handle was last used, or None if it is not open."""
+        last_used = self._last_used.get(serial)
+        return time.monotonic() - last_used if last_used is not None else None
+
+    def is_idle(self, serial: str) -> bool:
+        """True if the handle is open, unused for ``idle_timeout`` and not in use."""
+        if self.idle_timeout is None:
+            return False
+        idle = self.idle_seconds(serial)
+        if idle is None or idle < self.idle_timeout:
+            return False
+        return not (self.in_use is not None and self.in_use(serial))
+
+    def evict_idle(self) -> List[str]:
+        """Release every idle handle now. Returns the serials released."""
+        with self._lock:
+            idle = [device for serial, device in self._devices.items() if self.is_idle(serial)]
+        for device in idle:
+            try:
+                self.release(device)
+            except Exception as e:
+                logger.error(f"Failed to release idle device {device.serial}: {e}")
+        return [device.serial for device in idle]
+
+    def _ensure_reaper(self):
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._shutdown.clear()
+                self._reaper = threading.Thread(target=self._reap_loop, daemon=True, name="ddrtlsdr-handle-reaper")
+                self._reaper.start()
+
+    def _reap_loop(self):
+        # Checking twice per timeout bounds how long past it a handle stays open.
+        while not self._shutdown.wait(self.idle_timeout / 2):
+            for serial in self.evict_idle():
+                logger.info(f"Released handle of device {serial} after {self.idle_timeout} s idle.")
+
+    def shutdown(self):
+        """Stop the reaper thread and close every handle."""
+        self._shutdown.set()
+        self.close_all()
+
+    def stats(self, serial: Optional[str] = None) -> dict:
+        """
+        Per-device open counters: successful opens, failed tries, how long
+        the last successful open took (retries included) and in how many
+        tries, plus whether the handle is open and for how long it has been
+        idle. One device's entry if ``serial`` is given, otherwise a dict
+        keyed by serial.
+        """
+        def entry(key: str) -> dict:
+            result = dict(self._stats.get(key, {}))
+            result["open"] = key in self.handles
+            result["idle_seconds"] = self.idle_seconds(key)
+            return result
+
+        if serial is not None:
+            return entry(serial)
+        return {key: entry(key) for key in sorted(set(self._stats) | set(self.handles))}
@@ -0,0 +1,301 @@
+# src/ddrtlsdr/iq_reader.py
+
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from typing import Callable, Iterator, Optional, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .iq_conversion import IQConverter
+from .recorder import SAMPLE_SIZES, SIGMF_DATA_EXT, SIGMF_META_EXT
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.iq_reader")
+
+# Raw file extensions commonly used for each datatype
+EXTENSION_DATATYPES = {".cu8": "cu8", ".bin": "cu8", ".cf32": "cf32_le", ".cfile": "cf32_le"}
+RELEASE_INTERVAL = 64 << 20  # Bytes consumed between dropping pages already read
+
+
+class IQFileReader:
+    """
+    Memory-mapped access to a raw I/Q recording.
+
+    Nothing is read up front: blocks and windows are views into the map, so
+    multi-GB captures are processed in constant memory and pages are pulled
+    in by the OS as they are touched. SigMF recordings (``.sigmf-data`` with
+    a ``.sigmf-meta`` next to it) pick up their datatype, sample rate and
+    frequency from the metadata.
+
+    Args:
+        path (str): The recording to open.
+        datatype (str, optional): ``"cu8"`` or ``"cf32_le"``. Taken from the
+            SigMF metadata or the file extension when omitted.
+        sample_rate (int, optional): Needed for real-time replay.
+        center_freq (int, optional): Informational.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        datatype: Optional[str] = None,
+        sample_rate: Optional[int] = None,
+        center_freq: Optional[int] = None,
+    ):
+        self.path = path
+        meta = self._load_sigmf_meta(path)
+        captures = meta.get("captures") or [{}]
+        self.datatype = datatype or meta.get("global", {}).get("core:datatype") or self._datatype_from_extension(path)
+        if self.datatype not in SAMPLE_SIZES:
+            raise ValueError(f"Unsupported datatype: {self.datatype}")
+        self.sample_rate = sample_rate or meta.get("global", {}).get("core:sample_rate")
+        self.center_freq = center_freq or captures[0].get("core:frequency")
+        self.sample_size = SAMPLE_SIZES[self.datatype]
+
+        nbytes = os.path.getsize(path)
+        usable = nbytes - nbytes % self.sample_size
+        if usable != nbytes:
+            logger.warning(f"{path} ends with a partial sample; ignoring {nbytes - usable} trailing bytes.")
+        self._mmap = None
+        if usable:
+            with open(path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), usable, access=mmap.ACCESS_READ)
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+            self.raw = np.frombuffer(self._mmap, dtype=np.uint8)
+        else:
+            # mmap refuses empty files, so those get an empty array instead.
+            self.raw = np.empty(0, dtype=np.uint8)
+        logger.info(f"Opened {path}: {self.num_samples} {self.datatype} samples.")
+
+    @staticmethod
+    def _load_sigmf_meta(path: str) -> dict:
+        if not path.endswith(SIGMF_DATA_EXT):
+            return {}
+        meta_path = path[:-len(SIGMF_DATA_EXT)] + SIGMF_META_EXT
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _datatype_from_extension(path: str) -> str:
+        return EXTENSION_DATATYPES.get(os.path.splitext(path)[1].lower(), "cu8")
+
+    def close(self):
+        """Unmap the file. Blocks handed out earlier must no longer be used."""
+        if self._mmap is not None:
+            self.raw = np.empty(0, dtype=np.uint8)
+            try:
+                self._mmap.close()
+            except BufferError:
+                logger.warning(f"Views of {self.path} are still alive; leaving it mapped.")
+                return
+            self._mmap = None
+
+    def _release(self, end: int):
+        """
+        Drop the already-read pages below byte ``end`` from this process.
+        They stay in the page cache, but sequential passes over huge files no
+        longer grow the resident set.
+        """
+        if self._mmap is None or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        end -= end % mmap.PAGESIZE
+        if end > 0:
+            self._mmap.madvise(mmap.MADV_DONTNEED, 0, end)
+
+    @property
+    def num_samples(self) -> int:
+        return self.raw.shape[0] // self.sample_size
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Length of the recording in seconds, if the sample rate is known."""
+        return self.num_samples / self.sample_rate if self.sample_rate else None
+
+    @property
+    def samples(self) -> np.ndarray:
+        """The whole recording: interleaved uint8 for cu8, complex64 for cf32_le."""
+        if self.datatype == "cf32_le":
+            return self.raw.view(np.complex64)
+        return self.raw
+
+    def blocks(self, block_samples: int, start: int = 0, partial: bool = True) -> Iterator[np.ndarray]:
+        """
+        Yield consecutive blocks of ``block_samples`` samples as views.
+
+        Args:
+            block_samples (int): Complex samples per block.
+            start (int): Sample to start from.
+            partial (bool): Whether to yield a short final block.
+        """
+        data = self.samples
+        per_sample = 2 if self.datatype == "cu8" else 1  # Array elements per complex sample
+        step = block_samples * per_sample
+        end = data.shape[0]
+        itemsize = data.itemsize
+        released = 0
+        for offset in range(start * per_sample, end, step):
+            if offset + step > end and not partial:
+                return
+            yield data[offset:offset + step]
+            if (offset - released) * itemsize >= RELEASE_INTERVAL:
+                released = offset
+                self._release(offset * itemsize)
+
+    def windows(self, window_samples: int, step_samples: int, start: int = 0) -> Iterator[np.ndarray]:
+        """
+        Yield overlapping windows of ``window_samples`` samples, advancing by
+        ``step_samples``. Windows are strided views, so overlap costs nothing.
+        """
+        data = self.samples
+        per_sample = 2 if self.datatype == "cu8" else 1
+        data = data[start * per_sample:]
+        if data.shape[0] < window_samples * per_sample:
+            return
+        view = sliding_window_view(data, window_samples * per_sample)[::step_samples * per_sample]
+        for window in view:
+            yield window
+
+    def replay(
+        self,
+        callback: Callable[[Union[bytes, np.ndarray]], None],
+        buffer_size: int = 16 * 16384,
+        output_format: str = "uint8",
+        realtime: bool = False,
+        loop: bool = False,
+        converter: Optional[IQConverter] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        Push the recording through ``callback`` the way ``SDRStream`` does.
+
+        Args:
+            callback: Receives each block in ``output_format``.
+            buffer_size (int): Bytes of cu8 per block (the ``SDRStream``
+                ``buffer_size``); cf32_le blocks hold the same number of samples.
+            output_format (str): ``"bytes"``, ``"uint8"`` or ``"complex64"``.
+                cf32_le recordings can only be delivered as ``"bytes"`` or
+                ``"complex64"``.
+            realtime (bool): Pace delivery to the sample rate.
+            loop (bool): Start over at the end of the file.
+            converter (IQConverter, optional): Used for cu8 to complex64.
+            stop_event (threading.Event, optional): Set to end the replay.
+
+        Returns:
+            int: Number of blocks delivered.
+        """
+        if realtime and not self.sample_rate:
+            raise ValueError("Real-time replay needs a sample rate")
+        if self.datatype == "cf32_le" and output_format == "uint8":
+            raise ValueError("cf32_le recordings cannot be replayed as uint8")
+        converter = converter or IQConverter()
+        block_samples = buffer_size // 2
+        delivered = 0
+        sent_samples = 0
+        start_time = time.perf_counter()
+        while True:
+            for block in self.blocks(block_samples):
+                if stop_event is not None and stop_event.is_set():
+                    return delivered
+                if realtime:
+                    delay = start_time + sent_samples / self.sample_rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                if output_format == "bytes":
+                    data = block.tobytes()
+                elif output_format == "complex64" and self.datatype == "cu8":
+                    data = converter.convert(block)
+                else:
+                    data = block
+                callback(data)
+                delivered += 1
+                sent_samples += block.shape[0] // (2 if self.datatype == "cu8" else 1)
+            if not loop or self.num_samples == 0:
+                return delivered
+
+
+class ReplayStream:
+    """
+    Drop-in stand-in for ``SDRStream`` that plays a recording on a thread,
+    so processing written for live devices runs unchanged on captures.
+    """
+
+    def __init__(
+        self,
+        reader: IQFileReader,
+        callback: Callable[[Union[bytes, np.ndarray]], None],
+        buffer_size: int = 16 * 16384,
+        output_format: str = "uint8",
+        realtime: bool = True,
+        loop: bool = False,
+        converter: Optional[IQConverter] = None,
+    ):
+        self.reader = reader
+        self.callback = callback
+        self.buffer_size = buffer_size
+        self.output_format = output_format
+        self.realtime = realtime
+        self.loop = loop
+        self.converter = converter
+        self.running = False
+        self.thread = None
+        self.blocks_received = 0
+        self.bytes_received = 0
+        self._stop = threading.Event()
+
+    def _count(self, data):
+        self.blocks_received += 1
+        self.bytes_received += len(data) if isinstance(data, bytes) else data.nbytes
+        self.callback(data)
+
+    def _replay_thread(self):
+        try:
+            self.reader.replay(
+                self._count,
+                buffer_size=self.buffer_size,
+                output_format=self.output_format,
+                realtime=self.realtime,
+                loop=self.loop,
+                converter=self.converter,
+                stop_event=self._stop,
+            )
+        except Exception as e:
+            logger.error(f"Replay of {self.reader.path} failed: {e}")
+        logger.debug(f"Replay of {self.reader.path} ended.")
+
+    @property
+    def finished(self) -> bool:
+        """True once the whole recording has been delivered."""
+        return self.thread is not None and not self.thread.is_alive()
+
+    @property
+    def died(self) -> bool:
+        # Reaching the end of a file is not a failure, so never report one.
+        return False
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._replay_thread, daemon=True)
+            self.thread.start()
+            logger.info(f"Replay of {self.reader.path} started.")
+
+    def stop(self):
+        if self.running:
+            self._stop.set()
+            self.thread.join()
+            self.running = False
+            logger.info(f"Replay of {self.reader.path} stopped.")
+
+    def stats(self) -> dict:
+        return {}
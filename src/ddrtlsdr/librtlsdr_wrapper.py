@@ -3,121 +3,316 @@
 import ctypes
 import ctypes.util
 import logging
+import os
+import time
+from typing import Optional
 
+from .backend import SDRBackend
 from .logging_config import setup_logging
+from .metrics import control_calls
 
 # Initialize centralized logging
 setup_logging()
 logger = logging.getLogger("ddrtlsdr.librtlsdr_wrapper")
 
-# Load librtlsdr
-try:
-    rtl = ctypes.cdll.LoadLibrary(ctypes.util.find_library("rtlsdr"))
+BACKEND_ENV = "DDRTLSDR_BACKEND"  # "librtlsdr" (default) or "simulated"
+SIM_DEVICES_ENV = "DDRTLSDR_SIM_DEVICES"  # Number of devices for the simulated backend
+
+def _load_librtlsdr():
+    path = ctypes.util.find_library("rtlsdr")
+    if path is None:
+        logger.warning("librtlsdr not found; only non-hardware backends are available.")
+        return None
+    try:
+        lib = ctypes.cdll.LoadLibrary(path)
+    except OSError as e:
+        logger.error(f"Failed to load librtlsdr: {e}")
+        return None
     logger.info("Successfully loaded librtlsdr.")
-except OSError as e:
-    logger.error(f"Failed to load librtlsdr: {e}")
-    raise
 
-# Define librtlsdr functions and their signatures
-rtl.rtlsdr_get_device_count.restype = ctypes.c_int
+    # Define librtlsdr functions and their signatures
+    lib.rtlsdr_get_device_count.restype = ctypes.c_int
+
+    lib.rtlsdr_get_device_name.argtypes = [ctypes.c_uint]
+    lib.rtlsdr_get_device_name.restype = ctypes.c_char_p
+
+    lib.rtlsdr_get_device_usb_strings.argtypes = [ctypes.c_uint, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
+    lib.rtlsdr_get_device_usb_strings.restype = ctypes.c_int
+
+    lib.rtlsdr_open.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.c_uint]
+    lib.rtlsdr_open.restype = ctypes.c_int
+
+    lib.rtlsdr_close.argtypes = [ctypes.c_void_p]
+    lib.rtlsdr_close.restype = None
+
+    lib.rtlsdr_set_center_freq.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+    lib.rtlsdr_set_center_freq.restype = ctypes.c_int
+
+    lib.rtlsdr_get_center_freq.argtypes = [ctypes.c_void_p]
+    lib.rtlsdr_get_center_freq.restype = ctypes.c_uint32
+
+    lib.rtlsdr_set_sample_rate.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
+    lib.rtlsdr_set_sample_rate.restype = ctypes.c_int
+
+    lib.rtlsdr_get_sample_rate.argtypes = [ctypes.c_void_p]
+    lib.rtlsdr_get_sample_rate.restype = ctypes.c_uint32
+
+    lib.rtlsdr_set_tuner_gain.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    lib.rtlsdr_set_tuner_gain.restype = ctypes.c_int
+
+    lib.rtlsdr_get_tuner_gain.argtypes = [ctypes.c_void_p]
+    lib.rtlsdr_get_tuner_gain.restype = ctypes.c_int
+
+    lib.rtlsdr_read_async.argtypes = [
+        ctypes.c_void_p,
+        ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.py_object),
+        ctypes.py_object,
+        ctypes.c_int,
+        ctypes.c_int,
+    ]
+    lib.rtlsdr_read_async.restype = ctypes.c_int
+
+    lib.rtlsdr_cancel_async.argtypes = [ctypes.c_void_p]
+    lib.rtlsdr_cancel_async.restype = None
+
+    lib.rtlsdr_reset_buffer.argtypes = [ctypes.c_void_p]
+    lib.rtlsdr_reset_buffer.restype = ctypes.c_int
+
+    lib.rtlsdr_read_sync.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+    lib.rtlsdr_read_sync.restype = ctypes.c_int
+    return lib
+
+# Load librtlsdr (None if it is not installed)
+rtl = _load_librtlsdr()
+
+class LibrtlsdrBackend(SDRBackend):
+    """Backend that calls the real librtlsdr through ctypes."""
+
+    name = "librtlsdr"
+
+    @staticmethod
+    def _lib():
+        # Looked up on every call so tests can patch the module-level ``rtl``.
+        if rtl is None:
+            raise OSError("librtlsdr is not available")
+        return rtl
 
-rtl.rtlsdr_open.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.c_uint]
-rtl.rtlsdr_open.restype = ctypes.c_int
+    def get_device_count(self):
+        return self._lib().rtlsdr_get_device_count()
 
-rtl.rtlsdr_close.argtypes = [ctypes.c_void_p]
-rtl.rtlsdr_close.restype = None
+    def get_device_name(self, index):
+        name = self._lib().rtlsdr_get_device_name(index)
+        return name.decode("utf-8") if isinstance(name, bytes) else "Unknown"
 
-rtl.rtlsdr_set_center_freq.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
-rtl.rtlsdr_set_center_freq.restype = ctypes.c_int
+    def get_device_usb_strings(self, index):
+        manufacturer = ctypes.create_string_buffer(256)
+        product = ctypes.create_string_buffer(256)
+        serial = ctypes.create_string_buffer(256)
+        result = self._lib().rtlsdr_get_device_usb_strings(index, manufacturer, product, serial)
+        return (
+            result,
+            manufacturer.value.decode("utf-8"),
+            product.value.decode("utf-8"),
+            serial.value.decode("utf-8"),
+        )
 
-rtl.rtlsdr_get_center_freq.argtypes = [ctypes.c_void_p]
-rtl.rtlsdr_get_center_freq.restype = ctypes.c_uint32
+    def open(self, index):
+        handle = ctypes.c_void_p()
+        result = self._lib().rtlsdr_open(ctypes.byref(handle), index)
+        return result, handle
 
-rtl.rtlsdr_set_sample_rate.argtypes = [ctypes.c_void_p, ctypes.c_uint32]
-rtl.rtlsdr_set_sample_rate.restype = ctypes.c_int
+    def close(self, handle):
+        self._lib().rtlsdr_close(handle)
 
-rtl.rtlsdr_get_sample_rate.argtypes = [ctypes.c_void_p]
-rtl.rtlsdr_get_sample_rate.restype = ctypes.c_uint32
+    def set_center_freq(self, handle, freq_hz):
+        return self._lib().rtlsdr_set_center_freq(handle, freq_hz)
 
-rtl.rtlsdr_set_tuner_gain.argtypes = [ctypes.c_void_p, ctypes.c_int]
-rtl.rtlsdr_set_tuner_gain.restype = ctypes.c_int
+    def get_center_freq(self, handle):
+        return self._lib().rtlsdr_get_center_freq(handle)
 
-rtl.rtlsdr_get_tuner_gain.argtypes = [ctypes.c_void_p]
-rtl.rtlsdr_get_tuner_gain.restype = ctypes.c_int
+    def set_sample_rate(self, handle, rate_hz):
+        return self._lib().rtlsdr_set_sample_rate(handle, rate_hz)
 
-rtl.rtlsdr_read_async.argtypes = [
-    ctypes.c_void_p,
-    ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.py_object),
-    ctypes.py_object,
-    ctypes.c_int,
-    ctypes.c_int,
-]
-rtl.rtlsdr_read_async.restype = ctypes.c_int
+    def get_sample_rate(self, handle):
+        return self._lib().rtlsdr_get_sample_rate(handle)
 
-rtl.rtlsdr_cancel_async.argtypes = [ctypes.c_void_p]
-rtl.rtlsdr_cancel_async.restype = None
+    def set_tuner_gain(self, handle, gain):
+        return self._lib().rtlsdr_set_tuner_gain(handle, gain)
+
+    def get_tuner_gain(self, handle):
+        return self._lib().rtlsdr_get_tuner_gain(handle)
+
+    def reset_buffer(self, handle):
+        return self._lib().rtlsdr_reset_buffer(handle)
+
+    def read_sync(self, handle, buffer, length):
+        n_read = ctypes.c_int(0)
+        result = self._lib().rtlsdr_read_sync(handle, buffer, length, ctypes.byref(n_read))
+        return result, n_read.value
+
+    def read_async(self, handle, callback, context, num_buffers, buffer_size):
+        return self._lib().rtlsdr_read_async(handle, callback, context, num_buffers, buffer_size)
+
+    def cancel_async(self, handle):
+        self._lib().rtlsdr_cancel_async(handle)
+
+_backend = None
+
+def _default_backend() -> SDRBackend:
+    name = os.environ.get(BACKEND_ENV, LibrtlsdrBackend.name)
+    if name == "simulated":
+        from .simulation import SimulatedBackend
+        return SimulatedBackend(num_devices=int(os.environ.get(SIM_DEVICES_ENV, "1")))
+    if name != LibrtlsdrBackend.name:
+        raise ValueError(f"Unknown backend {name!r} in {BACKEND_ENV}")
+    return LibrtlsdrBackend()
+
+def get_backend() -> SDRBackend:
+    global _backend
+    if _backend is None:
+        _backend = _default_backend()
+        logger.info(f"Using {_backend.name} backend.")
+    return _backend
+
+def set_backend(backend: Optional[SDRBackend]) -> Optional[SDRBackend]:
+    """
+    Route all wrapper calls to ``backend`` (None restores the default chosen
+    from the environment). Returns the previous backend.
+    """
+    global _backend
+    previous = _backend
+    _backend = backend
+    if backend is not None:
+        logger.info(f"Switched to {backend.name} backend.")
+    return previous
+
+# Every call into the backend is timed into ``control_calls``, except
+# read_async, which blocks for as long as the stream runs.
 
 def get_device_count():
-    count = rtl.rtlsdr_get_device_count()
-    logger.debug(f"Number of RTL-SDR devices found: {count}")
+    start = time.perf_counter()
+    count = get_backend().get_device_count()
+    control_calls.observe("get_device_count", None, time.perf_counter() - start)
+    logger.debug("Number of RTL-SDR devices found: %d", count)
     return count
 
+def get_device_name(index):
+    return get_backend().get_device_name(index)
+
+def get_device_usb_strings(index):
+    """Returns ``(manufacturer, product, serial)`` for the device at ``index``."""
+    start = time.perf_counter()
+    result, manufacturer, product, serial = get_backend().get_device_usb_strings(index)
+    control_calls.observe("get_device_usb_strings", None, time.perf_counter() - start)
+    if result != 0:
+        logger.error(f"Failed to retrieve USB strings for device {index}. Error code: {result}")
+        raise IOError(f"Failed to retrieve USB strings for device {index}.")
+    return manufacturer, product, serial
+
 def open_device(index):
-    handle = ctypes.c_void_p()
-    result = rtl.rtlsdr_open(ctypes.byref(handle), index)
+    start = time.perf_counter()
+    result, handle = get_backend().open(index)
+    control_calls.observe("open", None, time.perf_counter() - start)
     if result != 0:
         logger.error(f"Failed to open device at index {index}. Error code: {result}")
         raise IOError(f"Unable to open device at index {index}")
-    logger.info(f"Device at index {index} opened successfully.")
+    logger.info("Device at index %d opened successfully.", index)
     return handle
 
 def close_device(handle):
-    rtl.rtlsdr_close(handle)
+    start = time.perf_counter()
+    get_backend().close(handle)
+    control_calls.observe("close", handle, time.perf_counter() - start)
+    control_calls.forget_handle(handle)
     logger.info("Device closed successfully.")
 
-def set_center_freq(handle, freq_hz):
-    result = rtl.rtlsdr_set_center_freq(handle, freq_hz)
+# Control calls can run thousands of times a second under polling, so they
+# log with lazy %-style arguments (nothing is formatted unless the record is
+# emitted) and reads only at DEBUG.
+
+def set_center_freq(handle, freq_hz, log: bool = True):
+    # Scanners retune hundreds of times a second and pass log=False.
+    start = time.perf_counter()
+    result = get_backend().set_center_freq(handle, freq_hz)
+    control_calls.observe("set_center_freq", handle, time.perf_counter() - start)
     if result != 0:
         logger.error(f"Failed to set center frequency to {freq_hz} Hz. Error code: {result}")
         raise ValueError(f"Unable to set center frequency to {freq_hz} Hz")
-    logger.info(f"Center frequency set to {freq_hz} Hz.")
+    if log:
+        logger.info("Center frequency set to %d Hz.", freq_hz)
 
 def get_center_freq(handle):
-    freq = rtl.rtlsdr_get_center_freq(handle)
-    logger.info(f"Current center frequency: {freq} Hz.")
+    start = time.perf_counter()
+    freq = get_backend().get_center_freq(handle)
+    control_calls.observe("get_center_freq", handle, time.perf_counter() - start)
+    logger.debug("Current center frequency: %d Hz.", freq)
     return freq
 
 def set_sample_rate(handle, rate_hz):
-    result = rtl.rtlsdr_set_sample_rate(handle, rate_hz)
+    start = time.perf_counter()
+    result = get_backend().set_sample_rate(handle, rate_hz)
+    control_calls.observe("set_sample_rate", handle, time.perf_counter() - start)
     if result != 0:
         logger.error(f"Failed to set sample rate to {rate_hz} Hz. Error code: {result}")
         raise ValueError(f"Unable to set sample rate to {rate_hz} Hz")
-    logger.info(f"Sample rate set to {rate_hz} Hz.")
+    logger.info("Sample rate set to %d Hz.", rate_hz)
 
 def get_sample_rate(handle):
-    rate = rtl.rtlsdr_get_sample_rate(handle)
-    logger.info(f"Current sample rate: {rate} Hz.")
+    start = time.perf_counter()
+    rate = get_backend().get_sample_rate(handle)
+    control_calls.observe("get_sample_rate", handle, time.perf_counter() - start)
+    logger.debug("Current sample rate: %d Hz.", rate)
     return rate
 
 def set_gain(handle, gain):
-    result = rtl.rtlsdr_set_tuner_gain(handle, gain)
+    start = time.perf_counter()
+    result = get_backend().set_tuner_gain(handle, gain)
+    control_calls.observe("set_tuner_gain", handle, time.perf_counter() - start)
     if result != 0:
         logger.error(f"Failed to set gain to {gain}. Error code: {result}")
         raise ValueError(f"Unable to set gain to {gain}")
-    logger.info(f"Gain set to {gain}.")
+    logger.info("Gain set to %d.", gain)
 
 def get_gain(handle):
-    gain = rtl.rtlsdr_get_tuner_gain(handle)
-    logger.info(f"Current gain: {gain}.")
+    start = time.perf_counter()
+    gain = get_backend().get_tuner_gain(handle)
+    control_calls.observe("get_tuner_gain", handle, time.perf_counter() - start)
+    logger.debug("Current gain: %d.", gain)
     return gain
 
 def read_async(handle, callback, context, num_buffers, buffer_size):
-    result = rtl.rtlsdr_read_async(handle, callback, context, num_buffers, buffer_size)
+    result = get_backend().read_async(handle, callback, context, num_buffers, buffer_size)
     if result != 0:
         logger.error(f"Failed to start async read. Error code: {result}")
         raise RuntimeError(f"Unable to start async read. Error code: {result}")
     logger.info("Asynchronous read started.")
 
 def cancel_async(handle):
-    rtl.rtlsdr_cancel_async(handle)
+    start = time.perf_counter()
+    get_backend().cancel_async(handle)
+    control_calls.observe("cancel_async", handle, time.perf_counter() - start)
     logger.info("Asynchronous read canceled.")
+
+def reset_buffer(handle):
+    start = time.perf_counter()
+    result = get_backend().reset_buffer(handle)
+    control_calls.observe("reset_buffer", handle, time.perf_counter() - start)
+    if result != 0:
+        logger.error(f"Failed to reset buffer. Error code: {result}")
+        raise IOError(f"Unable to reset buffer. Error code: {result}")
+    logger.debug("Buffer reset.")
+
+def read_sync(handle, buffer, length):
+    """
+    Blocking bulk read of up to ``length`` bytes into ``buffer``.
+
+    ``buffer`` is anything ctypes accepts as a ``void *`` (e.g. the
+    ``ctypes.data`` address of a NumPy array). Returns the number of bytes read.
+    """
+    start = time.perf_counter()
+    result, n_read = get_backend().read_sync(handle, buffer, length)
+    control_calls.observe("read_sync", handle, time.perf_counter() - start)
+    if result != 0:
+        logger.error(f"Failed to read {length} bytes synchronously. Error code: {result}")
+        raise IOError(f"Unable to read samples. Error code: {result}")
+    return n_read
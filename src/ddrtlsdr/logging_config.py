@@ -1,28 +1,181 @@
 # src/ddrtlsdr/logging_config.py
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+from typing import Optional, Union
 
-def setup_logging():
-    logger = logging.getLogger("ddrtlsdr")
-    logger.setLevel(logging.DEBUG)
-
-    log_directory = os.path.join(os.path.dirname(__file__), "logs")
-    os.makedirs(log_directory, exist_ok=True)
-    log_file = os.path.join(log_directory, "ddrtlsdr.log")
-
-    # File handler
-    file_handler = logging.FileHandler(log_file)
-    file_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+LOG_LEVEL_ENV = "DDRTLSDR_LOG_LEVEL"  # Level of the "ddrtlsdr" logger, DEBUG by default
+LOG_DIR_ENV = "DDRTLSDR_LOG_DIR"  # Directory of ddrtlsdr.log, the package's logs/ by default
+LOG_QUEUE_ENV = "DDRTLSDR_LOG_QUEUE"  # "1" to write logs from a background thread
+LOG_RATE_LIMIT_ENV = "DDRTLSDR_LOG_RATE_LIMIT"  # Records/s per call site below WARNING; 0 = unlimited
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_lock = threading.Lock()
+_configured = False
+_installed = []  # Handlers attached to the "ddrtlsdr" logger
+_outputs = []  # Handlers that do the actual I/O (the same as _installed unless queued)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per call site (file and line), so a log statement in a hot
+    loop emits at most ``rate`` records per second after an initial
+    ``burst``. The next record that gets through reports how many were
+    suppressed. Warnings and errors are never limited.
+
+    One instance is shared by all of the package's handlers. Filters on a
+    logger do not see records propagated from child loggers. The decision is
+    stored on the record, so a record reaching several handlers is counted
+    and annotated once.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.suppressed = 0
+        self._buckets = {}  # (pathname, lineno) -> [tokens, last refill, suppressed since last pass]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        decided = getattr(record, "rate_limit_passed", None)
+        if decided is not None:
+            return decided
+        record.rate_limit_passed = self._decide(record)
+        return record.rate_limit_passed
+
+    def _decide(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] = tokens - 1
+            skipped, bucket[2] = bucket[2], 0
+        if skipped:
+            record.msg = f"{record.getMessage()} ({skipped} similar messages suppressed)"
+            record.args = None
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records untouched. The stock ``prepare`` formats the message
+    on the calling thread so records can be pickled; this queue never leaves
+    the process, so formatting is left to the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _teardown(logger: logging.Logger):
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # Drains the queue first
+        _listener = None
+    for handler in _installed:
+        logger.removeHandler(handler)
+    for handler in _outputs:
+        handler.close()
+    _installed.clear()
+    _outputs.clear()
+
+
+def setup_logging(
+    level: Optional[Union[int, str]] = None,
+    use_queue: Optional[bool] = None,
+    rate_limit: Optional[float] = None,
+    log_directory: Optional[str] = None,
+    force: bool = False,
+):
+    """
+    Configure the "ddrtlsdr" logger with a file and a console handler.
+
+    Every module calls this on import; only the first call (or one with
+    ``force=True``) does anything, so each record is written once. Options
+    left as None come from the ``DDRTLSDR_LOG_*`` environment variables.
+
+    Args:
+        level: Logger level. Records below it cost almost nothing, as the
+            package logs with lazy ``%``-style arguments on hot paths.
+        use_queue (bool): Hand records to a ``QueueListener`` thread, which
+            formats and writes them, so callers never wait on disk or
+            console I/O.
+        rate_limit (float): Per-call-site records per second below WARNING.
+        log_directory (str): Where ``ddrtlsdr.log`` is written.
+        force (bool): Reconfigure even if logging is already set up.
+    """
+    global _configured, _listener
+    with _lock:
+        if _configured and not force:
+            return
+        logger = logging.getLogger("ddrtlsdr")
+        _teardown(logger)
+
+        if level is None:
+            level = os.environ.get(LOG_LEVEL_ENV, "DEBUG")
+        if use_queue is None:
+            use_queue = _env_flag(LOG_QUEUE_ENV)
+        if rate_limit is None:
+            rate_limit = float(os.environ.get(LOG_RATE_LIMIT_ENV, "0"))
+        if log_directory is None:
+            log_directory = os.environ.get(LOG_DIR_ENV, os.path.join(os.path.dirname(__file__), "logs"))
+        logger.setLevel(level.upper() if isinstance(level, str) else level)
+
+        os.makedirs(log_directory, exist_ok=True)
+        log_file = os.path.join(log_directory, "ddrtlsdr.log")
+
+        # File handler
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        _outputs.extend((file_handler, console_handler))
+        if use_queue:
+            log_queue = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(log_queue, *_outputs, respect_handler_level=True)
+            _listener.start()
+            _installed.append(_DeferredQueueHandler(log_queue))
+        else:
+            _installed.extend(_outputs)
+        limiter = RateLimitFilter(rate_limit) if rate_limit else None
+        for handler in _installed:
+            if limiter is not None:
+                handler.addFilter(limiter)
+            logger.addHandler(handler)
+        _configured = True
+
+
+def shutdown_logging():
+    """Flush and remove the package's handlers, stopping the queue listener if any."""
+    global _configured
+    with _lock:
+        _teardown(logging.getLogger("ddrtlsdr"))
+        _configured = False
+
+
+atexit.register(shutdown_logging)
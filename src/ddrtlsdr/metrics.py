@@ -0,0 +1,261 @@
+# src/ddrtlsdr/metrics.py
+
+import logging
+import math
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.metrics")
+
+# Bucket upper bounds in seconds
+CONTROL_CALL_BUCKETS = (50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 5e-3, 10e-3, 25e-3, 50e-3, 100e-3, 250e-3, 1.0)
+CALLBACK_BUCKETS = (10e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 5e-3, 10e-3, 50e-3, 100e-3, 500e-3)
+INTERVAL_BUCKETS = (1e-3, 2e-3, 5e-3, 10e-3, 20e-3, 50e-3, 100e-3, 200e-3, 500e-3, 1.0)
+
+GAP_FACTOR = 3.0  # A callback interval this many times the typical one counts as a gap
+INTERVAL_SMOOTHING = 1 / 64  # EWMA weight of each new interval
+WARMUP_INTERVALS = 16  # Intervals seen before gap detection starts
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. The counts are preallocated, so ``observe`` is
+    a bisect and three additions with nothing to grow.
+
+    Each histogram is meant to have one writer at a time (a stream's
+    callback thread, or calls serialized by a device's command lock);
+    concurrent writers can occasionally lose a count, never corrupt one.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Iterable[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """``(upper bound, observations <= bound)`` pairs, ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.bounds + (math.inf,), list(self.counts)):
+            total += count
+            yield bound, total
+
+
+class StreamMetrics:
+    """
+    Timing of one stream's librtlsdr callbacks.
+
+    ``block_arrived`` runs at the top of every callback: it records the
+    interval since the previous block, tracks its smoothed mean and
+    deviation (the jitter), and counts a gap when an interval exceeds
+    ``GAP_FACTOR`` times the mean, which is how samples lost inside the
+    driver or on the bus show up from here. ``callback_seconds`` is filled
+    by whichever thread runs the consumer callback.
+    """
+
+    def __init__(self):
+        self.intervals = Histogram(INTERVAL_BUCKETS)
+        self.callback_seconds = Histogram(CALLBACK_BUCKETS)
+        self.gaps = 0
+        self.mean_interval = 0.0
+        self._variance = 0.0
+        self._last_arrival = None
+
+    @property
+    def jitter(self) -> float:
+        """Smoothed standard deviation of the callback interval, in seconds."""
+        return math.sqrt(self._variance)
+
+    def block_arrived(self, now: float):
+        last, self._last_arrival = self._last_arrival, now
+        if last is None:
+            return
+        interval = now - last
+        self.intervals.observe(interval)
+        mean = self.mean_interval
+        if not mean:
+            self.mean_interval = interval
+            return
+        if interval > GAP_FACTOR * mean and self.intervals.count > WARMUP_INTERVALS:
+            self.gaps += 1
+        delta = interval - mean
+        self.mean_interval = mean + INTERVAL_SMOOTHING * delta
+        self._variance = (1 - INTERVAL_SMOOTHING) * (self._variance + INTERVAL_SMOOTHING * delta * delta)
+
+
+class ControlCallMetrics:
+    """
+    Latency histograms of librtlsdr calls, per function and device.
+
+    The wrapper only sees handles, so ``DeviceControl`` labels each handle
+    with its device serial when it opens it; calls on unlabeled handles, or
+    without one, are filed under an empty device label.
+    """
+
+    def __init__(self, bounds: Iterable[float] = CONTROL_CALL_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}  # function -> device -> histogram
+        self._labels: Dict[int, str] = {}  # id(handle) -> device label
+        self._lock = threading.Lock()  # Only taken to add a histogram
+
+    def label_handle(self, handle, label: str):
+        self._labels[id(handle)] = label
+
+    def forget_handle(self, handle):
+        self._labels.pop(id(handle), None)
+
+    def observe(self, function: str, handle, seconds: float):
+        label = "" if handle is None else self._labels.get(id(handle), "")
+        by_device = self._histograms.get(function)
+        histogram = by_device.get(label) if by_device is not None else None
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(function, {}).setdefault(label, Histogram(self.bounds))
+        histogram.observe(seconds)
+
+    def items(self) -> Iterator[Tuple[str, str, Histogram]]:
+        for function, by_device in list(self._histograms.items()):
+            for label, histogram in list(by_device.items()):
+                yield function, label, histogram
+
+
+# Filled in by librtlsdr_wrapper for every control call.
+control_calls = ControlCallMetrics()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Exposition:
+    """Builds Prometheus text format, one metric family at a time."""
+
+    def __init__(self):
+        self.lines = []
+
+    def family(self, name: str, kind: str, help_text: str):
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, labels: dict, value: float):
+        self.lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    def histogram(self, name: str, labels: dict, histogram: Histogram):
+        for bound, count in histogram.cumulative():
+            self.sample(f"{name}_bucket", {**labels, "le": _number(bound)}, count)
+        self.sample(f"{name}_sum", labels, histogram.sum)
+        self.sample(f"{name}_count", labels, histogram.count)
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def render_prometheus(control, calls: Optional[ControlCallMetrics] = None) -> str:
+    """
+    Prometheus text exposition of every running stream, the command
+    queues, the device handles and the librtlsdr call latencies. Reads
+    counters only; never touches a device.
+
+    Args:
+        control: The ``DeviceControl`` to report on.
+        calls (ControlCallMetrics, optional): Defaults to ``control_calls``.
+    """
+    calls = calls if calls is not None else control_calls
+    streams = sorted(control.streams.items())
+    throughput = control.supervisor.throughput()
+    rings = {serial: stream.stats() for serial, stream in streams}
+    out = _Exposition()
+
+    counters = [
+        ("ddrtlsdr_stream_bytes_total", "Bytes received from the dongle.", lambda s, st: st.bytes_received),
+        ("ddrtlsdr_stream_blocks_total", "Transfers received from the dongle.", lambda s, st: st.blocks_received),
+        ("ddrtlsdr_stream_gaps_total", "Callback intervals far above the typical one.", lambda s, st: st.metrics.gaps),
+        ("ddrtlsdr_stream_lost_samples_total", "Samples the block timeline estimates were lost between transfers.",
+         lambda s, st: st.timeline.lost_samples if st.timeline is not None else 0),
+        ("ddrtlsdr_stream_ring_drops_total", "Blocks dropped because the ring buffer was full.",
+         lambda s, st: rings[s].get("drops", 0)),
+        ("ddrtlsdr_stream_ring_overruns_total", "Times the ring buffer filled up.",
+         lambda s, st: rings[s].get("overruns", 0)),
+        ("ddrtlsdr_stream_restarts_total", "Times the supervisor restarted the stream.",
+         lambda s, st: throughput.get(s, {}).get("restarts", 0)),
+    ]
+    for name, help_text, value in counters:
+        out.family(name, "counter", help_text)
+        for serial, stream in streams:
+            out.sample(name, {"serial": serial}, value(serial, stream))
+
+    gauges = [
+        ("ddrtlsdr_stream_samples_per_second", "Sample rate measured over the last monitor pass.",
+         lambda s, st: throughput.get(s, {}).get("samples_per_s", 0.0)),
+        ("ddrtlsdr_stream_callback_interval_mean_seconds", "Smoothed interval between callbacks.",
+         lambda s, st: st.metrics.mean_interval),
+        ("ddrtlsdr_stream_callback_jitter_seconds", "Smoothed deviation of the interval between callbacks.",
+         lambda s, st: st.metrics.jitter),
+        ("ddrtlsdr_stream_ring_fill_blocks", "Blocks waiting in the ring buffer.", lambda s, st: rings[s].get("fill", 0)),
+        ("ddrtlsdr_stream_ring_high_water_blocks", "Highest ring buffer fill seen.",
+         lambda s, st: rings[s].get("high_water_mark", 0)),
+    ]
+    for name, help_text, value in gauges:
+        out.family(name, "gauge", help_text)
+        for serial, stream in streams:
+            out.sample(name, {"serial": serial}, value(serial, stream))
+
+    out.family("ddrtlsdr_stream_callback_interval_seconds", "histogram", "Time between librtlsdr callbacks.")
+    for serial, stream in streams:
+        out.histogram("ddrtlsdr_stream_callback_interval_seconds", {"serial": serial}, stream.metrics.intervals)
+    out.family("ddrtlsdr_stream_callback_seconds", "histogram", "Time spent in the consumer callback per block.")
+    for serial, stream in streams:
+        out.histogram("ddrtlsdr_stream_callback_seconds", {"serial": serial}, stream.metrics.callback_seconds)
+
+    commands = {serial: queue.stats() for serial, queue in sorted(control.command_queues.items())}
+    out.family("ddrtlsdr_commands_submitted_total", "counter", "Tuner parameter updates submitted.")
+    for serial, counts in commands.items():
+        out.sample("ddrtlsdr_commands_submitted_total", {"serial": serial}, counts["submitted"])
+    # Every submitted update ends up in exactly one outcome, so these sum to the above.
+    out.family("ddrtlsdr_commands_total", "counter", "Tuner parameter updates by outcome.")
+    for serial, counts in commands.items():
+        for outcome in ("applied", "coalesced", "skipped", "failed"):
+            out.sample("ddrtlsdr_commands_total", {"serial": serial, "outcome": outcome}, counts[outcome])
+
+    handles = control.get_handle_stats()
+    out.family("ddrtlsdr_device_open", "gauge", "1 if the device handle is open.")
+    for serial, entry in handles.items():
+        out.sample("ddrtlsdr_device_open", {"serial": serial}, int(entry["open"]))
+    out.family("ddrtlsdr_device_open_seconds", "gauge", "Time the last successful open took, retries included.")
+    for serial, entry in handles.items():
+        if entry.get("open_seconds") is not None:
+            out.sample("ddrtlsdr_device_open_seconds", {"serial": serial}, entry["open_seconds"])
+    out.family("ddrtlsdr_device_open_failures_total", "counter", "Failed tries to open the device.")
+    for serial, entry in handles.items():
+        out.sample("ddrtlsdr_device_open_failures_total", {"serial": serial}, entry.get("failures", 0))
+
+    out.family("ddrtlsdr_control_call_seconds", "histogram", "Latency of librtlsdr calls.")
+    for function, device, histogram in sorted(calls.items(), key=lambda item: item[:2]):
+        out.histogram("ddrtlsdr_control_call_seconds", {"function": function, "device": device}, histogram)
+    return out.text()
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import List
+from pydantic import BaseModel, Field, field_validator, ConfigDict, PrivateAttr
+from typing import Dict, List, Optional
 
 class SDRDevice(BaseModel):
     model_config = ConfigDict(strict=True)  # Ensures stricter validation
@@ -17,6 +17,31 @@ class SDRDevice(BaseModel):
 
 class SDRConfig(BaseModel):
     devices: List[SDRDevice] = Field(default_factory=list, description="List of SDR devices")
+    # serial -> device, kept in step with ``devices`` by add_device/reindex
+    _by_serial: Dict[str, SDRDevice] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context):
+        self.reindex()
+
+    def reindex(self):
+        """Rebuild the serial index, e.g. after editing ``devices`` directly."""
+        self._by_serial = {}
+        for device in self.devices:
+            # First entry wins for duplicate serials, as a linear scan would.
+            self._by_serial.setdefault(device.serial, device)
+
+    def get_device(self, serial: str) -> Optional[SDRDevice]:
+        # Private attributes resolve through BaseModel.__getattr__, which costs
+        # more than the lookup itself, so the hot path reads the storage dict.
+        return self.__pydantic_private__["_by_serial"].get(serial)
+
+    def add_device(self, device: SDRDevice) -> bool:
+        """Append a device unless its serial is already known. Returns True if added."""
+        if device.serial in self._by_serial:
+            return False
+        self.devices.append(device)
+        self._by_serial[device.serial] = device
+        return True
 
     def save(self, file_path: str):
         with open(file_path, "w") as f:
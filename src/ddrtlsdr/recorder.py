@@ -0,0 +1,254 @@
+# src/ddrtlsdr/recorder.py
+
+import datetime
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.recorder")
+
+SIGMF_DATA_EXT = ".sigmf-data"
+SIGMF_META_EXT = ".sigmf-meta"
+SIGMF_VERSION = "1.0.0"
+RECORDER_MODES = ("mmap", "buffered")
+SAMPLE_SIZES = {"cu8": 2, "cf32_le": 8}  # Bytes per complex sample
+DEFAULT_MAX_FILE_BYTES = 1 << 30  # 1 GiB
+DEFAULT_WRITE_BUFFER = 4 << 20  # 4 MiB, a multiple of any common block size
+
+
+def _preallocate(fd: int, size: int):
+    """Reserve ``size`` bytes on disk so writes never extend the file."""
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError as e:
+            logger.debug(f"posix_fallocate failed ({e}); falling back to ftruncate.")
+    os.ftruncate(fd, size)
+
+
+class IQRecorder:
+    """
+    Records I/Q blocks to disk as SigMF recordings.
+
+    Every data file is preallocated to ``max_file_bytes`` and written either
+    through a memory map (``mode="mmap"``) or through a fixed staging buffer
+    that is flushed in large aligned ``os.write`` calls (``mode="buffered"``).
+    Files rotate when they fill up or after ``max_file_seconds``; each one is
+    trimmed to its real length and gets a ``.sigmf-meta`` sidecar.
+
+    The recorder is callable, so it can be passed straight to
+    ``DeviceControl.start_stream`` (ideally with a ring buffer, so disk I/O
+    happens off the librtlsdr thread).
+
+    Args:
+        path_prefix (str): Files are named ``<path_prefix>-NNNN.sigmf-data``.
+        sample_rate (int): Sample rate in Hz, for the metadata.
+        center_freq (int): Center frequency in Hz, for the metadata.
+        gain (int, optional): Tuner gain in tenths of a dB, for the metadata.
+        datatype (str): ``"cu8"`` for raw dongle bytes or ``"cf32_le"`` for complex64.
+        max_file_bytes (int): Size at which a file is rotated.
+        max_file_seconds (float, optional): Age at which a file is rotated.
+        mode (str): ``"mmap"`` or ``"buffered"``.
+        write_buffer_size (int): Staging buffer size in buffered mode.
+        description (str, optional): Free-text ``core:description``.
+        hw (str, optional): Hardware description for ``core:hw``.
+    """
+
+    def __init__(
+        self,
+        path_prefix: str,
+        sample_rate: int,
+        center_freq: int,
+        gain: Optional[int] = None,
+        datatype: str = "cu8",
+        max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+        max_file_seconds: Optional[float] = None,
+        mode: str = "mmap",
+        write_buffer_size: int = DEFAULT_WRITE_BUFFER,
+        description: Optional[str] = None,
+        hw: Optional[str] = None,
+    ):
+        if datatype not in SAMPLE_SIZES:
+            raise ValueError(f"Unsupported SigMF datatype: {datatype}")
+        if mode not in RECORDER_MODES:
+            raise ValueError(f"Unsupported recorder mode: {mode}")
+        self.sample_size = SAMPLE_SIZES[datatype]
+        # Keep every file an exact number of samples.
+        self.max_file_bytes = max_file_bytes - max_file_bytes % self.sample_size
+        if self.max_file_bytes <= 0:
+            raise ValueError("max_file_bytes must hold at least one sample")
+        self.path_prefix = path_prefix
+        self.sample_rate = sample_rate
+        self.center_freq = center_freq
+        self.gain = gain
+        self.datatype = datatype
+        self.max_file_seconds = max_file_seconds
+        self.mode = mode
+        self.description = description
+        self.hw = hw
+
+        self.files: List[str] = []  # Completed data files
+        self.bytes_written = 0
+        self._file_index = 0
+        self._fd = None
+        self._mmap = None
+        self._view = None
+        self._offset = 0  # Bytes written to the current file
+        self._opened_at = 0.0
+        self._captures = []
+        self._staging = np.empty(write_buffer_size, dtype=np.uint8) if mode == "buffered" else None
+        self._staged = 0
+        self._pending = {}  # Tuner changes not yet applied, from retune
+        self._retune_lock = threading.Lock()
+
+    def __call__(self, data: Union[bytes, np.ndarray]):
+        self.write(data)
+
+    @property
+    def current_path(self) -> Optional[str]:
+        if self._fd is None:
+            return None
+        return f"{self.path_prefix}-{self._file_index:04d}{SIGMF_DATA_EXT}"
+
+    def write(self, data: Union[bytes, np.ndarray]):
+        """Append a block of samples, rotating files as needed."""
+        if isinstance(data, np.ndarray):
+            block = data.reshape(-1).view(np.uint8)
+        else:
+            block = np.frombuffer(data, dtype=np.uint8)
+
+        if self._pending:
+            self._apply_retune()
+        if self._fd is not None and self.max_file_seconds is not None:
+            if time.monotonic() - self._opened_at >= self.max_file_seconds:
+                self._close_file()
+
+        while block.shape[0]:
+            if self._fd is None:
+                self._open_file()
+            room = self.max_file_bytes - self._offset
+            chunk = block[:room]
+            if self.mode == "mmap":
+                self._view[self._offset:self._offset + chunk.shape[0]] = chunk
+            else:
+                self._stage(chunk)
+            self._offset += chunk.shape[0]
+            self.bytes_written += chunk.shape[0]
+            block = block[chunk.shape[0]:]
+            if self._offset >= self.max_file_bytes:
+                self._close_file()
+
+    def retune(self, center_freq: Optional[int] = None, sample_rate: Optional[int] = None, gain: Optional[int] = None):
+        """
+        Note a tuner change, applied from the next block written.
+
+        A new frequency or gain starts a new SigMF capture segment; a new
+        sample rate, which SigMF keeps per recording, starts a new file. May
+        be called from another thread than the one writing.
+        """
+        with self._retune_lock:
+            if center_freq is not None:
+                self._pending["center_freq"] = center_freq
+            if sample_rate is not None:
+                self._pending["sample_rate"] = sample_rate
+            if gain is not None:
+                self._pending["gain"] = gain
+
+    def _apply_retune(self):
+        with self._retune_lock:
+            pending, self._pending = self._pending, {}
+        if pending.get("sample_rate", self.sample_rate) != self.sample_rate and self._fd is not None:
+            self._close_file()
+        new_segment = any(getattr(self, key) != value for key, value in pending.items())
+        for key, value in pending.items():
+            setattr(self, key, value)
+        if new_segment and self._fd is not None:
+            self._captures.append(self._capture(self._offset // self.sample_size))
+
+    def close(self):
+        """Finish the current file and write its metadata."""
+        if self._fd is not None:
+            self._close_file()
+
+    def _capture(self, sample_start: int) -> dict:
+        capture = {
+            "core:sample_start": sample_start,
+            "core:frequency": self.center_freq,
+            "core:datetime": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        if self.gain is not None:
+            capture["ddrtlsdr:gain"] = self.gain
+        return capture
+
+    def _open_file(self):
+        path = f"{self.path_prefix}-{self._file_index:04d}{SIGMF_DATA_EXT}"
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        _preallocate(self._fd, self.max_file_bytes)
+        if self.mode == "mmap":
+            self._mmap = mmap.mmap(self._fd, self.max_file_bytes)
+            self._view = np.frombuffer(self._mmap, dtype=np.uint8)
+        self._offset = 0
+        self._opened_at = time.monotonic()
+        self._captures = [self._capture(0)]
+        logger.info(f"Recording to {path}.")
+
+    def _stage(self, chunk: np.ndarray):
+        staging = self._staging
+        while chunk.shape[0]:
+            n = min(chunk.shape[0], staging.shape[0] - self._staged)
+            staging[self._staged:self._staged + n] = chunk[:n]
+            self._staged += n
+            chunk = chunk[n:]
+            if self._staged == staging.shape[0]:
+                self._flush_staging()
+
+    def _flush_staging(self):
+        view = memoryview(self._staging)[:self._staged]
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        self._staged = 0
+
+    def _close_file(self):
+        path = self.current_path
+        if self.mode == "mmap":
+            self._view = None
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        else:
+            self._flush_staging()
+        os.ftruncate(self._fd, self._offset)
+        os.close(self._fd)
+        self._fd = None
+        self._write_metadata(path)
+        self.files.append(path)
+        self._file_index += 1
+        logger.info(f"Closed recording {path} ({self._offset} bytes).")
+
+    def _write_metadata(self, data_path: str):
+        global_meta = {
+            "core:datatype": self.datatype,
+            "core:sample_rate": self.sample_rate,
+            "core:version": SIGMF_VERSION,
+            "core:recorder": "ddrtlsdr",
+        }
+        if self.description:
+            global_meta["core:description"] = self.description
+        if self.hw:
+            global_meta["core:hw"] = self.hw
+        meta = {"global": global_meta, "captures": self._captures, "annotations": []}
+        meta_path = data_path[:-len(SIGMF_DATA_EXT)] + SIGMF_META_EXT
+        with open(meta_path, "w") as f:
+            json.dump(meta, f, indent=4)
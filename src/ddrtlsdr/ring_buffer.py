@@ -0,0 +1,139 @@
+# src/ddrtlsdr/ring_buffer.py
+
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.ring_buffer")
+
+
+class SampleRingBuffer:
+    """
+    Preallocated single-producer/single-consumer ring of sample blocks.
+
+    The producer (the librtlsdr callback thread) only copies into a free slot
+    and bumps the write counter; the consumer only reads the oldest slot and
+    bumps the read counter. Each counter is written by exactly one thread, so
+    the data path needs no lock. When the ring is full the incoming block is
+    dropped rather than blocking the USB transfer loop.
+
+    Args:
+        depth (int): Number of slots in the ring.
+        block_size (int): Maximum size of one block, in elements.
+        dtype: NumPy dtype of the slots.
+    """
+
+    def __init__(self, depth: int, block_size: int, dtype=np.uint8):
+        if depth < 1:
+            raise ValueError("Ring buffer depth must be at least 1")
+        if block_size < 1:
+            raise ValueError("Ring buffer block size must be at least 1")
+        self.depth = depth
+        self.block_size = block_size
+        self._slots = np.empty((depth, block_size), dtype=dtype)
+        self._lengths = np.zeros(depth, dtype=np.int64)
+        self._tags = [0] * depth  # Caller-supplied id of each slot's block
+        self._write_count = 0  # Only advanced by the producer
+        self._read_count = 0  # Only advanced by the consumer
+        self._data_ready = threading.Event()
+        self._in_overrun = False
+
+        # Counters
+        self.overruns = 0  # Number of times the producer found the ring full
+        self.drops = 0  # Blocks discarded (ring full or oversized)
+        self.high_water_mark = 0  # Highest fill level seen, in blocks
+
+    def __len__(self) -> int:
+        return self._write_count - self._read_count
+
+    @property
+    def blocks_written(self) -> int:
+        return self._write_count
+
+    @property
+    def blocks_read(self) -> int:
+        return self._read_count
+
+    def write(self, block: np.ndarray, tag: int = 0) -> bool:
+        """
+        Copy a block into the next free slot. Called from the producer thread.
+        ``tag`` travels with the block; see ``read_tag()``.
+
+        Returns:
+            bool: False if the block was dropped.
+        """
+        length = block.shape[0]
+        if length > self.block_size:
+            self.drops += 1
+            logger.warning(f"Dropped block of {length} elements; slot size is {self.block_size}.")
+            return False
+
+        fill = self._write_count - self._read_count
+        if fill >= self.depth:
+            if not self._in_overrun:
+                self.overruns += 1
+                self._in_overrun = True
+            self.drops += 1
+            return False
+        self._in_overrun = False
+
+        slot = self._write_count % self.depth
+        self._slots[slot, :length] = block
+        self._lengths[slot] = length
+        self._tags[slot] = tag
+        self._write_count += 1
+
+        if fill + 1 > self.high_water_mark:
+            self.high_water_mark = fill + 1
+        self._data_ready.set()
+        return True
+
+    def read(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Return a view of the oldest block without removing it. Called from the
+        consumer thread, which must call ``release()`` once it is done with
+        the view.
+
+        Returns:
+            Optional[np.ndarray]: The block, or None if the timeout expired
+            or the consumer was woken with ``wake()``.
+        """
+        if self._write_count == self._read_count:
+            self._data_ready.clear()
+            # Re-check after clearing so a write racing with clear() is seen.
+            if self._write_count == self._read_count:
+                self._data_ready.wait(timeout)
+                if self._write_count == self._read_count:
+                    return None
+        slot = self._read_count % self.depth
+        return self._slots[slot, :self._lengths[slot]]
+
+    def read_tag(self) -> int:
+        """The tag written with the block returned by the last ``read()``."""
+        return self._tags[self._read_count % self.depth]
+
+    def release(self):
+        """Free the slot returned by the last ``read()``."""
+        if self._read_count < self._write_count:
+            self._read_count += 1
+
+    def wake(self):
+        """Wake a consumer blocked in ``read()``, e.g. when shutting down."""
+        self._data_ready.set()
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "fill": len(self),
+            "blocks_written": self._write_count,
+            "blocks_read": self._read_count,
+            "overruns": self.overruns,
+            "drops": self.drops,
+            "high_water_mark": self.high_water_mark,
+        }
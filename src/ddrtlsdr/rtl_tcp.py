@@ -0,0 +1,203 @@
+# src/ddrtlsdr/rtl_tcp.py
+
+import argparse
+import asyncio
+import logging
+import struct
+from typing import Optional
+
+from .device_control import DeviceControl
+from .models import SDRDevice
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.rtl_tcp")
+
+DEFAULT_PORT = 1234
+HEADER_MAGIC = b"RTL0"
+TUNER_R820T = 5
+# R820T gain steps in tenths of a dB, as reported by librtlsdr.
+R820T_GAINS = (
+    0, 9, 14, 27, 37, 77, 87, 125, 144, 157, 166, 197, 207, 229, 254,
+    280, 297, 328, 338, 364, 372, 386, 402, 421, 434, 439, 445, 480, 496,
+)
+COMMAND = struct.Struct(">BI")  # Command byte and big-endian parameter
+
+CMD_SET_FREQ = 0x01
+CMD_SET_SAMPLE_RATE = 0x02
+CMD_SET_GAIN_MODE = 0x03
+CMD_SET_GAIN = 0x04
+CMD_SET_FREQ_CORRECTION = 0x05
+CMD_SET_AGC_MODE = 0x08
+CMD_SET_GAIN_BY_INDEX = 0x0D
+
+
+class RtlTcpServer:
+    """
+    rtl_tcp-compatible server for one device, built on ``DeviceControl``.
+
+    Every client gets the standard 12-byte header (``RTL0``, tuner type,
+    gain count) followed by raw cu8 samples. All clients share one device
+    stream through ``DeviceControl.subscribe_iq``, so each block is copied
+    once no matter how many are connected, and a client that cannot keep up
+    is disconnected instead of holding the others back.
+
+    Command packets map onto the ``DeviceControl`` setters; any client may
+    retune, as with the stock server. Commands without a wrapper (AGC, PPM
+    correction, ...) are acknowledged in the log and ignored.
+
+    Args:
+        device_control (DeviceControl): Owner of the device handle.
+        device (SDRDevice): The device to serve.
+        host (str): Address to listen on.
+        port (int): TCP port (0 picks a free one).
+        max_queue (int): Blocks a client may fall behind before it is dropped.
+    """
+
+    def __init__(
+        self,
+        device_control: DeviceControl,
+        device: SDRDevice,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        max_queue: int = 64,
+    ):
+        self.device_control = device_control
+        self.device = device
+        self.host = host
+        self.port = port
+        self.max_queue = max_queue
+        self.clients = 0
+        self.gain_manual = True
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._handlers = set()  # Client handler tasks, so stop() can end them
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"rtl_tcp server for device {self.device.serial} listening on {self.host}:{self.port}.")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._handlers):
+                task.cancel()
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+            logger.info(f"rtl_tcp server for device {self.device.serial} stopped.")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def header(self) -> bytes:
+        return HEADER_MAGIC + struct.pack(">II", TUNER_R820T, len(R820T_GAINS))
+
+    async def _run_blocking(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            await self._serve_client(reader, writer)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._handlers.discard(task)
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        loop = asyncio.get_running_loop()
+        try:
+            subscription = await self._run_blocking(
+                lambda: self.device_control.subscribe_iq(self.device, loop, max_queue=self.max_queue)
+            )
+        except Exception as e:
+            logger.error(f"Cannot stream device {self.device.serial} to {peer}: {e}")
+            writer.close()
+            return
+
+        self.clients += 1
+        logger.info(f"rtl_tcp client {peer} connected ({self.clients} total).")
+        commands = asyncio.create_task(self._read_commands(reader))
+        try:
+            writer.write(self.header())
+            async for payload in subscription:
+                writer.write(payload)
+                await writer.drain()
+                if commands.done():
+                    break
+            if subscription.dropped:
+                logger.warning(f"rtl_tcp client {peer} dropped for falling behind.")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            subscription.close()
+            commands.cancel()
+            self.clients -= 1
+            writer.close()
+            logger.info(f"rtl_tcp client {peer} disconnected ({self.clients} remaining).")
+
+    async def _read_commands(self, reader: asyncio.StreamReader):
+        while True:
+            try:
+                packet = await reader.readexactly(COMMAND.size)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            command, param = COMMAND.unpack(packet)
+            try:
+                await self._run_blocking(self.handle_command, command, param)
+            except Exception as e:
+                logger.error(f"rtl_tcp command 0x{command:02x} ({param}) failed: {e}")
+
+    def handle_command(self, command: int, param: int):
+        """Apply one rtl_tcp command packet to the device."""
+        control, device = self.device_control, self.device
+        if command == CMD_SET_FREQ:
+            control.set_center_frequency(device, param)
+        elif command == CMD_SET_SAMPLE_RATE:
+            control.set_sample_rate(device, param)
+        elif command == CMD_SET_GAIN_MODE:
+            self.gain_manual = bool(param)
+            logger.info(f"rtl_tcp gain mode {'manual' if param else 'auto'} for device {device.serial}.")
+        elif command == CMD_SET_GAIN:
+            # The parameter is a signed int in tenths of a dB.
+            control.set_gain(device, struct.unpack(">i", struct.pack(">I", param))[0])
+        elif command == CMD_SET_GAIN_BY_INDEX:
+            if param < len(R820T_GAINS):
+                control.set_gain(device, R820T_GAINS[param])
+        else:
+            logger.debug(f"Ignoring unsupported rtl_tcp command 0x{command:02x} ({param}).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="rtl_tcp-compatible server backed by DeviceControl")
+    parser.add_argument("--serial", help="Device serial (default: the first device)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    control = DeviceControl()
+    if args.serial:
+        device = control.manager.get_device(args.serial)
+        if device is None:
+            parser.error(f"Unknown device {args.serial}")
+    else:
+        devices = control.list_devices()
+        if not devices:
+            parser.error("No devices found")
+        device = devices[0]
+    server = RtlTcpServer(control, device, args.host, args.port)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
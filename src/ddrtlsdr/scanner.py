@@ -0,0 +1,150 @@
+# src/ddrtlsdr/scanner.py
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.scanner")
+
+DEFAULT_SETTLE_TIME = 0.002  # R820T PLL lock plus a margin, in seconds
+
+
+class FrequencyScanner:
+    """
+    Stream callback that hops a device across a frequency plan.
+
+    Fed uint8 I/Q blocks by an ``SDRStream``, it hands each sample to
+    ``callback(freq_hz, samples)`` tagged with the frequency it was captured
+    at, and once ``dwell_samples`` have been collected at a frequency it
+    retunes to the next one without stopping the stream. Retunes happen
+    between blocks, so the rest of the block a dwell ends in is discarded;
+    smaller blocks waste less.
+
+    Samples are counted from the consumer's side. ``retune(freq_hz)`` sets
+    the frequency and returns how many samples were already captured but not
+    yet delivered (e.g. sitting in the stream's ring), which still belong to
+    the old frequency. Those, plus ``settle_samples`` while the PLL locks,
+    are dropped after every hop.
+
+    Args:
+        frequencies (Iterable[int]): Frequencies to visit, in Hz, in order.
+        dwell_samples (int): Usable samples to collect per frequency.
+        retune (Callable[[int], int]): Tunes the device; see above.
+        callback (Callable[[int, np.ndarray], None]): Receives the frequency
+            and a uint8 view of interleaved I/Q captured at it. The view is
+            only valid during the call; one dwell may arrive in several calls.
+        settle_samples (int): Samples dropped after each retune.
+        sweeps (int, optional): Passes over the plan before finishing.
+            Scans forever if omitted.
+        on_dwell_complete (Callable[[int], None], optional): Called with the
+            frequency once its dwell is complete.
+    """
+
+    def __init__(
+        self,
+        frequencies: Iterable[int],
+        dwell_samples: int,
+        retune: Callable[[int], int],
+        callback: Callable[[int, np.ndarray], None],
+        settle_samples: int = 0,
+        sweeps: Optional[int] = None,
+        on_dwell_complete: Optional[Callable[[int], None]] = None,
+    ):
+        self.frequencies = [int(freq) for freq in frequencies]
+        if not self.frequencies:
+            raise ValueError("The frequency plan is empty")
+        if dwell_samples <= 0:
+            raise ValueError(f"dwell_samples must be positive, got {dwell_samples}")
+        self.dwell_samples = dwell_samples
+        self.retune = retune
+        self.callback = callback
+        self.settle_samples = settle_samples
+        self.sweeps = sweeps
+        self.on_dwell_complete = on_dwell_complete
+        self.frequency = self.frequencies[0]  # Frequency the incoming samples belong to
+        self.finished = threading.Event()
+        self.position = 0  # Samples received so far
+        self.hops = 0  # Completed dwells
+        self.sweeps_completed = 0
+        self.samples_used = 0
+        self.samples_discarded = 0
+        self._index = 0
+        self._collected = 0  # Usable samples at the current frequency
+        self._valid_from = settle_samples  # First usable sample at the current frequency
+        self._started_at = None
+
+    def __call__(self, block: np.ndarray):
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        start = self.position
+        end = start + block.shape[0] // 2
+        self.position = end
+        if self.finished.is_set():
+            self.samples_discarded += end - start
+            return
+
+        cursor = start
+        while cursor < end:
+            if cursor < self._valid_from:
+                skip = min(end, self._valid_from) - cursor
+                self.samples_discarded += skip
+                cursor += skip
+                continue
+            take = min(end - cursor, self.dwell_samples - self._collected)
+            offset = 2 * (cursor - start)
+            self.callback(self.frequency, block[offset:offset + 2 * take])
+            self._collected += take
+            self.samples_used += take
+            cursor += take
+            if self._collected >= self.dwell_samples:
+                self._hop(cursor, end)
+                if self.finished.is_set():
+                    self.samples_discarded += end - cursor
+                    return
+
+    def _hop(self, cursor: int, block_end: int):
+        if self.on_dwell_complete is not None:
+            self.on_dwell_complete(self.frequency)
+        self.hops += 1
+        self._collected = 0
+        self._index += 1
+        if self._index == len(self.frequencies):
+            self._index = 0
+            self.sweeps_completed += 1
+            if self.sweeps is not None and self.sweeps_completed >= self.sweeps:
+                self.finished.set()
+                logger.info(f"Scan finished after {self.hops} hops.")
+                return
+        freq = self.frequencies[self._index]
+        if freq == self.frequency:
+            # Nothing to retune; keep using the samples as they come.
+            self._valid_from = cursor
+            return
+        backlog = self.retune(freq)
+        # The rest of this block and the backlog were captured before the retune.
+        self._valid_from = block_end + backlog + self.settle_samples
+        self.frequency = freq
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the requested sweeps are done. Returns False on timeout."""
+        return self.finished.wait(timeout)
+
+    def stats(self) -> dict:
+        """Hop rate and the share of received samples that were usable."""
+        elapsed = time.perf_counter() - self._started_at if self._started_at is not None else 0.0
+        return {
+            "hops": self.hops,
+            "sweeps": self.sweeps_completed,
+            "samples_received": self.position,
+            "samples_used": self.samples_used,
+            "samples_discarded": self.samples_discarded,
+            "usable_ratio": self.samples_used / self.position if self.position else 0.0,
+            "hops_per_second": self.hops / elapsed if elapsed > 0 else 0.0,
+        }
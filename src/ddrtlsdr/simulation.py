@@ -0,0 +1,429 @@
+# src/ddrtlsdr/simulation.py
+
+import ctypes
+import logging
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .backend import SDRBackend
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.simulation")
+
+SIGNAL_TYPES = ("tone", "noise", "file")
+DEFAULT_NUM_BUFFERS = 15  # librtlsdr's default transfer buffer count
+NOISE_TABLE_SAMPLES = 1 << 20
+USB_BACKLOG_SAMPLES = DEFAULT_NUM_BUFFERS * 16 * 16384 // 2  # Samples queued before overflow
+REFERENCE_TABLE_SAMPLES = 1 << 20
+REFERENCE_EPOCH = time.perf_counter()  # Time of reference sample 0, shared by every simulated device
+_reference_tables = {}  # reference_seed -> complex64 table, shared by devices with the same seed
+
+# librtlsdr / libusb style result codes
+RESULT_OK = 0
+ERROR_NO_DEVICE = -4  # LIBUSB_ERROR_NO_DEVICE
+ERROR_BUSY = -6  # LIBUSB_ERROR_BUSY
+
+
+class SimulatedDevice:
+    """
+    Stand-in for an RTL-SDR dongle that produces interleaved uint8 I/Q at a
+    configured sample rate.
+
+    ``read_async`` behaves like ``rtlsdr_read_async``: it cycles through a
+    fixed set of transfer buffers, invokes the callback once per buffer at
+    the cadence the sample rate implies, and returns once ``cancel_async`` is
+    called. If the callback falls further behind than the number of transfer
+    buffers, blocks are skipped (and counted in ``dropped_blocks``) just as
+    the dongle would overflow.
+
+    Args:
+        sample_rate (int): Samples per second to produce.
+        center_freq (int): Reported center frequency in Hz.
+        gain (int): Reported tuner gain in tenths of a dB.
+        signal (str): ``"tone"`` (a complex tone plus noise), ``"noise"``, or
+            ``"file"`` to replay raw uint8 I/Q from ``replay_path`` in a loop.
+        tone_offset_hz (float): Tone frequency relative to the center.
+        tone_freq_hz (float, optional): Absolute tone frequency. Overrides
+            ``tone_offset_hz``, so the tone moves (or leaves the band) when
+            the device is retuned.
+        amplitude (float): Tone amplitude, full scale is 1.0.
+        noise_level (float): Standard deviation of the added noise.
+        fail_after_blocks (int, optional): End the async read with an error
+            after this many blocks, to simulate a device dropping off the bus.
+        replay_path (str, optional): Recording to replay when ``signal`` is ``"file"``.
+        serial (str, optional): USB serial reported by the simulated backend.
+        seed (int, optional): Seed for the noise generator.
+        settle_time (float): Seconds of samples after each retune that are
+            garbage (all zero bytes) while the PLL locks.
+        reference_level (float): Amplitude of a noise-like reference signal
+            common to every device with the same ``reference_seed``, as if
+            one source were split to all antenna inputs. It is indexed by
+            wall-clock time since ``REFERENCE_EPOCH``, so devices started at
+            different moments see it at different sample offsets.
+        reference_seed (int): Selects the shared reference signal.
+        sample_offset (int): Extra samples by which this device's view of
+            the reference is shifted, e.g. to inject a known misalignment.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 2_048_000,
+        center_freq: int = 100_000_000,
+        gain: int = 0,
+        signal: str = "tone",
+        tone_offset_hz: float = 100_000.0,
+        amplitude: float = 0.5,
+        noise_level: float = 0.05,
+        fail_after_blocks: Optional[int] = None,
+        replay_path: Optional[str] = None,
+        serial: Optional[str] = None,
+        seed: Optional[int] = None,
+        tone_freq_hz: Optional[float] = None,
+        settle_time: float = 0.0,
+        reference_level: float = 0.0,
+        reference_seed: int = 0,
+        sample_offset: int = 0,
+    ):
+        if signal not in SIGNAL_TYPES:
+            raise ValueError(f"Unsupported signal type: {signal}")
+        if signal == "file" and replay_path is None:
+            raise ValueError("A replay_path is required to replay a file")
+        self.sample_rate = sample_rate
+        self.center_freq = center_freq
+        self.gain = gain
+        self.signal = signal
+        self.tone_offset_hz = tone_offset_hz
+        self.tone_freq_hz = tone_freq_hz
+        self.settle_time = settle_time
+        self._retuned_at = None  # sample_count at the last retune
+        self.amplitude = amplitude
+        self.noise_level = noise_level
+        self.fail_after_blocks = fail_after_blocks
+        self.serial = serial
+        self._replay = np.memmap(replay_path, dtype=np.uint8, mode="r") if replay_path else None
+        self._sync_clock = None
+        self._rng = np.random.default_rng(seed)
+        self._noise = None
+        self._scratch_key = None
+        self._scratch_samples = None
+        self._scratch_tone = None
+        self._tone_base = None
+        self.reference_level = reference_level
+        self.reference_seed = reference_seed
+        self.sample_offset = sample_offset
+        self.reference_start = 0  # Reference index of sample_count 0, set when sampling starts
+        self.stream_started_at = None  # time.perf_counter() when the last async read started sampling
+        self._cancel = threading.Event()
+        self.sample_count = 0  # Samples produced, including dropped ones
+        self.delivered_blocks = 0
+        self.dropped_blocks = 0
+
+    @property
+    def center_freq(self) -> int:
+        return self._center_freq
+
+    @center_freq.setter
+    def center_freq(self, freq_hz: int):
+        if getattr(self, "_center_freq", freq_hz) != freq_hz:
+            self._retuned_at = self.sample_count
+        self._center_freq = freq_hz
+
+    def _tone_offset(self) -> Optional[float]:
+        """The tone's offset from the center, or None if it is out of band."""
+        if self.tone_freq_hz is None:
+            return self.tone_offset_hz
+        offset = self.tone_freq_hz - self.center_freq
+        return offset if abs(offset) < self.sample_rate / 2 else None
+
+    def _noise_table(self) -> np.ndarray:
+        # Drawing fresh Gaussian noise for every block costs more than the
+        # rest of the generator; a long precomputed table read at random
+        # offsets is indistinguishable for load testing.
+        if self._noise is None:
+            noise = self._rng.standard_normal(2 * NOISE_TABLE_SAMPLES).astype(np.float32)
+            self._noise = noise.view(np.complex64) * np.float32(self.noise_level / np.sqrt(2))
+        return self._noise
+
+    def _reference_table(self) -> np.ndarray:
+        table = _reference_tables.get(self.reference_seed)
+        if table is None:
+            # Seeded apart from the per-device noise, which uses small seeds.
+            rng = np.random.default_rng((0x5EF, self.reference_seed))
+            table = rng.standard_normal(2 * REFERENCE_TABLE_SAMPLES).astype(np.float32).view(np.complex64)
+            table *= np.float32(1 / np.sqrt(2))
+            table = _reference_tables.setdefault(self.reference_seed, table)
+        return table
+
+    def _start_sampling(self):
+        # Sample ``sample_count`` is taken now; line the reference up with the clock.
+        self.stream_started_at = time.perf_counter()
+        elapsed = round((self.stream_started_at - REFERENCE_EPOCH) * self.sample_rate)
+        self.reference_start = elapsed - self.sample_count
+
+    def _add_reference(self, samples: np.ndarray, start_sample: int):
+        table = self._reference_table()
+        position = (self.reference_start + self.sample_offset + start_sample) % REFERENCE_TABLE_SAMPLES
+        level = np.float32(self.reference_level)
+        filled = 0
+        while filled < samples.shape[0]:
+            chunk = min(samples.shape[0] - filled, REFERENCE_TABLE_SAMPLES - position)
+            samples[filled:filled + chunk] += level * table[position:position + chunk]
+            filled += chunk
+            position = 0
+
+    def _scratch(self, num_samples: int, tone_offset_hz: float):
+        key = (num_samples, self.sample_rate, tone_offset_hz, self.amplitude)
+        if self._scratch_key != key:
+            self._scratch_key = key
+            self._scratch_samples = np.empty(num_samples, dtype=np.complex64)
+            self._scratch_tone = np.empty(num_samples, dtype=np.complex64)
+            n = np.arange(num_samples, dtype=np.float64)
+            self._tone_base = (self.amplitude * np.exp(2j * np.pi * tone_offset_hz / self.sample_rate * n)).astype(np.complex64)
+        return self._scratch_samples, self._scratch_tone
+
+    def generate(self, start_sample: int, num_samples: int) -> np.ndarray:
+        """
+        Complex baseband samples ``start_sample .. start_sample + num_samples``.
+
+        The returned array is reused by the next call.
+        """
+        tone_offset_hz = self._tone_offset()
+        samples, tone = self._scratch(num_samples, tone_offset_hz or 0.0)
+        noise = self._noise_table()
+        offset = int(self._rng.integers(0, NOISE_TABLE_SAMPLES - num_samples)) if num_samples < NOISE_TABLE_SAMPLES else 0
+        np.copyto(samples, noise[offset:offset + num_samples])
+        if self.signal == "tone" and self.amplitude and tone_offset_hz is not None:
+            # Rotate the precomputed tone to this block's starting phase.
+            rotation = np.exp(2j * np.pi * tone_offset_hz / self.sample_rate * start_sample)
+            np.multiply(self._tone_base, np.complex64(rotation), out=tone)
+            samples += tone
+        if self.reference_level:
+            self._add_reference(samples, start_sample)
+        return samples
+
+    def _fill_from_file(self, out: np.ndarray, start_sample: int):
+        replay = self._replay
+        position = (2 * start_sample) % replay.shape[0]
+        filled = 0
+        while filled < out.shape[0]:
+            chunk = min(out.shape[0] - filled, replay.shape[0] - position)
+            out[filled:filled + chunk] = replay[position:position + chunk]
+            filled += chunk
+            position = 0
+
+    def fill(self, out: np.ndarray, start_sample: int):
+        """Quantize the next ``len(out) // 2`` samples into uint8 I/Q like the dongle's ADC."""
+        if self._replay is not None:
+            self._fill_from_file(out, start_sample)
+        else:
+            samples = self.generate(start_sample, out.shape[0] // 2)
+            interleaved = samples.view(np.float32)
+            np.multiply(interleaved, np.float32(127.5), out=interleaved)
+            np.add(interleaved, np.float32(127.5), out=interleaved)
+            np.clip(interleaved, 0, 255, out=interleaved)
+            out[:interleaved.shape[0]] = interleaved
+        if self._retuned_at is not None and self.settle_time:
+            settle_end = self._retuned_at + int(self.settle_time * self.sample_rate)
+            if start_sample < settle_end:
+                out[:2 * (settle_end - start_sample)] = 0
+
+    def read_async(self, callback, ctx, num_buffers: int, buffer_size: int) -> int:
+        """Drive ``callback(buf, length, ctx)`` until cancelled. Returns a librtlsdr-style result code."""
+        num_buffers = num_buffers or DEFAULT_NUM_BUFFERS
+        buffers = [(ctypes.c_uint8 * buffer_size)() for _ in range(num_buffers)]
+        pointers = [ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8)) for buf in buffers]
+        views = [np.ctypeslib.as_array(buf) for buf in buffers]
+        block_interval = (buffer_size // 2) / self.sample_rate
+        try:
+            return self._run(callback, ctx, pointers, views, buffer_size, block_interval)
+        finally:
+            # Cleared on exit rather than on entry so a cancel that races
+            # ahead of the read still stops it.
+            self._cancel.clear()
+
+    def _run(self, callback, ctx, pointers, views, buffer_size: int, block_interval: float) -> int:
+        num_buffers = len(pointers)
+        samples_per_block = buffer_size // 2
+        self._start_sampling()
+        next_deadline = self.stream_started_at + block_interval
+        blocks = 0
+        while not self._cancel.is_set():
+            if self.fail_after_blocks is not None and blocks >= self.fail_after_blocks:
+                logger.warning("Simulated device failure.")
+                return -1
+
+            now = time.perf_counter()
+            if now < next_deadline:
+                self._cancel.wait(next_deadline - now)
+                if self._cancel.is_set():
+                    break
+            else:
+                late_blocks = int((now - next_deadline) / block_interval)
+                if late_blocks >= num_buffers:
+                    # The host stopped draining the USB buffers; the dongle
+                    # keeps sampling and those samples are lost.
+                    self.dropped_blocks += late_blocks
+                    self.sample_count += late_blocks * samples_per_block
+                    next_deadline += late_blocks * block_interval
+
+            slot = blocks % num_buffers
+            self.fill(views[slot], self.sample_count)
+            self.sample_count += samples_per_block
+            callback(pointers[slot], buffer_size, ctx)
+            self.delivered_blocks += 1
+            blocks += 1
+            next_deadline += block_interval
+        return 0
+
+    def cancel_async(self):
+        self._cancel.set()
+
+    def reset_buffer(self):
+        # Build the signal tables now, so the first block after a gated
+        # start is not late the way a real dongle's would never be.
+        self._noise_table()
+        if self.reference_level:
+            self._reference_table()
+        self._sync_clock = time.perf_counter()
+        self._start_sampling()
+
+    def read_sync(self, address: int, length: int) -> int:
+        """
+        Fill ``length`` bytes at ``address``, blocking until that many
+        samples would have arrived since ``reset_buffer``. Returns the
+        number of bytes read.
+        """
+        if self._sync_clock is None:
+            self.reset_buffer()
+        out = np.ctypeslib.as_array((ctypes.c_uint8 * length).from_address(address))
+        num_samples = length // 2
+        lag = time.perf_counter() - self._sync_clock - self.sample_count / self.sample_rate
+        if lag * self.sample_rate > USB_BACKLOG_SAMPLES:
+            # The dongle overflowed while nobody was reading.
+            self.sample_count += int(lag * self.sample_rate) - USB_BACKLOG_SAMPLES
+        self.fill(out, self.sample_count)
+        self.sample_count += num_samples
+        wait = self._sync_clock + self.sample_count / self.sample_rate - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        return length
+
+
+class SimulatedBackend(SDRBackend):
+    """
+    Backend that serves ``SimulatedDevice`` instances instead of dongles, so
+    ``DeviceControl``, the API and the streaming pipeline can be exercised and
+    load-tested on machines without hardware.
+
+    Handles returned by ``open`` are the ``SimulatedDevice`` objects
+    themselves. Opening a device twice fails with a busy error, like libusb.
+
+    Args:
+        devices (List[SimulatedDevice], optional): Devices to serve. If
+            omitted, ``num_devices`` devices are built from ``device_kwargs``.
+        num_devices (int): Number of devices to create.
+        open_latency (float): Seconds ``open`` blocks, to mimic USB setup.
+        control_latency (float): Seconds each ``set_*`` call blocks, to mimic
+            USB control transfers.
+        device_kwargs: Passed to every created ``SimulatedDevice``.
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        devices: Optional[List[SimulatedDevice]] = None,
+        num_devices: int = 1,
+        open_latency: float = 0.0,
+        control_latency: float = 0.0,
+        **device_kwargs,
+    ):
+        if devices is None:
+            devices = [SimulatedDevice(seed=i, **device_kwargs) for i in range(num_devices)]
+        for index, device in enumerate(devices):
+            if device.serial is None:
+                device.serial = f"SIM{index:05d}"
+        self.devices = devices
+        self.open_latency = open_latency
+        self.control_latency = control_latency
+        self.control_transfers = 0  # set_* calls that reached the "hardware"
+        self._open = set()
+        self._lock = threading.Lock()
+
+    def get_device_count(self):
+        return len(self.devices)
+
+    def get_device_name(self, index):
+        return "Simulated RTL2832U"
+
+    def get_device_usb_strings(self, index):
+        if not 0 <= index < len(self.devices):
+            return ERROR_NO_DEVICE, "", "", ""
+        return RESULT_OK, "ddrtlsdr", "Simulated RTL-SDR", self.devices[index].serial
+
+    def open(self, index):
+        if not 0 <= index < len(self.devices):
+            return ERROR_NO_DEVICE, None
+        if self.open_latency:
+            time.sleep(self.open_latency)
+        device = self.devices[index]
+        with self._lock:
+            # Tracked by device rather than index, so tests can hotplug by
+            # editing ``devices`` while handles are open.
+            if device in self._open:
+                return ERROR_BUSY, None
+            self._open.add(device)
+        return RESULT_OK, device
+
+    def close(self, handle):
+        with self._lock:
+            self._open.discard(handle)
+
+    def _control_transfer(self):
+        with self._lock:
+            self.control_transfers += 1
+        if self.control_latency:
+            time.sleep(self.control_latency)
+
+    def set_center_freq(self, handle, freq_hz):
+        self._control_transfer()
+        handle.center_freq = freq_hz
+        return RESULT_OK
+
+    def get_center_freq(self, handle):
+        return handle.center_freq
+
+    def set_sample_rate(self, handle, rate_hz):
+        self._control_transfer()
+        handle.sample_rate = rate_hz
+        return RESULT_OK
+
+    def get_sample_rate(self, handle):
+        return handle.sample_rate
+
+    def set_tuner_gain(self, handle, gain):
+        self._control_transfer()
+        handle.gain = gain
+        return RESULT_OK
+
+    def get_tuner_gain(self, handle):
+        return handle.gain
+
+    def reset_buffer(self, handle):
+        handle.reset_buffer()
+        return RESULT_OK
+
+    def read_sync(self, handle, buffer, length):
+        address = buffer if isinstance(buffer, int) else ctypes.cast(buffer, ctypes.c_void_p).value
+        return RESULT_OK, handle.read_sync(address, length)
+
+    def read_async(self, handle, callback, context, num_buffers, buffer_size):
+        return handle.read_async(callback, context, num_buffers, buffer_size)
+
+    def cancel_async(self, handle):
+        handle.cancel_async()
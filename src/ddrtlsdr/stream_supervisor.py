@@ -0,0 +1,224 @@
+# src/ddrtlsdr/stream_supervisor.py
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from .iq_conversion import IQConverter
+from .models import SDRDevice
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.stream_supervisor")
+
+if TYPE_CHECKING:
+    from .device_control import SDRStream
+    from .group_capture import StartGate
+
+
+class StreamSpec:
+    """Everything needed to (re)create a device's ``SDRStream``."""
+
+    def __init__(
+        self,
+        callback: Callable[[Union[bytes, np.ndarray]], None],
+        buffer_size: int = 16 * 16384,
+        output_format: str = "bytes",
+        copy: bool = False,
+        ring_depth: Optional[int] = None,
+        converter: Optional[IQConverter] = None,
+        cpus: Optional[Iterable[int]] = None,
+        consumer_cpus: Optional[Iterable[int]] = None,
+        metadata: bool = False,
+        timeline_capacity: int = 4096,
+        start_gate: Optional["StartGate"] = None,
+    ):
+        self.callback = callback
+        self.buffer_size = buffer_size
+        self.output_format = output_format
+        self.copy = copy
+        self.ring_depth = ring_depth
+        self.converter = converter
+        self.cpus = cpus
+        self.consumer_cpus = consumer_cpus
+        self.metadata = metadata
+        self.timeline_capacity = timeline_capacity
+        # Already open by the time a restart reuses the spec, so restarts pass straight through.
+        self.start_gate = start_gate
+
+    def stream_kwargs(self) -> dict:
+        return {
+            "buffer_size": self.buffer_size,
+            "callback": self.callback,
+            "output_format": self.output_format,
+            "copy": self.copy,
+            "ring_depth": self.ring_depth,
+            "converter": self.converter,
+            "cpus": self.cpus,
+            "consumer_cpus": self.consumer_cpus,
+            "metadata": self.metadata,
+            "timeline_capacity": self.timeline_capacity,
+            "start_gate": self.start_gate,
+        }
+
+
+class StreamSupervisor:
+    """
+    Owns the async streams of every device.
+
+    All start/stop bookkeeping happens under one lock, so concurrent start and
+    stop calls cannot leave stale entries behind. A monitor thread samples
+    each stream's counters to report throughput and restarts streams whose
+    async read ended on its own (e.g. a dongle dropping off the bus).
+
+    Args:
+        stream_factory: Builds an unstarted ``SDRStream`` for a device and spec.
+        release: Called with the device after its stream is stopped or has
+            died, e.g. to close the handle.
+        poll_interval (float): Seconds between monitor passes.
+        max_restarts (int): Restarts allowed per device before giving up.
+    """
+
+    def __init__(
+        self,
+        stream_factory: Callable[[SDRDevice, StreamSpec], "SDRStream"],
+        release: Optional[Callable[[SDRDevice], None]] = None,
+        poll_interval: float = 0.5,
+        max_restarts: int = 5,
+    ):
+        self.stream_factory = stream_factory
+        self.release = release
+        self.poll_interval = poll_interval
+        self.max_restarts = max_restarts
+        self.streams: Dict[str, "SDRStream"] = {}
+        self._devices: Dict[str, SDRDevice] = {}
+        self._specs: Dict[str, StreamSpec] = {}
+        self._restarts: Dict[str, int] = {}
+        self._samples: Dict[str, tuple] = {}  # serial -> (time, blocks, bytes) at last pass
+        self._throughput: Dict[str, dict] = {}
+        self._lock = threading.RLock()
+        self._shutdown = threading.Event()
+        self._monitor = None
+
+    def start(self, device: SDRDevice, spec: StreamSpec) -> "SDRStream":
+        with self._lock:
+            stream = self.streams.get(device.serial)
+            if stream is not None:
+                logger.warning(f"Stream already running for device {device.serial}.")
+                return stream
+            stream = self._launch(device, spec)
+            self._devices[device.serial] = device
+            self._specs[device.serial] = spec
+            self._restarts[device.serial] = 0
+            self._ensure_monitor()
+        logger.info(f"Supervised stream started for device {device.serial}.")
+        return stream
+
+    def stop(self, device: SDRDevice) -> bool:
+        with self._lock:
+            stream = self.streams.pop(device.serial, None)
+            if stream is None:
+                logger.warning(f"No active stream for device {device.serial}.")
+                return False
+            self._forget(device.serial)
+            self._teardown(device, stream)
+        logger.info(f"Supervised stream stopped for device {device.serial}.")
+        return True
+
+    def stop_all(self):
+        with self._lock:
+            for device in list(self._devices.values()):
+                self.stop(device)
+
+    def shutdown(self):
+        """Stop every stream and the monitor thread."""
+        self.stop_all()
+        self._shutdown.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+
+    def throughput(self, device: Optional[SDRDevice] = None) -> dict:
+        """
+        Per-device throughput from the last monitor pass: samples/s,
+        callbacks/s, ring drops and restarts. Returns one device's entry if
+        ``device`` is given, otherwise a dict keyed by serial.
+        """
+        with self._lock:
+            if device is not None:
+                return dict(self._throughput.get(device.serial, {}))
+            return {serial: dict(entry) for serial, entry in self._throughput.items()}
+
+    def _launch(self, device: SDRDevice, spec: StreamSpec) -> "SDRStream":
+        stream = self.stream_factory(device, spec)
+        stream.start()
+        self.streams[device.serial] = stream
+        self._samples[device.serial] = (time.perf_counter(), 0, 0)
+        return stream
+
+    def _teardown(self, device: SDRDevice, stream: "SDRStream"):
+        try:
+            stream.stop()
+        finally:
+            if self.release is not None:
+                self.release(device)
+
+    def _forget(self, serial: str):
+        self._devices.pop(serial, None)
+        self._specs.pop(serial, None)
+        self._restarts.pop(serial, None)
+        self._samples.pop(serial, None)
+        self._throughput.pop(serial, None)
+
+    def _ensure_monitor(self):
+        if self._monitor is None or not self._monitor.is_alive():
+            self._shutdown.clear()
+            self._monitor = threading.Thread(target=self._monitor_loop, daemon=True)
+            self._monitor.start()
+
+    def _monitor_loop(self):
+        while not self._shutdown.wait(self.poll_interval):
+            with self._lock:
+                for serial in list(self.streams):
+                    self._sample(serial)
+                    if self.streams[serial].died:
+                        self._restart(serial)
+
+    def _sample(self, serial: str):
+        stream = self.streams[serial]
+        now = time.perf_counter()
+        last_time, last_blocks, last_bytes = self._samples[serial]
+        elapsed = now - last_time
+        if elapsed <= 0:
+            return
+        blocks, nbytes = stream.blocks_received, stream.bytes_received
+        self._samples[serial] = (now, blocks, nbytes)
+        self._throughput[serial] = {
+            "samples_per_s": (nbytes - last_bytes) / 2 / elapsed,
+            "callbacks_per_s": (blocks - last_blocks) / elapsed,
+            "drops": stream.stats().get("drops", 0),
+            "restarts": self._restarts[serial],
+            "alive": not stream.died,
+        }
+
+    def _restart(self, serial: str):
+        device = self._devices[serial]
+        stream = self.streams.pop(serial)
+        logger.warning(f"Stream for device {serial} died.")
+        self._teardown(device, stream)
+
+        if self._restarts[serial] >= self.max_restarts:
+            logger.error(f"Giving up on device {serial} after {self._restarts[serial]} restarts.")
+            self._forget(serial)
+            return
+        self._restarts[serial] += 1
+        try:
+            self._launch(device, self._specs[serial])
+            logger.info(f"Stream for device {serial} restarted ({self._restarts[serial]}/{self.max_restarts}).")
+        except Exception as e:
+            logger.error(f"Failed to restart stream for device {serial}: {e}")
+            self._forget(serial)
@@ -0,0 +1,305 @@
+# src/ddrtlsdr/sweep.py
+
+import datetime
+import logging
+import math
+import time
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .iq_conversion import IQConverter
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.sweep")
+
+SWEEP_FORMATS = ("csv", "binary")
+BINARY_MAGIC = b"DDPS"
+BINARY_VERSION = 1
+BINARY_HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("num_bins", "<u4"),
+    ("reserved", "<u4"),
+    ("start_hz", "<f8"),
+    ("bin_hz", "<f8"),
+])
+
+
+class SweepPlan:
+    """
+    How a band is covered: hop centers, FFT size and the bins kept per hop.
+
+    Each hop keeps the middle ``1 - crop`` of its spectrum, where the
+    anti-aliasing filter is flat, and hops are spaced so the kept slices
+    tile the band without gaps or overlap.
+
+    Args:
+        start_hz (float): Lower edge of the band.
+        stop_hz (float): Upper edge of the band.
+        bin_hz (float): Widest acceptable bin. The FFT size is the smallest
+            power of two that reaches it.
+        sample_rate (int): Sample rate the device sweeps at.
+        crop (float): Fraction of each hop's bins discarded at the edges.
+        frames (int): FFT frames averaged per hop.
+    """
+
+    def __init__(
+        self,
+        start_hz: float,
+        stop_hz: float,
+        bin_hz: float,
+        sample_rate: int = 2_400_000,
+        crop: float = 0.25,
+        frames: int = 16,
+    ):
+        if stop_hz <= start_hz:
+            raise ValueError(f"stop_hz ({stop_hz}) must be above start_hz ({start_hz})")
+        if not 0 <= crop < 1:
+            raise ValueError(f"crop must be in [0, 1), got {crop}")
+        if frames < 1:
+            raise ValueError(f"frames must be at least 1, got {frames}")
+        self.start_hz = start_hz
+        self.stop_hz = stop_hz
+        self.sample_rate = sample_rate
+        self.crop = crop
+        self.frames = frames
+        self.fft_size = 1 << max(1, math.ceil(math.log2(sample_rate / bin_hz)))
+        self.bin_hz = sample_rate / self.fft_size
+        self.keep = max(2, int(self.fft_size * (1 - crop)) // 2 * 2)  # Even, so the slice centers on DC
+        self.hop_hz = self.keep * self.bin_hz
+        num_hops = math.ceil((stop_hz - start_hz) / self.hop_hz)
+        self.centers = [round(start_hz + (hop + 0.5) * self.hop_hz) for hop in range(num_hops)]
+        self.num_bins = round((stop_hz - start_hz) / self.bin_hz)
+
+    @property
+    def dwell_samples(self) -> int:
+        return self.frames * self.fft_size
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        """Lower edge of every bin in the stitched spectrum."""
+        return self.start_hz + np.arange(self.num_bins) * self.bin_hz
+
+    def __len__(self) -> int:
+        return len(self.centers)
+
+
+class CsvSweepWriter:
+    """
+    Writes one rtl_power-compatible line per hop as soon as it is measured:
+    ``date, time, Hz low, Hz high, Hz step, samples, dB, dB, ...``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", buffering=1 << 20)
+
+    def write_hop(self, timestamp: float, low_hz: float, bin_hz: float, samples: int, power_db: np.ndarray):
+        when = datetime.datetime.fromtimestamp(timestamp)
+        high_hz = low_hz + bin_hz * power_db.shape[0]
+        values = ", ".join(map("{:.2f}".format, power_db.tolist()))
+        self._file.write(
+            f"{when:%Y-%m-%d}, {when:%H:%M:%S}, {low_hz:.0f}, {high_hz:.0f}, {bin_hz:.2f}, {samples}, {values}\n"
+        )
+
+    def write_sweep(self, timestamp: float, power_db: np.ndarray):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class BinarySweepWriter:
+    """
+    Compact sweep log: a header describing the frequency axis, then one
+    record per sweep of a float64 UNIX timestamp and float32 dB per bin.
+    Read it back with ``read_sweep_file``.
+    """
+
+    def __init__(self, path: str, plan: SweepPlan):
+        self.path = path
+        self._file = open(path, "wb")
+        header = np.zeros((), dtype=BINARY_HEADER)
+        header["magic"] = BINARY_MAGIC
+        header["version"] = BINARY_VERSION
+        header["num_bins"] = plan.num_bins
+        header["start_hz"] = plan.start_hz
+        header["bin_hz"] = plan.bin_hz
+        self._file.write(header.tobytes())
+        self._record = np.zeros((), dtype=_record_dtype(plan.num_bins))
+
+    def write_hop(self, timestamp: float, low_hz: float, bin_hz: float, samples: int, power_db: np.ndarray):
+        pass
+
+    def write_sweep(self, timestamp: float, power_db: np.ndarray):
+        self._record["timestamp"] = timestamp
+        self._record["power"] = power_db
+        self._file.write(self._record.tobytes())
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _record_dtype(num_bins: int) -> np.dtype:
+    return np.dtype([("timestamp", "<f8"), ("power", "<f4", (num_bins,))])
+
+
+def read_sweep_file(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load a ``BinarySweepWriter`` file.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Bin frequencies in Hz,
+        sweep timestamps, and a ``(sweeps, bins)`` float32 array of dB. The
+        last is memory-mapped, so large logs load instantly.
+
+    Raises:
+        ValueError: If the file is not a sweep log.
+    """
+    header = np.fromfile(path, dtype=BINARY_HEADER, count=1)
+    if header.shape[0] != 1 or header["magic"][0] != BINARY_MAGIC:
+        raise ValueError(f"{path} is not a sweep file")
+    if header["version"][0] != BINARY_VERSION:
+        raise ValueError(f"Unsupported sweep file version {header['version'][0]}")
+    num_bins = int(header["num_bins"][0])
+    records = np.memmap(path, dtype=_record_dtype(num_bins), mode="r", offset=BINARY_HEADER.itemsize)
+    freqs = header["start_hz"][0] + np.arange(num_bins) * header["bin_hz"][0]
+    return freqs, records["timestamp"], records["power"]
+
+
+def _window(name: str, size: int) -> np.ndarray:
+    windows = {"hann": np.hanning, "hamming": np.hamming, "blackman": np.blackman, "boxcar": np.ones}
+    if name not in windows:
+        raise ValueError(f"Unsupported window: {name}")
+    return windows[name](size).astype(np.float32)
+
+
+class PowerSweep:
+    """
+    rtl_power-style power spectrum sweep, fed by a ``FrequencyScanner``.
+
+    Each hop's dwell is gathered into one buffer and processed in a single
+    pass: a table-lookup conversion to complex64, the window applied to all
+    ``plan.frames`` frames at once, one batched FFT, and the mean power over
+    frames. The middle of the shifted spectrum is written into the stitched
+    sweep row; when the last hop of the plan completes the row is handed to
+    the writer and ``on_sweep``.
+
+    Power is in dBFS: a full-scale tone centered in a bin reads 0 dB.
+
+    Args:
+        plan (SweepPlan): Band layout.
+        writer: ``CsvSweepWriter``, ``BinarySweepWriter`` or anything with
+            ``write_hop``, ``write_sweep`` and ``close``.
+        on_sweep (Callable[[float, np.ndarray], None], optional): Called with
+            the timestamp and stitched dB spectrum of every completed sweep.
+            The array is reused for the next sweep.
+        window (str): ``"hann"``, ``"hamming"``, ``"blackman"`` or ``"boxcar"``.
+    """
+
+    def __init__(
+        self,
+        plan: SweepPlan,
+        writer=None,
+        on_sweep: Optional[Callable[[float, np.ndarray], None]] = None,
+        window: str = "hann",
+    ):
+        self.plan = plan
+        self.writer = writer
+        self.on_sweep = on_sweep
+        self.window = _window(window, plan.fft_size)
+        # Applied to the float32 view of the frames, so one weight per re and im.
+        self._window_parts = np.repeat(self.window, 2)
+        # Averaging over frames and dividing by sum(w)^2 puts a full-scale
+        # tone's peak at 1.0 (0 dBFS).
+        self._scale = np.float32(1.0 / (plan.frames * self.window.sum() ** 2))
+        self._converter = IQConverter()
+        self._raw = np.empty(2 * plan.dwell_samples, dtype=np.uint8)
+        self._iq = np.empty((plan.frames, plan.fft_size), dtype=np.complex64)
+        self._parts = np.empty(2 * plan.fft_size, dtype=np.float32)
+        self._power = np.empty(plan.fft_size, dtype=np.float32)
+        self._hop_power = np.empty(plan.keep, dtype=np.float32)
+        self._linear = np.zeros(plan.num_bins, dtype=np.float32)
+        self._db = np.empty(plan.num_bins, dtype=np.float32)
+        self._hop_index = {center: hop for hop, center in enumerate(plan.centers)}
+        self._filled = 0
+        self._done_hops = 0
+        self.scanner = None  # The FrequencyScanner feeding this sweep, once started
+        self.sweeps = 0
+        self.sweep_seconds = 0.0  # Wall seconds summed over completed sweeps
+        self.cpu_seconds = 0.0  # Thread CPU spent turning samples into spectra
+        self._sweep_started = None
+
+    def __call__(self, freq: int, samples: np.ndarray):
+        """``FrequencyScanner`` callback: gather the hop's samples."""
+        if self._sweep_started is None:
+            self._sweep_started = time.perf_counter()
+        n = min(samples.shape[0], self._raw.shape[0] - self._filled)
+        self._raw[self._filled:self._filled + n] = samples[:n]
+        self._filled += n
+
+    def hop_complete(self, freq: int):
+        """``FrequencyScanner`` ``on_dwell_complete`` hook: measure the hop."""
+        started = time.thread_time()
+        plan = self.plan
+        hop = self._hop_index[freq]
+        self._filled = 0
+        iq = self._converter.convert(self._raw.reshape(plan.frames, -1), out=self._iq)
+        iq -= iq.mean()  # The dongle's DC offset would otherwise swamp the center bins
+        # Real-by-complex multiplies are cheaper on the interleaved float view.
+        frames = iq.view(np.float32)
+        frames *= self._window_parts
+        spectrum = np.fft.fft(iq, axis=-1)
+        # |X|^2 in place on the float view: square, sum over frames (a
+        # contiguous reduction), then add each bin's re and im.
+        parts = spectrum.view(np.float32)
+        np.square(parts, out=parts)
+        np.add.reduce(parts, axis=0, out=self._parts)
+        np.add(self._parts[0::2], self._parts[1::2], out=self._power)
+        self._power *= self._scale
+        # fftshift and crop in one step: the kept bins straddle DC.
+        half = plan.keep // 2
+        self._hop_power[:half] = self._power[plan.fft_size - half:]
+        self._hop_power[half:] = self._power[:half]
+        first = hop * plan.keep
+        count = min(plan.keep, plan.num_bins - first)  # The last hop may overhang stop_hz
+        self._linear[first:first + count] = self._hop_power[:count]
+        now = time.time()
+        if self.writer is not None:
+            hop_db = 10 * np.log10(np.maximum(self._hop_power[:count], np.float32(1e-20)))
+            self.writer.write_hop(now, plan.start_hz + first * plan.bin_hz, plan.bin_hz, plan.dwell_samples, hop_db)
+        self._done_hops += 1
+        if self._done_hops == len(plan):
+            self._finish_sweep(now)
+        self.cpu_seconds += time.thread_time() - started
+
+    def _finish_sweep(self, timestamp: float):
+        np.log10(np.maximum(self._linear, np.float32(1e-20)), out=self._db)
+        self._db *= 10
+        self._done_hops = 0
+        self.sweeps += 1
+        now = time.perf_counter()
+        self.sweep_seconds += now - self._sweep_started
+        self._sweep_started = now
+        if self.writer is not None:
+            self.writer.write_sweep(timestamp, self._db)
+        if self.on_sweep is not None:
+            self.on_sweep(timestamp, self._db)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def stats(self) -> dict:
+        """Sweep count, mean sweep-cycle time and CPU seconds per sweep."""
+        return {
+            "sweeps": self.sweeps,
+            "hops_per_sweep": len(self.plan),
+            "bins": self.plan.num_bins,
+            "sweep_seconds": self.sweep_seconds / self.sweeps if self.sweeps else None,
+            "cpu_seconds_per_sweep": self.cpu_seconds / self.sweeps if self.sweeps else None,
+        }
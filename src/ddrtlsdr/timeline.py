@@ -0,0 +1,266 @@
+# src/ddrtlsdr/timeline.py
+
+import logging
+import struct
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.timeline")
+
+BLOCK_METADATA_DTYPE = np.dtype([
+    ("seq", "<i8"),  # Block number since the stream started
+    ("sample_index", "<i8"),  # Samples delivered before this block
+    ("num_samples", "<i4"),
+    ("host_time", "<f8"),  # time.perf_counter() when the block arrived
+    ("sample_time", "<f8"),  # Estimated capture time of the block's first sample, same clock
+    ("lost_samples", "<i8"),  # Estimated samples missing right before this block
+    ("lost_total", "<i8"),  # Estimated samples missing before this block since the stream started
+    ("dropped", "?"),  # Received, but discarded by a full ring buffer
+])
+_ROW = struct.Struct("<qqiddqq?")  # Same layout, for writing a row in one call
+
+FIT_WINDOW = 1024  # Blocks; the fit forgets older arrivals with this time constant
+WARMUP_BLOCKS = 16  # Blocks fitted before the fitted slope replaces the nominal one
+GAP_THRESHOLD_BLOCKS = 1.5  # Lateness, in block durations, that makes a block suspect
+CONFIRM_BLOCKS = 8  # Suspect blocks in a row that confirm a gap rather than a stall
+
+
+class BlockTimeline:
+    """
+    Arrival times and sample-clock estimates for every block of a stream.
+
+    One row of ``BLOCK_METADATA_DTYPE`` per block goes into a preallocated
+    ring of ``capacity`` rows. The sample clock is estimated with a running
+    least-squares fit of arrival time against sample position, which
+    forgets old blocks exponentially so it follows crystal drift; until
+    ``WARMUP_BLOCKS`` blocks are in, the slope is the nominal sample rate.
+    Arrival latency cannot be observed from the host, so ``sample_time``
+    includes the mean USB and scheduling latency as a constant offset.
+
+    A block arriving more than ``GAP_THRESHOLD_BLOCKS`` block durations
+    later than the fit predicts is suspect. If the following blocks catch
+    up, the host was only stalled. If they are still late after
+    ``CONFIRM_BLOCKS`` blocks, samples were lost: the first suspect block
+    gets ``lost_samples``, a whole number of transfers, and the sample
+    clock moves on by that amount. A row's ``lost_total`` counts the losses
+    up to its block, so ``sample_index + lost_total`` is the block's
+    position on the sample clock; the suspect blocks' rows are updated
+    when their gap is confirmed.
+
+    Like ``SampleRingBuffer``, the timeline has a single writer (the
+    librtlsdr callback thread) and takes no lock; readers copy rows and
+    discard any that were overwritten while they copied.
+
+    Args:
+        sample_rate (float): Configured sample rate in Hz.
+        capacity (int): Rows kept; older blocks are overwritten.
+    """
+
+    def __init__(self, sample_rate: float, capacity: int = 4096):
+        if capacity < 1:
+            raise ValueError("Timeline capacity must be at least 1")
+        self.capacity = capacity
+        self.rows = np.zeros(capacity, dtype=BLOCK_METADATA_DTYPE)
+        self._buffer = memoryview(self.rows.view(np.uint8))
+        # Add to host_time / sample_time to get Unix time.
+        self.wall_offset = time.time() - time.perf_counter()
+        self.sample_rate = sample_rate
+        self._new_rate = None  # Set by reset(), applied by the writer
+
+        # Counters
+        self.seq = 0  # Blocks recorded
+        self.samples_delivered = 0
+        self.clock_samples = 0  # samples_delivered plus estimated losses
+        self.lost_samples = 0
+        self.gaps = 0
+        self.dropped = 0
+        self._restart_fit()
+
+    def reset(self, sample_rate: float):
+        """
+        Start a new fit at a new sample rate, from the next block on. Safe to
+        call from any thread; rows and counters are kept.
+        """
+        self._new_rate = sample_rate
+
+    def _restart_fit(self):
+        # Weighted sums of (x, y) = (sample-clock seconds, arrival) around
+        # the last fitted point, re-centered each block for precision.
+        self._fitted = 0
+        self._origin_x = self._origin_y = 0.0
+        self._w = self._x = self._y = self._xx = self._xy = 0.0
+        self._spread = 0.0  # Smoothed absolute residual, in seconds
+        self._suspect: List[int] = []  # Sequence numbers of suspect blocks
+        self._suspect_residual = 0.0
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    @property
+    def drift_ppm(self) -> Optional[float]:
+        """Sample clock error against the host clock, once the fit has warmed up."""
+        if self._fitted < WARMUP_BLOCKS:
+            return None
+        return (self._slope() - 1.0) * 1e6
+
+    def _slope(self) -> float:
+        if self._fitted < WARMUP_BLOCKS:
+            return 1.0
+        denominator = self._w * self._xx - self._x * self._x
+        if denominator <= 0:
+            return 1.0
+        return (self._w * self._xy - self._x * self._y) / denominator
+
+    def _predict(self, x: float, slope: float) -> float:
+        # x is in sample-clock seconds; returns the fitted arrival time.
+        return self._origin_y + (self._y - slope * self._x) / self._w + slope * (x - self._origin_x)
+
+    def _fit(self, x: float, y: float):
+        if not self._fitted:
+            self._origin_x, self._origin_y = x, y
+        # Move the origin to this point, then decay and add it (at 0, 0).
+        decay = 1.0 - 1.0 / FIT_WINDOW
+        dx, dy = x - self._origin_x, y - self._origin_y
+        w, sx, sy = self._w, self._x, self._y
+        self._xx = decay * (self._xx - 2 * dx * sx + w * dx * dx)
+        self._xy = decay * (self._xy - dx * sy - dy * sx + w * dx * dy)
+        self._x = decay * (sx - w * dx)
+        self._y = decay * (sy - w * dy)
+        self._w = decay * w + 1.0
+        self._origin_x, self._origin_y = x, y
+        self._fitted += 1
+
+    def record(self, now: float, num_samples: int) -> int:
+        """
+        Add a block that arrived at ``now`` (``time.perf_counter()``).
+        Called from the stream thread. Returns its sequence number.
+        """
+        if self._new_rate is not None:
+            self.sample_rate, self._new_rate = self._new_rate, None
+            self._restart_fit()
+        seq = self.seq
+        rate = self.sample_rate
+        duration = num_samples / rate
+        start = self.clock_samples / rate
+
+        if self._fitted:
+            slope = self._slope()
+            residual = now - self._predict(start + duration, slope)
+            if self._fitted < WARMUP_BLOCKS and residual < -duration / 2:
+                # Far ahead of the fit right after start: the first blocks
+                # were stale data draining from the dongle's FIFO, or were
+                # delayed. Fit from the steady cadence instead.
+                self._restart_fit()
+
+        if self._fitted:
+            if residual > GAP_THRESHOLD_BLOCKS * duration + 4 * self._spread:
+                if not self._suspect:
+                    self._suspect_residual = residual
+                self._suspect.append(seq)
+                self._suspect_residual = min(self._suspect_residual, residual)
+                if len(self._suspect) >= CONFIRM_BLOCKS:
+                    self._confirm_gap(num_samples)
+                    start = self.clock_samples / rate
+                    self._fit(start + duration, now)
+            else:
+                if self._suspect:
+                    self._fit_rows(self._suspect)  # They caught up: a stall, nothing lost
+                    self._suspect = []
+                self._spread += (abs(residual) - self._spread) / 64
+                self._fit(start + duration, now)
+            # The fit maps a block's last sample to its arrival; its first
+            # sample is one block duration earlier on the same line.
+            slope = self._slope()
+            sample_time = self._predict(start, slope)
+        else:
+            self._fit(start + duration, now)
+            sample_time = now - duration
+
+        _ROW.pack_into(self._buffer, (seq % self.capacity) * _ROW.size,
+                       seq, self.samples_delivered, num_samples, now, sample_time, 0, self.lost_samples, False)
+        self.samples_delivered += num_samples
+        self.clock_samples += num_samples
+        self.seq = seq + 1
+        return seq
+
+    def _fit_rows(self, seqs: List[int]):
+        # Suspect blocks were held out of the fit; add them at their
+        # position on the (possibly corrected) sample clock.
+        offset = self.clock_samples - self.samples_delivered
+        for seq in seqs:
+            row = self.rows[seq % self.capacity]
+            end = int(row["sample_index"]) + int(row["num_samples"]) + offset
+            self._fit(end / self.sample_rate, float(row["host_time"]))
+
+    def _confirm_gap(self, num_samples: int):
+        # The current block is the last suspect and has no row yet;
+        # CONFIRM_BLOCKS > 1, so the first suspect always has one.
+        earlier = self._suspect[:-1]
+        first = self._suspect[0]
+        blocks = max(1, round(self._suspect_residual * self.sample_rate / num_samples))
+        lost = blocks * num_samples
+        self.clock_samples += lost
+        self.lost_samples += lost
+        self.gaps += 1
+        self._suspect = []
+        logger.warning(f"Stream gap before block {first}: about {lost} samples lost.")
+
+        self._fit_rows(earlier)
+        offset = self.clock_samples - self.samples_delivered
+        slope = self._slope()
+        for seq in earlier:
+            row = self.rows[seq % self.capacity]
+            row["sample_time"] = self._predict((int(row["sample_index"]) + offset) / self.sample_rate, slope)
+            row["lost_total"] = self.lost_samples
+        self.rows[first % self.capacity]["lost_samples"] = lost
+
+    def mark_dropped(self, seq: int):
+        """Flag a block the ring buffer had to discard. Called from the stream thread."""
+        if self.seq - seq <= self.capacity:
+            self.rows[seq % self.capacity]["dropped"] = True
+            self.dropped += 1
+
+    def row(self, seq: int) -> Optional[np.void]:
+        """A copy of one block's row, or None if it has been overwritten."""
+        if seq < 0 or seq >= self.seq:
+            return None
+        row = self.rows[seq % self.capacity].copy()
+        return row if row["seq"] == seq else None
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None) -> np.ndarray:
+        """
+        Rows still held, oldest first, optionally limited to blocks that
+        arrived in ``[since, until)`` (``time.perf_counter()`` seconds).
+        """
+        end = self.seq
+        first = max(end - self.capacity, 0)
+        expected = np.arange(first, end)
+        rows = self.rows[expected % self.capacity]
+        rows = rows[rows["seq"] == expected]  # Drop rows overwritten while copying
+        if since is not None:
+            rows = rows[rows["host_time"] >= since]
+        if until is not None:
+            rows = rows[rows["host_time"] < until]
+        return rows
+
+    def gap_rows(self) -> np.ndarray:
+        """Rows of blocks preceded by lost samples or discarded by the ring."""
+        rows = self.query()
+        return rows[(rows["lost_samples"] > 0) | rows["dropped"]]
+
+    def stats(self) -> dict:
+        return {
+            "blocks": self.seq,
+            "samples_delivered": self.samples_delivered,
+            "lost_samples": self.lost_samples,
+            "gaps": self.gaps,
+            "dropped_blocks": self.dropped,
+            "drift_ppm": self.drift_ppm,
+            "arrival_spread_s": self._spread,
+        }
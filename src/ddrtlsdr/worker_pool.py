@@ -0,0 +1,201 @@
+# src/ddrtlsdr/worker_pool.py
+
+import heapq
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from .logging_config import setup_logging
+
+# Initialize centralized logging
+setup_logging()
+logger = logging.getLogger("ddrtlsdr.worker_pool")
+
+_EXITED = -1  # Result sequence number a worker sends as it shuts down
+
+
+def _worker_main(shm_name: str, num_slots: int, slot_size: int, func: Callable, tasks, results):
+    """
+    Worker process loop: map the slot memory once, then run ``func`` on the
+    slot named by each task and send back only the result.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    slots = np.ndarray((num_slots, slot_size), dtype=np.uint8, buffer=shm.buf)
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            seq, slot, length = task
+            try:
+                results.put((seq, slot, True, func(slots[slot, :length])))
+            except Exception as e:
+                results.put((seq, slot, False, f"{type(e).__name__}: {e}"))
+    finally:
+        del slots
+        shm.close()
+        results.put((_EXITED, -1, True, None))
+
+
+class DSPWorkerPool:
+    """
+    Stream callback that hands IQ blocks to worker processes, so DSP for
+    several dongles is not serialized on one GIL.
+
+    Blocks are copied into a ring of slots in one ``SharedMemory`` segment;
+    only ``(sequence, slot, length)`` goes through the task queue, and each
+    worker reads the slot in place. ``func(block)`` runs in a worker on a
+    uint8 view of the slot and should return something small (a spectrum,
+    audio samples, a detection): its return value is pickled back through
+    the result queue. A collector thread frees the slot and passes results
+    to ``on_result(seq, result)`` in stream order.
+
+    Each block is processed independently, possibly by a different worker
+    than its neighbours, so ``func`` cannot keep filter state across blocks.
+    When every slot is in flight the incoming block is dropped rather than
+    blocking the USB transfer loop.
+
+    Args:
+        func: Picklable (module-level) function of one uint8 block.
+        on_result (callable, optional): Receives ``(seq, result)`` on the
+            collector thread.
+        num_workers (int, optional): Worker processes. Defaults to the CPU count.
+        num_slots (int): Blocks that can be queued or in flight at once.
+        slot_size (int): Largest block in bytes.
+        start_method (str): ``multiprocessing`` start method. ``"spawn"``
+            by default, as forking a process that runs librtlsdr threads
+            is unsafe.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[np.ndarray], Any],
+        on_result: Optional[Callable[[int, Any], None]] = None,
+        num_workers: Optional[int] = None,
+        num_slots: int = 64,
+        slot_size: int = 16 * 16384,
+        start_method: str = "spawn",
+    ):
+        if num_slots < 1:
+            raise ValueError("num_slots must be at least 1")
+        if slot_size < 1:
+            raise ValueError("slot_size must be at least 1")
+        self.func = func
+        self.on_result = on_result
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.num_slots = num_slots
+        self.slot_size = slot_size
+        self.blocks_in = 0
+        self.blocks_done = 0
+        self.drops = 0
+        self.errors = 0
+        self.closed = False
+
+        self._shm = shared_memory.SharedMemory(create=True, size=num_slots * slot_size)
+        self._slots = np.ndarray((num_slots, slot_size), dtype=np.uint8, buffer=self._shm.buf)
+        self._free = deque(range(num_slots))  # Appended by the collector, popped by the producer
+        self._seq = 0
+        self._pending = []  # Heap of results that arrived ahead of an earlier block
+        self._next_seq = 0
+
+        context = multiprocessing.get_context(start_method)
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        self._workers = [
+            context.Process(
+                target=_worker_main,
+                args=(self._shm.name, num_slots, slot_size, func, self._tasks, self._results),
+                daemon=True,
+                name=f"ddrtlsdr-dsp-{i}",
+            )
+            for i in range(self.num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        logger.info(f"DSP worker pool started: {self.num_workers} workers, {num_slots} slots of {slot_size} bytes.")
+
+    @property
+    def in_flight(self) -> int:
+        return self.num_slots - len(self._free)
+
+    def __call__(self, data: Union[bytes, np.ndarray]):
+        if self.closed:
+            return
+        block = np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else data
+        length = block.shape[0]
+        if length > self.slot_size:
+            self.drops += 1
+            logger.warning(f"Dropped block of {length} bytes; slot size is {self.slot_size}.")
+            return
+        try:
+            slot = self._free.popleft()
+        except IndexError:
+            self.drops += 1
+            return
+        self._slots[slot, :length] = block
+        self._tasks.put((self._seq, slot, length))
+        self._seq += 1
+        self.blocks_in += 1
+
+    def _collect(self):
+        exited = 0
+        while exited < self.num_workers:
+            seq, slot, ok, result = self._results.get()
+            if seq == _EXITED:
+                exited += 1
+                continue
+            self._free.append(slot)
+            if not ok:
+                self.errors += 1
+                logger.error(f"DSP worker failed on block {seq}: {result}")
+            heapq.heappush(self._pending, (seq, ok, result))
+            while self._pending and self._pending[0][0] == self._next_seq:
+                seq, ok, result = heapq.heappop(self._pending)
+                self._next_seq += 1
+                self.blocks_done += 1
+                if ok and self.on_result is not None:
+                    try:
+                        self.on_result(seq, result)
+                    except Exception as e:
+                        logger.error(f"DSP result callback failed: {e}")
+
+    def close(self, timeout: float = 5.0):
+        """
+        Stop accepting blocks, let the workers finish the queued ones, then
+        shut them down and free the shared memory.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        for _ in self._workers:
+            self._tasks.put(None)
+        self._collector.join(timeout)
+        for worker in self._workers:
+            worker.join(timeout)
+            if worker.is_alive():
+                logger.warning(f"DSP worker {worker.name} did not exit; terminating it.")
+                worker.terminate()
+        self._tasks.close()
+        self._results.close()
+        del self._slots
+        self._shm.close()
+        self._shm.unlink()
+        logger.info(f"DSP worker pool closed after {self.blocks_done} blocks ({self.drops} dropped).")
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.num_workers,
+            "blocks_in": self.blocks_in,
+            "blocks_done": self.blocks_done,
+            "in_flight": self.in_flight,
+            "drops": self.drops,
+            "errors": self.errors,
+        }
@@ -0,0 +1,8 @@
+# tests/conftest.py
+
+import os
+import tempfile
+
+# Set before any package module is imported (each one configures logging on
+# import), so test runs log to a scratch directory instead of src/ddrtlsdr/logs/.
+os.environ.setdefault("DDRTLSDR_LOG_DIR", tempfile.mkdtemp(prefix="ddrtlsdr-test-logs-"))
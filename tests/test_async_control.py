@@ -0,0 +1,71 @@
+# tests/test_async_control.py
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.async_control import AsyncDeviceControl
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=2, sample_rate=1_000_000, open_latency=0.05)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+@pytest.fixture
+def control(backend, tmp_path):
+    return AsyncDeviceControl(DeviceControl(config_file=str(tmp_path / "config.json")))
+
+def test_concurrent_requests_use_one_thread_per_device(control):
+    devices = control.list_devices()
+    threads_by_device = {device.serial: set() for device in devices}
+    original = control.control.set_gain
+
+    def recording_set_gain(device, gain):
+        threads_by_device[device.serial].add(threading.get_ident())
+        original(device, gain)
+
+    control.control.set_gain = recording_set_gain
+
+    async def run():
+        await asyncio.gather(*(control.set_gain(devices[i % 2], i) for i in range(200)))
+        return [await control.get_gain(device) for device in devices]
+
+    gains = asyncio.run(run())
+    assert gains == [198, 199]  # Per-device calls run in submission order
+    assert all(len(threads) == 1 for threads in threads_by_device.values())
+    assert threads_by_device[devices[0].serial] != threads_by_device[devices[1].serial]
+
+def test_iq_blocks_yields_arrays(control):
+    device = control.list_devices()[0]
+
+    async def run():
+        blocks = []
+        async for block in control.iq_blocks(device, decimation=4):
+            blocks.append(block)
+            if len(blocks) == 3:
+                break
+        await asyncio.sleep(0.2)  # Let the idle broadcast shut down
+        return blocks
+
+    blocks = asyncio.run(run())
+    assert all(block.dtype == np.complex64 and block.shape[0] == 16 * 16384 // 2 // 4 for block in blocks)
+    assert control.control.streams == {}
+
+def test_read_samples_returns_owned_array(control):
+    device = control.list_devices()[1]
+
+    async def run():
+        first = await control.read_samples(device, 1024)
+        second = await control.read_samples(device, 1024)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.shape[0] == 2048
+    assert not np.shares_memory(first, second)
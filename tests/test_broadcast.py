@@ -0,0 +1,116 @@
+# tests/test_broadcast.py
+
+import asyncio
+import importlib
+import threading
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from src.ddrtlsdr.async_control import AsyncDeviceControl
+from src.ddrtlsdr.broadcast import IQBroadcaster
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.models import SDRConfig
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1, sample_rate=1_000_000)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+@pytest.fixture
+def client(backend, tmp_path):
+    # The API builds its DeviceControl at import; keep it away from the package config.
+    with patch.object(SDRConfig, "save"):
+        api = importlib.import_module("src.ddrtlsdr.api")
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    with patch.object(api, "device_control", control), \
+         patch.object(api, "async_control", AsyncDeviceControl(control)):
+        yield TestClient(api.app), control
+
+def feed(broadcaster, blocks, block_size=4096, delay=0.0):
+    block = (np.arange(block_size) % 256).astype(np.uint8)
+    for _ in range(blocks):
+        broadcaster(block)
+        time.sleep(delay)
+
+def test_fan_out_shares_encoding_per_group():
+    async def run():
+        broadcaster = IQBroadcaster()
+        raw = broadcaster.subscribe()
+        also_raw = broadcaster.subscribe()
+        decimated = broadcaster.subscribe(decimation=4, output_format="cf32")
+        await asyncio.get_running_loop().run_in_executor(None, feed, broadcaster, 3)
+        first = [await raw.get() for _ in range(3)]
+        second = [await also_raw.get() for _ in range(3)]
+        third = [await decimated.get() for _ in range(3)]
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert len(first[0]) == 4096
+    assert first[0] is second[0]  # Encoded once, shared by both clients
+    assert len(third[0]) == 4096 // 2 // 4 * 8  # 512 complex64 samples
+
+def test_slow_client_is_dropped_without_stalling_others():
+    async def run():
+        broadcaster = IQBroadcaster(max_queue=4)
+        fast = broadcaster.subscribe()
+        slow = broadcaster.subscribe()
+        received = 0
+        producer = threading.Thread(target=feed, args=(broadcaster, 20), kwargs={"delay": 0.002})
+        producer.start()
+        async for _ in fast:
+            received += 1
+            if received == 20:
+                break
+        producer.join()
+        blocks = [payload async for payload in slow]
+        return broadcaster, received, slow, blocks
+
+    broadcaster, received, slow, blocks = asyncio.run(run())
+    assert received == 20
+    assert slow.dropped
+    assert blocks == []  # Backlog discarded on disconnect
+    assert broadcaster.subscriber_count == 1
+    assert broadcaster.stats()["subscriptions_dropped"] == 1
+
+def test_websocket_streams_and_stops_device_when_idle(client):
+    client, control = client
+    with client.websocket_connect("/devices/SIM00000/iq?decimation=2&format=cf32") as ws:
+        payload = ws.receive_bytes()
+        assert len(payload) == 16 * 16384 // 2 // 2 * 8
+        assert "SIM00000" in control.streams
+    deadline = time.monotonic() + 2
+    while "SIM00000" in control.streams and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "SIM00000" not in control.streams
+
+def test_unknown_device_and_bad_format(client):
+    client, control = client
+    assert client.get("/devices/NOPE/iq").status_code == 404
+    assert client.get("/devices/SIM00000/iq?format=wav").status_code == 400
+    assert client.get("/devices/SIM00000/iq?decimation=0").status_code == 422
+    # A refused client leaves nothing streaming behind.
+    assert control.streams == {} and control.broadcasters == {}
+
+def test_bad_subscription_does_not_start_a_stream(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    loop = asyncio.new_event_loop()
+    try:
+        for kwargs in ({"output_format": "bogus"}, {"decimation": 0}):
+            with pytest.raises(ValueError):
+                control.subscribe_iq(device, loop, **kwargs)
+            assert control.streams == {} and control.broadcasters == {}
+        # The device is still free for other work.
+        control.start_stream(device, lambda data: None, buffer_size=16384, output_format="uint8")
+        assert device.serial in control.streams
+        control.stop_stream(device)
+    finally:
+        loop.close()
@@ -0,0 +1,105 @@
+# tests/test_channelizer.py
+
+import time
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.channelizer import Channelizer, design_lowpass
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+SAMPLE_RATE = 2_400_000
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1, sample_rate=SAMPLE_RATE, tone_offset_hz=200_000, noise_level=0.01)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def tones(n, *components):
+    t = np.arange(n)
+    return sum(a * np.exp(2j * np.pi * f / SAMPLE_RATE * t) for f, a in components).astype(np.complex64)
+
+def run(channelizer, signal, block_sizes):
+    position = 0
+    for size in block_sizes:
+        channelizer(signal[position:position + size])
+        position += size
+
+def test_lowpass_has_unity_dc_gain():
+    taps = design_lowpass(101, 0.1)
+    assert taps.sum() == pytest.approx(1.0)
+    assert np.allclose(taps, taps[::-1])
+
+def test_extracts_channels_in_one_pass():
+    signal = tones(480_000, (300_000, 0.5), (-500_000 + 1_000, 0.3), (-100_000, 0.4))
+    channelizer = Channelizer(SAMPLE_RATE)
+    received = {"a": [], "b": []}
+    channelizer.add_channel(300_000, 50, received["a"].append)
+    channelizer.add_channel(-500_000, 50, received["b"].append)
+    run(channelizer, signal, [16384] * 29 + [480_000 - 16384 * 29])
+
+    a = np.concatenate(received["a"])[50:]
+    b = np.concatenate(received["b"])[50:]
+    assert len(received["a"][0]) + sum(map(len, received["a"][1:])) == 480_000 // 50
+    assert np.allclose(np.abs(a), 0.5, atol=1e-3)  # Other tones rejected
+    # 1 kHz above the channel center at 48 kS/s: 1/48 cycle per output sample.
+    step = np.angle(b[1:] * np.conj(b[:-1]))
+    assert np.allclose(step, 2 * np.pi * 1_000 / 48_000, atol=1e-3)
+
+def test_output_does_not_depend_on_block_boundaries():
+    signal = tones(100_000, (250_000, 0.5), (-30_000, 0.2))
+
+    def channelize(block_sizes):
+        channelizer = Channelizer(SAMPLE_RATE)
+        out = []
+        channelizer.add_channel(250_000, 12, out.append)
+        run(channelizer, signal, block_sizes)
+        return np.concatenate(out)
+
+    whole = channelize([100_000])
+    ragged = channelize([7, 1000, 13, 5] + [4096] * 24)
+    ragged_total = 7 + 1000 + 13 + 5 + 4096 * 24
+    assert np.allclose(whole[:len(ragged)], ragged, atol=1e-5)
+    assert len(ragged) == -(-ragged_total // 12)
+
+def test_banks_each_filter_the_wideband_block():
+    signal = tones(262_144, (-300_000, 0.5), (100_000, 0.4))
+
+    def channelize(decimations):
+        channelizer = Channelizer(SAMPLE_RATE)
+        received = {offset: [] for offset in decimations}
+        for offset, decimation in decimations.items():
+            channelizer.add_channel(offset, decimation, received[offset].append)
+        run(channelizer, signal, [16384] * 16)
+        return {offset: np.concatenate(out) for offset, out in received.items()}
+
+    alone = channelize({-300_000: 20})[-300_000]
+    mixed = channelize({100_000: 10, -300_000: 20})
+    assert len(alone) == 262_144 // 20 + 1
+    assert np.array_equal(mixed[-300_000], alone)
+    assert np.allclose(np.abs(alone[50:]), 0.5, atol=1e-3)
+    assert len(mixed[100_000]) == 262_144 // 10 + 1
+    assert np.allclose(np.abs(mixed[100_000][50:]), 0.4, atol=1e-3)
+
+def test_channels_share_one_device_stream(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    tone, empty = [], []
+    first = control.subscribe_channel(device, 200_000, 24, tone.append)
+    second = control.subscribe_channel(device, -600_000, 24, empty.append)
+    assert len(control.streams) == 1
+    deadline = time.monotonic() + 2
+    while sum(map(len, tone)) < 4000 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    control.unsubscribe_channel(device, first)
+    assert device.serial in control.streams
+    control.unsubscribe_channel(device, second)
+    assert device.serial not in control.streams
+
+    level = np.abs(np.concatenate(tone)[500:]).mean()
+    assert level == pytest.approx(0.5, abs=0.05)
+    assert np.abs(np.concatenate(empty)[500:]).mean() < 0.05
@@ -0,0 +1,205 @@
+# tests/test_command_queue.py
+
+import threading
+import time
+
+import pytest
+
+from src.ddrtlsdr.command_queue import DeviceCommandQueue
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def test_skips_sets_that_match_the_applied_value():
+    applied = []
+    queue = DeviceCommandQueue(lambda param, value: applied.append((param, value)))
+    queue.submit("gain", 100)
+    queue.submit("gain", 100)
+    queue.submit("gain", 100, force=True)
+    queue.submit("center_freq", 100)
+    assert applied == [("gain", 100), ("gain", 100), ("center_freq", 100)]
+    assert queue.stats()["skipped"] == 1
+
+def test_set_back_to_the_applied_value_while_another_is_in_flight():
+    applied = []
+    applying = threading.Event()
+    release = threading.Event()
+
+    def blocking_apply(param, value):
+        applied.append(value)
+        if value == 20:
+            applying.set()
+            release.wait()
+
+    queue = DeviceCommandQueue(blocking_apply)
+    queue.submit("gain", 10)
+    moving = threading.Thread(target=queue.submit, args=("gain", 20))
+    moving.start()
+    applying.wait()
+    # 10 is still the applied value, but 20 is on its way to the device.
+    back = threading.Thread(target=queue.submit, args=("gain", 10))
+    back.start()
+    time.sleep(0.05)
+    release.set()
+    moving.join()
+    back.join()
+
+    assert applied == [10, 20, 10]
+    assert queue.values["gain"] == 10
+    assert queue.stats()["skipped"] == 0
+
+def test_burst_collapses_to_latest_value():
+    applied = []
+    release = threading.Event()
+
+    def slow_apply(param, value):
+        applied.append(value)
+        release.wait()
+
+    queue = DeviceCommandQueue(slow_apply)
+    leader = threading.Thread(target=queue.submit, args=("gain", 0))
+    leader.start()
+    while not applied:
+        time.sleep(0.001)
+    # The leader holds the device; everything below queues behind it.
+    followers = [threading.Thread(target=queue.submit, args=("gain", value)) for value in range(1, 21)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert applied[0] == 0
+    assert len(applied) == 2
+    assert queue.values["gain"] == applied[-1]
+    stats = queue.stats()
+    assert stats["submitted"] == 21
+    assert stats["coalesced"] == 19
+
+def test_failed_set_forgets_the_value():
+    def apply(param, value):
+        if value < 0:
+            raise ValueError("bad gain")
+
+    queue = DeviceCommandQueue(apply)
+    queue.submit("gain", 10)
+    with pytest.raises(ValueError):
+        queue.submit("gain", -1)
+    assert "gain" not in queue.values
+    queue.submit("gain", 10)  # Not skipped: the device state is unknown
+    assert queue.stats() == {"submitted": 3, "applied": 2, "coalesced": 0, "skipped": 0, "failed": 1}
+
+def test_followers_see_the_failure_of_their_value():
+    started = threading.Event()
+    release = threading.Event()
+
+    def apply(param, value):
+        started.set()
+        release.wait()
+        if value < 0:
+            raise IOError("transfer failed")
+
+    queue = DeviceCommandQueue(apply)
+    errors = []
+
+    def submit(value):
+        try:
+            queue.submit("gain", value)
+        except IOError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=submit, args=(0,))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=submit, args=(-value,)) for value in range(1, 4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+    assert len(errors) == 3  # One failed transfer, reported to every caller it covered
+    assert queue.stats()["failed"] == 1
+
+def test_caller_is_not_blamed_for_a_later_failure():
+    applying = {value: threading.Event() for value in (10, -1, 30)}
+    release = {10: threading.Event(), -1: threading.Event()}
+
+    def apply(param, value):
+        applying[value].set()
+        if value in release:
+            release[value].wait()
+        if value < 0:
+            raise IOError("transfer failed")
+
+    queue = DeviceCommandQueue(apply)
+    outcomes = {}
+
+    def submit(value):
+        try:
+            queue.submit("gain", value)
+            outcomes[value] = "applied"
+        except IOError:
+            outcomes[value] = "failed"
+
+    threads = {value: threading.Thread(target=submit, args=(value,)) for value in (10, -1, 30)}
+    # 10 is applied, -1 fails, then 30 is applied, all before the leader
+    # (who submitted 10) looks at its outcome.
+    threads[10].start()
+    applying[10].wait()
+    threads[-1].start()
+    time.sleep(0.05)
+    release[10].set()
+    applying[-1].wait()
+    threads[30].start()
+    time.sleep(0.05)
+    release[-1].set()
+    for thread in threads.values():
+        thread.join()
+    assert outcomes == {10: "applied", -1: "failed", 30: "applied"}
+    assert queue.stats() == {"submitted": 3, "applied": 2, "coalesced": 0, "skipped": 0, "failed": 1}
+
+def test_device_control_counts_and_resets_on_close(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    control.set_gain(device, 200)
+    control.set_gain(device, 200)
+    assert control.get_command_stats(device)["skipped"] == 1
+    assert control.get_gain(device) == 200
+
+    control.close_device_cached(device)
+    control.set_gain(device, 200)  # Reopened handle: applied again
+    assert control.get_command_stats(device)["applied"] == 2
+    assert backend.devices[0].gain == 200
+
+def test_device_info_is_served_from_the_state_cache(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    info = control.get_device_info(device)
+    assert not info["open"] and not control.is_device_open(device)  # Polling never opens a device
+    assert info["gain"] is None and info["state_age"] is None
+
+    control.set_center_frequency(device, 433_920_000)
+    control.set_sample_rate(device, 1_024_000)
+    control.set_gain(device, 300)
+    backend.devices[0].gain = 100  # Changed behind our back: the cache cannot know
+    info = control.get_device_info(device)
+    assert (info["center_frequency"], info["sample_rate"], info["gain"]) == (433_920_000, 1_024_000, 300)
+    assert info["open"] and info["state_age"] < 1
+
+    assert control.get_device_info(device, max_age=60)["gain"] == 300
+    assert control.get_device_info(device, max_age=0)["gain"] == 100
+    backend.devices[0].gain = 200
+    assert control.get_device_info(device, refresh=True)["gain"] == 200
+
+    control.close_device_cached(device)
+    info = control.get_device_info(device, max_age=0)
+    assert info["gain"] is None and not control.is_device_open(device)
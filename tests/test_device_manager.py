@@ -1,6 +1,11 @@
+import time
+
 import pytest
 from unittest.mock import patch, MagicMock
+from src.ddrtlsdr.device_control import DeviceControl
 from src.ddrtlsdr.device_manager import DeviceManager
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
 from src.ddrtlsdr.models import SDRDevice, SDRConfig
 
 @pytest.fixture
@@ -12,7 +17,7 @@ def mock_rtl():
             0,  # Success for first device
             0   # Success for second device
         ]
-        return mock_rtl_lib
+        yield mock_rtl_lib
 
 @pytest.fixture
 def device_manager(mock_rtl, tmp_path):
@@ -94,3 +99,68 @@ def test_verify_device_accessibility_failure(device_manager, mock_rtl):
     with patch('src.ddrtlsdr.device_manager.open_device', side_effect=IOError("Device locked")):
         accessible = device_manager.verify_device_accessibility(device)
         assert not accessible
+
+
+@pytest.fixture
+def sim_backend():
+    backend = SimulatedBackend(num_devices=3)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def test_enumeration_is_cached_and_saved_only_on_change(sim_backend, tmp_path):
+    manager = DeviceManager(config_file=str(tmp_path / "config.json"), inventory_ttl=60)
+    with patch.object(manager, "save_config", wraps=manager.save_config) as mock_save, \
+         patch.object(manager, "_scan", wraps=manager._scan) as mock_scan:
+        assert len(manager.enumerate_devices()) == 3
+        manager.enumerate_devices()
+        assert mock_scan.call_count == 1
+        manager.enumerate_devices(force=True)
+        assert mock_scan.call_count == 2
+        assert mock_save.call_count == 1  # The second scan found nothing new
+
+def test_refresh_emits_hotplug_events(sim_backend, tmp_path):
+    manager = DeviceManager(config_file=str(tmp_path / "config.json"))
+    events = []
+    manager.add_listener(lambda event, device: events.append((event, device.serial)))
+    manager.refresh()
+    assert sorted(events) == [("added", "SIM00000"), ("added", "SIM00001"), ("added", "SIM00002")]
+
+    events.clear()
+    unplugged_config_entry = manager.get_device("SIM00000")
+    unplugged = sim_backend.devices.pop(0)
+    manager.refresh()
+    assert events == [("removed", "SIM00000")]
+    assert manager.present["SIM00001"].index == 0  # Indexes shift after an unplug
+    assert manager.get_device_by_index(0).serial == "SIM00001"
+    assert manager.get_device_by_index(2) is None
+    assert manager.get_device("SIM00000") is unplugged_config_entry
+
+    events.clear()
+    sim_backend.devices.append(unplugged)
+    manager.refresh()
+    assert events == [("added", "SIM00000")]
+    assert len(manager.config.devices) == 3
+
+def test_probes_run_in_parallel(sim_backend, tmp_path):
+    sim_backend.open_latency = 0.1
+    manager = DeviceManager(config_file=str(tmp_path / "config.json"))
+    manager.refresh()
+    start = time.perf_counter()
+    assert manager.probe_devices() == {"SIM00000": True, "SIM00001": True, "SIM00002": True}
+    assert time.perf_counter() - start < 0.25
+    assert manager.is_accessible(manager.present["SIM00001"])
+
+def test_device_control_startup_does_not_open_devices(sim_backend, tmp_path):
+    with patch.object(sim_backend, "open", wraps=sim_backend.open) as mock_open:
+        control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    assert len(control.list_devices()) == 3
+    mock_open.assert_not_called()
+
+def test_device_control_releases_unplugged_devices(sim_backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[2]
+    control.open_device_cached(device)
+    sim_backend.devices.pop()
+    control.manager.refresh()
+    assert not control.is_device_open(device)
@@ -0,0 +1,219 @@
+# tests/test_group_capture.py
+
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.group_capture import FILL_VALUE, StartGate, _AlignedMember, estimate_offsets, read_group_index
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+from src.ddrtlsdr.timeline import CONFIRM_BLOCKS, BlockTimeline
+
+RATE = 1_000_000
+OFFSETS = [0, 250, -400]
+
+@pytest.fixture
+def backend():
+    devices = [
+        SimulatedDevice(sample_rate=RATE, signal="noise", reference_level=0.3, sample_offset=offset, seed=i)
+        for i, offset in enumerate(OFFSETS)
+    ]
+    backend = SimulatedBackend(devices=devices, open_latency=0.1, control_latency=0.01)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def expected_offsets(backend, group):
+    # Reference index of each device's aligned sample 0, relative to the first.
+    starts = [device.reference_start + member.start_sample + device.sample_offset
+              for device, member in zip(backend.devices, group.members)]
+    return [start - starts[0] for start in starts]
+
+def test_estimate_offsets_integer_fractional_and_phase():
+    rng = np.random.default_rng(3)
+    length = 4096
+    reference = (rng.standard_normal(length + 200) + 1j * rng.standard_normal(length + 200)).astype(np.complex64)
+    signals = np.stack([
+        reference[100:100 + length],
+        reference[117:117 + length] * np.exp(0.7j),
+        reference[58:58 + length] + 0.3 * rng.standard_normal(length),
+    ])
+    result = estimate_offsets(signals, max_lag=128)
+    assert np.allclose(result["offsets"], [0, 17, -42], atol=0.05)
+    assert result["phases"][1] == pytest.approx(-0.7, abs=1e-3)
+    assert result["quality"][0] == pytest.approx(1.0)
+    assert 0.8 < result["quality"][2] < 1.0
+
+    # A half-sample delay of a band-limited signal lands between two lags.
+    spectrum = np.fft.fft(reference[:length])
+    frequencies = np.fft.fftfreq(length)
+    spectrum[np.abs(frequencies) > 0.2] = 0
+    smooth = np.fft.ifft(spectrum)
+    delayed = np.fft.ifft(spectrum * np.exp(2j * np.pi * frequencies * 3.5))
+    result = estimate_offsets(np.stack([smooth, delayed]), max_lag=16)
+    assert result["offsets"][1] == pytest.approx(3.5, abs=0.2)
+
+def test_start_gate_releases_everyone_together():
+    gate = StartGate(3)
+    results, released = [], []
+
+    def stream():
+        results.append(gate.wait())
+        released.append(time.perf_counter())
+
+    threads = [threading.Thread(target=stream) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert gate.wait_armed(timeout=2.0)
+    assert not released
+    gate.release()
+    for thread in threads:
+        thread.join(timeout=2.0)
+    assert results == [True, True, True]
+
+    aborted = StartGate(2)
+    aborted.abort()
+    assert aborted.wait() is False
+    assert not aborted.wait_armed(timeout=0.01)
+
+def test_group_capture_aligns_devices_and_measures_injected_offsets(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    devices = control.list_devices()
+    prefix = str(tmp_path / "group")
+    group = control.start_group_capture(devices, prefix, sample_rate=RATE, center_freq=433_920_000,
+                                        buffer_size=16384, correlation_samples=1 << 15)
+    # Opened and tuned side by side: about one open, not three.
+    assert group.setup_seconds < 0.25
+    started = [device.stream_started_at for device in backend.devices]
+    assert max(started) - min(started) < 0.05
+    with pytest.raises(RuntimeError):
+        control.start_group_capture(devices[:1], prefix + "-again", sample_rate=RATE, center_freq=100_000_000)
+    time.sleep(0.7)
+    meta = control.stop_group_capture(group)
+
+    assert not control.groups and not control.streams
+    assert all(device.center_freq == 433_920_000 for device in backend.devices)
+    # Timestamps line the devices up to within a few milliseconds...
+    expected = expected_offsets(backend, group)
+    for measured, injected in zip(expected, OFFSETS):
+        assert abs(measured - injected) < 0.01 * RATE
+    # ...and the correlation measures what is left, to the sample.
+    for device, offset in zip(devices, expected):
+        estimate = meta["offsets"][device.serial]
+        assert estimate["offset_samples"] == pytest.approx(offset, abs=0.5)
+        assert estimate["quality"] > 0.5
+
+    with open(prefix + ".group.json") as f:
+        assert json.load(f)["offsets"] == meta["offsets"]
+    index = read_group_index(prefix)
+    for position, entry in enumerate(meta["devices"]):
+        rows = index[index["device"] == position]
+        assert len(rows) > 10
+        # Blocks sit back to back in the aligned output.
+        assert np.array_equal(rows["output_sample"][1:], (rows["output_sample"] + rows["num_samples"])[:-1])
+        assert rows["output_sample"][0] == 0
+        size = sum(os.path.getsize(path) for path in entry["files"])
+        assert size == 2 * entry["samples_written"]
+
+def test_restarted_member_is_realigned_and_gap_filled(backend, tmp_path):
+    backend.devices[1].fail_after_blocks = 40
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    control.supervisor.poll_interval = 0.05
+    devices = control.list_devices()
+    group = control.start_group_capture(devices, str(tmp_path / "group"), sample_rate=RATE,
+                                        center_freq=100_000_000, buffer_size=16384, settle_time=0.05,
+                                        correlation_samples=1 << 12)
+    time.sleep(0.8)
+    backend.devices[1].fail_after_blocks = None
+    time.sleep(0.3)
+    meta = control.stop_group_capture(group)
+
+    stats = {entry["serial"]: entry for entry in meta["devices"]}
+    restarted = stats[devices[1].serial]
+    assert restarted["restarts"] >= 1
+    assert restarted["fill_samples"] > 0
+    # Filled across the outage, it stays level with the others to within a few blocks.
+    written = [entry["samples_written"] for entry in meta["devices"]]
+    assert max(written) - min(written) < 8 * 8192
+
+def test_arm_timeout_stops_every_stream_for_good(backend, tmp_path, monkeypatch):
+    slow = backend.devices[2]
+    reset_buffer = slow.reset_buffer
+
+    def slow_reset():
+        time.sleep(0.4)  # Still resetting when arming gives up
+        reset_buffer()
+
+    monkeypatch.setattr(slow, "reset_buffer", slow_reset)
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    control.supervisor.poll_interval = 0.05
+    stop = control.supervisor.stop
+
+    def slow_stop(device):
+        time.sleep(0.15)  # Give the monitor a few passes between abort and stop
+        return stop(device)
+
+    monkeypatch.setattr(control.supervisor, "stop", slow_stop)
+    created = []
+    factory = control.supervisor.stream_factory
+
+    def counting_factory(device, spec):
+        created.append(device.serial)
+        return factory(device, spec)
+
+    monkeypatch.setattr(control.supervisor, "stream_factory", counting_factory)
+    with pytest.raises(RuntimeError, match="armed"):
+        control.start_group_capture(control.list_devices(), str(tmp_path / "group"), sample_rate=RATE,
+                                    center_freq=100_000_000, buffer_size=16384, arm_timeout=0.1)
+    assert control.streams == {} and control.groups == {}
+    # The aborted streams are not mistaken for dead ones and restarted.
+    time.sleep(0.3)
+    assert control.streams == {}
+    assert sorted(created) == sorted(device.serial for device in control.list_devices())
+    assert all(device.delivered_blocks == 0 for device in backend.devices)
+
+def test_block_left_in_the_ring_is_placed_before_a_later_gap():
+    block, lost = 4096, 3 * 4096
+    period = block / RATE
+    timeline = BlockTimeline(RATE)
+    written = []
+    group = SimpleNamespace(
+        control=SimpleNamespace(get_block_timeline=lambda device: timeline),
+        start_time=None, sample_rate=RATE, correlation_samples=block, buffer_size=2 * block,
+        _index=lambda *args: None,
+    )
+    member = _AlignedMember(group, 0, SimpleNamespace(serial="SIM"), SimpleNamespace(write=written.append))
+
+    def deliver(seq):
+        member(np.full(2 * block, seq, dtype=np.uint8), timeline.row(seq))
+
+    def record(seq):
+        # Blocks 100 on arrive three transfers late: samples were lost before block 100.
+        timeline.record(10.0 + (seq + 1 + (3 if seq >= 100 else 0)) * period, block)
+
+    record(0)
+    group.start_time = float(timeline.row(0)["sample_time"])
+    deliver(0)
+    for seq in range(1, 99):
+        record(seq)
+        deliver(seq)
+    late = 100 + CONFIRM_BLOCKS
+    for seq in range(99, late):
+        record(seq)
+    # Block 99 was still in the ring when the gap was confirmed.
+    assert timeline.gaps == 1 and timeline.lost_samples == lost
+    for seq in range(99, late):
+        deliver(seq)
+
+    out = np.concatenate(written)
+    assert member.fill_samples == lost
+    assert out.shape[0] == 2 * (late * block + lost)
+    assert np.all(out[2 * 99 * block:2 * 100 * block] == 99)
+    assert np.all(out[2 * 100 * block:2 * (100 * block + lost)] == FILL_VALUE)
+    assert np.all(out[2 * (100 * block + lost):2 * (101 * block + lost)] == 100)
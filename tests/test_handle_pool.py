@@ -0,0 +1,113 @@
+# tests/test_handle_pool.py
+
+import threading
+import time
+
+import pytest
+
+from src.ddrtlsdr.control_manager import DeviceControlManager
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.handle_pool import HandlePool
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.metrics import render_prometheus
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+OPEN_LATENCY = 0.1
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=6, sample_rate=1_000_000, open_latency=OPEN_LATENCY)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def test_open_devices_opens_and_configures_in_parallel(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    devices = control.list_devices()
+    settings = {device.serial: {"center_freq": 100_000_000 + i, "sample_rate": 2_048_000}
+                for i, device in enumerate(devices)}
+    settings[devices[0].serial]["bandwidth"] = 1
+    start = time.perf_counter()
+    errors = control.open_devices(settings=settings)
+    elapsed = time.perf_counter() - start
+
+    # Six serial opens would take 0.6 s.
+    assert elapsed < 3 * OPEN_LATENCY
+    assert isinstance(errors[devices[0].serial], ValueError)
+    assert all(errors[device.serial] is None for device in devices[1:])
+    # Rejected before opening; the others are not held up by it.
+    assert sorted(control.open_handles) == sorted(device.serial for device in devices[1:])
+    for i, sim in enumerate(backend.devices[1:], start=1):
+        assert sim.center_freq == 100_000_000 + i and sim.sample_rate == 2_048_000
+    stats = control.get_handle_stats(devices[1])
+    assert stats["open"] and stats["opens"] == 1 and stats["attempts"] == 1
+    assert stats["open_seconds"] == pytest.approx(OPEN_LATENCY, abs=0.05)
+
+    # Warm handles are reused rather than reopened.
+    control.get_center_frequency(devices[1])
+    assert control.get_handle_stats(devices[1])["opens"] == 1
+    text = render_prometheus(control)
+    assert f'ddrtlsdr_device_open{{serial="{devices[1].serial}"}} 1' in text
+    assert f'ddrtlsdr_device_open_seconds{{serial="{devices[1].serial}"}}' in text
+    control.pool.shutdown()
+
+def test_busy_device_is_retried_with_backoff(backend, tmp_path):
+    pool = HandlePool(open_attempts=3, retry_backoff=0.05)
+    device = DeviceControl(config_file=str(tmp_path / "config.json")).list_devices()[0]
+    _, held = backend.open(0)  # Another process has the dongle
+    threading.Timer(0.2, backend.close, args=(held,)).start()
+    handle = pool.open(device, timeout=2.0)
+    stats = pool.stats(device.serial)
+    assert handle is backend.devices[0]
+    assert stats["attempts"] > 1 and stats["failures"] == stats["attempts"] - 1
+    assert stats["open_seconds"] >= 0.2
+    pool.close(device)
+
+    _, held = backend.open(0)
+    with pytest.raises(IOError):
+        pool.open(device)
+    assert pool.stats(device.serial)["failures"] == stats["failures"] + 3
+    assert not pool.stats(device.serial)["open"]
+    backend.close(held)
+
+def test_idle_handles_are_closed_unless_streaming(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"), handle_idle_timeout=0.2)
+    idle, streaming, used = control.list_devices()[:3]
+    for device in (idle, streaming, used):
+        control.open_device_cached(device)
+    control.start_stream(streaming, lambda data: None, buffer_size=16384, output_format="uint8")
+    deadline = time.monotonic() + 0.6
+    while time.monotonic() < deadline:
+        control.get_gain(used)
+        time.sleep(0.05)
+
+    assert not control.is_device_open(idle)
+    assert control.is_device_open(streaming) and control.is_device_open(used)
+    assert control.get_handle_stats(idle)["opens"] == 1
+    # The next call simply reopens it.
+    control.get_center_frequency(idle)
+    assert control.get_handle_stats(idle)["opens"] == 2
+    control.stop_stream(streaming)
+    control.pool.shutdown()
+
+def test_control_manager_shares_the_pool_behaviour(backend, tmp_path):
+    device = DeviceControl(config_file=str(tmp_path / "config.json")).list_devices()[0]
+    manager = DeviceControlManager()
+    handle = manager.open_handle(device)
+    assert manager.open_handle(device) is handle
+    assert manager.pool.stats(device.serial)["opens"] == 1
+    manager.close_handle(device)
+    assert manager.open_handles == {}
+
+def test_open_hands_out_the_handle_it_opened(backend, tmp_path, monkeypatch):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    open_device = control._open_device
+
+    def open_then_reaped(device):
+        handle = open_device(device)
+        control.pool.close(device)  # The reaper gets in as soon as the command lock is dropped
+        return handle
+
+    monkeypatch.setattr(control, "_open_device", open_then_reaped)
+    assert control.open_device_cached(device) is backend.devices[0]
@@ -0,0 +1,60 @@
+# tests/test_iq_conversion.py
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.iq_conversion import IQConverter
+
+@pytest.fixture
+def raw():
+    return np.random.default_rng(0).integers(0, 256, 4096, dtype=np.uint8)
+
+def naive(raw):
+    x = (raw.astype(np.float32) - 127.5) / 127.5
+    return x[0::2] + 1j * x[1::2]
+
+@pytest.mark.parametrize("lut", ["pair", "byte"])
+def test_matches_naive_formula(raw, lut):
+    converted = IQConverter(lut=lut).convert(raw)
+    assert converted.dtype == np.complex64
+    np.testing.assert_allclose(converted, naive(raw), atol=1e-6)
+
+def test_writes_into_caller_output(raw):
+    out = np.empty(2048, dtype=np.complex64)
+    assert IQConverter().convert(raw, out=out) is out
+    with pytest.raises(ValueError):
+        IQConverter().convert(raw, out=np.empty(10, dtype=np.complex64))
+
+def test_batch_matches_single_blocks(raw):
+    converter = IQConverter()
+    batch = converter.convert(raw.reshape(4, -1)).copy()
+    for row, block in zip(batch, raw.reshape(4, -1)):
+        np.testing.assert_array_equal(row, IQConverter().convert(block))
+
+def test_iq_imbalance_correction_restores_quadrature():
+    n = np.arange(8192)
+    tone = np.exp(2j * np.pi * 0.01 * n)
+    gain, phase = 1.2, 0.1
+    i = tone.real
+    q = gain * (tone.imag * np.cos(phase) + tone.real * np.sin(phase))
+    raw = np.empty(2 * n.size, dtype=np.uint8)
+    raw[0::2] = np.clip(np.round(i * 100 + 127.5), 0, 255)
+    raw[1::2] = np.clip(np.round(q * 100 + 127.5), 0, 255)
+
+    uncorrected = IQConverter().convert(raw)
+    corrected = IQConverter(gain_imbalance=gain, phase_imbalance=phase).convert(raw)
+    image = np.abs(np.vdot(np.exp(-2j * np.pi * 0.01 * n), corrected))
+    wanted = np.abs(np.vdot(np.exp(2j * np.pi * 0.01 * n), corrected))
+    assert image / wanted < 0.01
+    assert np.abs(np.vdot(np.exp(-2j * np.pi * 0.01 * n), uncorrected)) / wanted > 0.05
+
+def test_dc_removal_converges():
+    raw = np.full(4096, 160, dtype=np.uint8)
+    converter = IQConverter(dc_removal=True, dc_alpha=0.5)
+    for _ in range(30):
+        out = converter.convert(raw)
+    assert np.abs(out).max() < 1e-3
+
+def test_correction_requires_pair_lut():
+    with pytest.raises(ValueError):
+        IQConverter(lut="byte", gain_imbalance=1.1)
@@ -0,0 +1,69 @@
+# tests/test_iq_reader.py
+
+import time
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.iq_reader import IQFileReader, ReplayStream
+from src.ddrtlsdr.recorder import IQRecorder
+
+@pytest.fixture
+def cu8_file(tmp_path):
+    path = tmp_path / "capture.cu8"
+    (np.arange(2000) % 256).astype(np.uint8).tofile(path)
+    return str(path)
+
+def test_blocks_are_views_of_the_map(cu8_file):
+    reader = IQFileReader(cu8_file, sample_rate=1_000_000)
+    assert reader.num_samples == 1000
+    blocks = list(reader.blocks(300))
+    assert [b.shape[0] for b in blocks] == [600, 600, 600, 200]
+    assert all(np.shares_memory(b, reader.raw) for b in blocks)
+    assert np.array_equal(np.concatenate(blocks), reader.raw)
+    assert len(list(reader.blocks(300, partial=False))) == 3
+
+def test_windows_overlap_on_sample_boundaries(cu8_file):
+    reader = IQFileReader(cu8_file)
+    windows = list(reader.windows(100, 50))
+    assert len(windows) == 19
+    assert windows[1][0] == 100  # Second window starts at sample 50, byte 100
+    assert np.shares_memory(windows[0], reader.raw)
+
+def test_sigmf_metadata_is_picked_up(tmp_path):
+    recorder = IQRecorder(str(tmp_path / "rec"), 2_048_000, 433_920_000, datatype="cf32_le")
+    data = (np.arange(64) + 1j * np.arange(64)).astype(np.complex64)
+    recorder.write(data)
+    recorder.close()
+
+    reader = IQFileReader(recorder.files[0])
+    assert reader.datatype == "cf32_le"
+    assert reader.sample_rate == 2_048_000
+    assert reader.center_freq == 433_920_000
+    assert np.array_equal(reader.samples, data)
+
+def test_replay_matches_stream_formats(cu8_file):
+    reader = IQFileReader(cu8_file)
+    received = []
+    assert reader.replay(received.append, buffer_size=512, output_format="bytes") == 4
+    assert b"".join(received) == reader.raw.tobytes()
+
+    received = []
+    reader.replay(lambda data: received.append(data.copy()), buffer_size=512, output_format="complex64")
+    assert received[0].dtype == np.complex64
+    assert sum(block.shape[0] for block in received) == reader.num_samples
+
+def test_realtime_replay_is_paced(cu8_file):
+    reader = IQFileReader(cu8_file, sample_rate=10_000)  # 1000 samples = 100 ms
+    start = time.perf_counter()
+    reader.replay(lambda data: None, buffer_size=200, realtime=True)
+    assert time.perf_counter() - start >= 0.08
+
+def test_replay_stream_stops_a_looping_replay(cu8_file):
+    reader = IQFileReader(cu8_file, sample_rate=100_000)
+    stream = ReplayStream(reader, lambda data: None, buffer_size=200, loop=True)
+    stream.start()
+    time.sleep(0.05)
+    stream.stop()
+    assert stream.blocks_received > 5
+    assert not stream.running
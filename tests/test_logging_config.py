@@ -0,0 +1,85 @@
+# tests/test_logging_config.py
+
+import logging
+
+import pytest
+
+from src.ddrtlsdr.logging_config import RateLimitFilter, setup_logging
+
+@pytest.fixture
+def log_dir(tmp_path):
+    yield tmp_path
+    setup_logging(force=True)
+
+def read_log(log_dir):
+    return (log_dir / "ddrtlsdr.log").read_text()
+
+def test_setup_is_idempotent(log_dir):
+    setup_logging(log_directory=str(log_dir), force=True)
+    logger = logging.getLogger("ddrtlsdr")
+    handlers = list(logger.handlers)
+    for _ in range(5):
+        setup_logging()
+    assert logger.handlers == handlers
+    logging.getLogger("ddrtlsdr.test").info("once")
+    for handler in handlers:
+        handler.flush()
+    assert read_log(log_dir).count("once") == 1
+
+def test_queue_mode_and_lazy_arguments(log_dir):
+    setup_logging(log_directory=str(log_dir), level="INFO", use_queue=True, force=True)
+    logger = logging.getLogger("ddrtlsdr.test")
+    assert [type(handler).__name__ for handler in logger.parent.handlers] == ["_DeferredQueueHandler"]
+    formatted = []
+
+    class Traced:
+        def __init__(self, name):
+            self.name = name
+
+        def __str__(self):
+            formatted.append(self.name)
+            return self.name
+
+    logger.info("value %s", Traced("kept"))
+    logger.debug("value %s", Traced("below level"))
+    setup_logging(log_directory=str(log_dir), force=True)  # Stops the listener, draining the queue
+    assert "value kept" in read_log(log_dir)
+    assert "below level" not in formatted
+
+def test_rate_limit_per_call_site():
+    limiter = RateLimitFilter(rate=1.0, burst=3)
+    logger = logging.getLogger("ddrtlsdr.test.rate")
+
+    def record(level=logging.INFO, lineno=10):
+        return logger.makeRecord(logger.name, level, "hot.py", lineno, "tick %d", (1,), None)
+
+    passed = [limiter.filter(record()) for _ in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+    assert limiter.filter(record(lineno=11))
+    assert limiter.filter(record(level=logging.WARNING))
+    limiter._buckets[("hot.py", 10)][0] = 1.0  # As if a second had passed
+    resumed = record()
+    assert limiter.filter(resumed)
+    assert resumed.getMessage() == "tick 1 (7 similar messages suppressed)"
+    assert limiter.suppressed == 7
+
+def test_rate_limit_notes_suppression_once_across_handlers(log_dir, capsys):
+    setup_logging(log_directory=str(log_dir), level="DEBUG", rate_limit=1.0, force=True)
+    handlers = logging.getLogger("ddrtlsdr").handlers
+    assert len(handlers) == 2
+    limiter = handlers[0].filters[0]
+    assert all(handler.filters == [limiter] for handler in handlers)
+
+    logger = logging.getLogger("ddrtlsdr.test.hot")
+    for i in range(6):
+        if i == 5:
+            for bucket in limiter._buckets.values():
+                bucket[0] = 1.0  # As if a second had passed
+        logger.info("hot %d", i)
+    for handler in handlers:
+        handler.flush()
+
+    assert limiter.suppressed == 4
+    for output in (read_log(log_dir), capsys.readouterr().err):
+        assert "hot 5 (4 similar messages suppressed)\n" in output
+        assert output.count("suppressed") == 1
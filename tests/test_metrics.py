@@ -0,0 +1,100 @@
+# tests/test_metrics.py
+
+import importlib
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.ddrtlsdr.async_control import AsyncDeviceControl
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.metrics import ControlCallMetrics, Histogram, StreamMetrics, render_prometheus
+from src.ddrtlsdr.models import SDRConfig
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1, sample_rate=1_000_000)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+@pytest.fixture
+def client(backend, tmp_path):
+    with patch.object(SDRConfig, "save"):
+        api = importlib.import_module("src.ddrtlsdr.api")
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    with patch.object(api, "device_control", control), \
+         patch.object(api, "async_control", AsyncDeviceControl(control)):
+        yield TestClient(api.app), control
+
+def test_histogram_buckets_are_cumulative_and_inclusive():
+    histogram = Histogram((1.0, 2.0))
+    for value in (0.5, 1.0, 1.5, 3.0):
+        histogram.observe(value)
+    assert list(histogram.cumulative()) == [(1.0, 2), (2.0, 3), (float("inf"), 4)]
+    assert histogram.sum == 6.0 and histogram.count == 4
+
+def test_stream_metrics_jitter_and_gaps():
+    metrics = StreamMetrics()
+    now = 0.0
+    for i in range(100):
+        now += 0.010 + (0.001 if i % 2 else -0.001)
+        metrics.block_arrived(now)
+    assert metrics.mean_interval == pytest.approx(0.010, rel=0.05)
+    assert 0.0005 < metrics.jitter < 0.0015
+    assert metrics.gaps == 0
+    metrics.block_arrived(now + 0.050)
+    assert metrics.gaps == 1
+    assert metrics.intervals.count == 100
+
+def test_control_calls_are_labeled_by_device(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    calls = ControlCallMetrics()
+    with patch("src.ddrtlsdr.librtlsdr_wrapper.control_calls", calls), \
+         patch("src.ddrtlsdr.handle_pool.control_calls", calls):
+        control.set_center_frequency(device, 101_000_000)
+        control.get_center_frequency(device)
+        control.close_device_cached(device)
+    histograms = {(function, label): histogram.count for function, label, histogram in calls.items()}
+    assert histograms[("open", "")] == 1
+    assert histograms[("set_center_freq", device.serial)] == 1
+    assert histograms[("get_center_freq", device.serial)] == 1
+    assert histograms[("close", device.serial)] == 1
+
+def test_command_outcomes_add_up_to_submitted(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    control.set_center_frequency(device, 101_000_000)
+    control.set_center_frequency(device, 101_000_000)  # Already applied: skipped
+    text = render_prometheus(control)
+    labels = f'serial="{device.serial}"'
+    assert f"ddrtlsdr_commands_submitted_total{{{labels}}} 2" in text
+    assert f'ddrtlsdr_commands_total{{{labels},outcome="applied"}} 1' in text
+    assert f'ddrtlsdr_commands_total{{{labels},outcome="skipped"}} 1' in text
+    assert 'outcome="submitted"' not in text
+    control.close_device_cached(device)
+
+def test_metrics_endpoint(client):
+    api_client, control = client
+    device = control.list_devices()[0]
+    control.start_stream(device, lambda data: None, buffer_size=16384, output_format="uint8", ring_depth=8)
+    time.sleep(0.3)
+    try:
+        response = api_client.get("/metrics")
+    finally:
+        control.stop_stream(device)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    labels = f'serial="{device.serial}"'
+    assert "# TYPE ddrtlsdr_stream_bytes_total counter" in text
+    assert "# TYPE ddrtlsdr_stream_restarts_total counter" in text
+    assert f"ddrtlsdr_stream_restarts_total{{{labels}}} 0" in text
+    bytes_line = next(line for line in text.splitlines() if line.startswith(f"ddrtlsdr_stream_bytes_total{{{labels}}}"))
+    assert int(bytes_line.split()[-1]) > 0
+    assert f'ddrtlsdr_stream_callback_seconds_bucket{{{labels},le="+Inf"}}' in text
+    assert 'ddrtlsdr_control_call_seconds_bucket{function="open",device="",le="+Inf"}' in text
@@ -84,3 +84,23 @@ def test_sdr_config_save_load(tmp_path):
     assert len(loaded_config.devices) == 2
     assert loaded_config.devices[0].serial == "Serial1"
     assert loaded_config.devices[1].serial == "Serial2"
+    assert loaded_config.get_device("Serial2") is loaded_config.devices[1]
+
+def test_sdr_config_serial_index():
+    config = SDRConfig()
+    device = SDRDevice(
+        index=0,
+        name="Device1",
+        serial="Serial1",
+        manufacturer="Manufacturer1",
+        product="Product1"
+    )
+    assert config.add_device(device)
+    assert not config.add_device(device.model_copy(update={"index": 3}))
+    assert config.get_device("Serial1") is device
+    assert config.get_device("Missing") is None
+    assert len(config.devices) == 1
+
+    config.devices.append(device.model_copy(update={"serial": "Serial2"}))
+    config.reindex()
+    assert config.get_device("Serial2").index == 0
@@ -0,0 +1,73 @@
+# tests/test_read_samples.py
+
+import ctypes
+
+import numpy as np
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.models import SDRDevice
+
+@pytest.fixture
+def device():
+    return SDRDevice(
+        index=0,
+        name="Device1",
+        serial="Serial1",
+        manufacturer="Manufacturer1",
+        product="Product1"
+    )
+
+@pytest.fixture
+def reads():
+    return []
+
+@pytest.fixture
+def device_control(reads):
+    counter = [0]
+
+    def fake_read_sync(handle, address, length):
+        # Deliver at most 1024 bytes per call to exercise short reads.
+        n = min(length, 1024)
+        ctypes.memset(address, counter[0] % 256, n)
+        counter[0] += 1
+        reads.append(length)
+        return n
+
+    with patch("src.ddrtlsdr.device_control.DeviceManager.initialize_devices"), \
+         patch("src.ddrtlsdr.handle_pool.open_device", return_value=MagicMock()), \
+         patch("src.ddrtlsdr.device_control.reset_buffer") as mock_reset, \
+         patch("src.ddrtlsdr.device_control.read_sync", side_effect=fake_read_sync):
+        control = DeviceControl()
+        control.mock_reset = mock_reset
+        yield control
+
+def test_read_samples_into_pooled_buffer(device_control, device, reads):
+    first = device_control.read_samples(device, 1000)
+    assert first.shape == (2000,)
+    assert first.dtype == np.uint8
+    assert sum(min(length, 1024) for length in reads) == 2048, "Reads are rounded up to 512 bytes"
+    np.testing.assert_array_equal(first[:1024], 0)
+    np.testing.assert_array_equal(first[1024:], 1)
+
+    second = device_control.read_samples(device, 1000)
+    assert second.base is first.base, "Pooled buffer should be reused"
+    device_control.mock_reset.assert_called_once()
+
+def test_read_samples_into_caller_buffer(device_control, device):
+    out = np.zeros(4096, dtype=np.uint8)
+    result = device_control.read_samples(device, 512, out=out)
+    assert result.base is out or result.ctypes.data == out.ctypes.data
+    assert result.shape == (1024,)
+
+def test_read_samples_rejects_bad_out(device_control, device):
+    with pytest.raises(ValueError):
+        device_control.read_samples(device, 512, out=np.zeros(100, dtype=np.uint8))
+    with pytest.raises(ValueError):
+        device_control.read_samples(device, 512, out=np.zeros(1024, dtype=np.float32))
+
+def test_read_samples_refuses_while_streaming(device_control, device):
+    device_control.streams[device.serial] = MagicMock()
+    with pytest.raises(RuntimeError):
+        device_control.read_samples(device, 512)
@@ -0,0 +1,103 @@
+# tests/test_recorder.py
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.recorder import IQRecorder
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1, sample_rate=1_000_000)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def read_meta(data_path):
+    with open(data_path.replace(".sigmf-data", ".sigmf-meta")) as f:
+        return json.load(f)
+
+@pytest.mark.parametrize("mode", ["mmap", "buffered"])
+def test_rotates_by_size_and_trims_last_file(tmp_path, mode):
+    recorder = IQRecorder(
+        str(tmp_path / "rec"), sample_rate=1_000_000, center_freq=100_000_000,
+        max_file_bytes=1000, mode=mode, write_buffer_size=256,
+    )
+    data = (np.arange(2500) % 256).astype(np.uint8)
+    for block in np.split(data, 5):
+        recorder(block)
+    recorder.close()
+
+    assert [len(open(p, "rb").read()) for p in recorder.files] == [1000, 1000, 500]
+    joined = b"".join(open(p, "rb").read() for p in recorder.files)
+    assert joined == data.tobytes()
+
+def test_rotates_by_time(tmp_path):
+    recorder = IQRecorder(str(tmp_path / "rec"), 1_000_000, 100_000_000, max_file_seconds=0.05)
+    recorder.write(b"\x01" * 64)
+    time.sleep(0.06)
+    recorder.write(b"\x02" * 64)
+    recorder.close()
+    assert len(recorder.files) == 2
+
+def test_sigmf_metadata(tmp_path):
+    recorder = IQRecorder(str(tmp_path / "rec"), 2_048_000, 433_920_000, gain=300)
+    recorder.write(b"\x80" * 100)
+    recorder.retune(868_000_000)
+    recorder.write(b"\x80" * 100)
+    recorder.close()
+
+    meta = read_meta(recorder.files[0])
+    assert meta["global"]["core:datatype"] == "cu8"
+    assert meta["global"]["core:sample_rate"] == 2_048_000
+    assert [c["core:sample_start"] for c in meta["captures"]] == [0, 50]
+    assert [c["core:frequency"] for c in meta["captures"]] == [433_920_000, 868_000_000]
+    assert meta["captures"][0]["ddrtlsdr:gain"] == 300
+    assert meta["captures"][0]["core:datetime"].endswith("Z")
+
+def test_device_control_records_stream(tmp_path, backend):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    control.set_center_frequency(device, 162_400_000)
+    recorder = control.start_recording(device, str(tmp_path / "dev"), buffer_size=16384)
+    with pytest.raises(RuntimeError):
+        control.start_recording(device, str(tmp_path / "other"))
+    time.sleep(0.2)
+    control.stop_recording(device)
+
+    assert recorder.bytes_written > 0
+    assert device.serial not in control.streams
+    meta = read_meta(recorder.files[0])
+    assert meta["captures"][0]["core:frequency"] == 162_400_000
+    assert meta["global"]["core:sample_rate"] == 1_000_000
+
+def test_settings_changed_while_recording_reach_the_metadata(tmp_path, backend):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    control.set_center_frequency(device, 162_400_000)
+    control.set_gain(device, 200)
+    recorder = control.start_recording(device, str(tmp_path / "dev"), buffer_size=16384)
+    time.sleep(0.15)
+    control.set_center_frequency(device, 162_550_000)
+    time.sleep(0.15)
+    control.set_gain(device, 300)
+    time.sleep(0.15)
+    control.set_sample_rate(device, 2_048_000)
+    time.sleep(0.15)
+    control.stop_recording(device)
+
+    first, second = (read_meta(path) for path in recorder.files)
+    assert [c["core:frequency"] for c in first["captures"]] == [162_400_000, 162_550_000, 162_550_000]
+    assert [c["ddrtlsdr:gain"] for c in first["captures"]] == [200, 200, 300]
+    starts = [c["core:sample_start"] for c in first["captures"]]
+    assert starts[0] == 0 < starts[1] < starts[2]
+    assert first["global"]["core:sample_rate"] == 1_000_000
+    # A new rate starts a new recording.
+    assert second["global"]["core:sample_rate"] == 2_048_000
+    assert second["captures"][0]["core:frequency"] == 162_550_000
+    assert second["captures"][0]["ddrtlsdr:gain"] == 300
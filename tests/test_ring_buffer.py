@@ -0,0 +1,77 @@
+# tests/test_ring_buffer.py
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.ring_buffer import SampleRingBuffer
+
+def block(value, size=4):
+    return np.full(size, value, dtype=np.uint8)
+
+def test_write_read_release_in_order():
+    ring = SampleRingBuffer(depth=3, block_size=4)
+    assert ring.write(block(1))
+    assert ring.write(block(2, size=2))
+
+    first = ring.read(timeout=0)
+    np.testing.assert_array_equal(first, block(1))
+    ring.release()
+
+    second = ring.read(timeout=0)
+    np.testing.assert_array_equal(second, block(2, size=2))
+    ring.release()
+
+    assert ring.read(timeout=0) is None
+    assert len(ring) == 0
+
+def test_full_ring_drops_and_counts_overruns():
+    ring = SampleRingBuffer(depth=2, block_size=4)
+    assert ring.write(block(1))
+    assert ring.write(block(2))
+    assert not ring.write(block(3))
+    assert not ring.write(block(4))
+
+    stats = ring.stats()
+    assert stats["drops"] == 2
+    assert stats["overruns"] == 1, "Consecutive drops belong to one overrun"
+    assert stats["high_water_mark"] == 2
+
+    ring.read(timeout=0)
+    ring.release()
+    assert ring.write(block(5))
+    assert not ring.write(block(6))
+    assert ring.stats()["overruns"] == 2
+
+def test_oversized_block_is_dropped():
+    ring = SampleRingBuffer(depth=2, block_size=4)
+    assert not ring.write(block(1, size=8))
+    assert ring.drops == 1
+    assert len(ring) == 0
+
+def test_consumer_thread_receives_all_blocks():
+    ring = SampleRingBuffer(depth=4, block_size=4)
+    received = []
+
+    def consume():
+        while len(received) < 100:
+            data = ring.read(timeout=1)
+            if data is None:
+                continue
+            received.append(int(data[0]))
+            ring.release()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    sent = 0
+    while sent < 100:
+        if ring.write(block(sent % 256)):
+            sent += 1
+    consumer.join(timeout=5)
+
+    assert received == [i % 256 for i in range(100)]
+
+def test_invalid_depth():
+    with pytest.raises(ValueError):
+        SampleRingBuffer(depth=0, block_size=4)
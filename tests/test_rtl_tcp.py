@@ -0,0 +1,63 @@
+# tests/test_rtl_tcp.py
+
+import asyncio
+import struct
+
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.rtl_tcp import R820T_GAINS, RtlTcpServer
+from src.ddrtlsdr.simulation import SimulatedBackend
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1, sample_rate=1_000_000)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+@pytest.fixture
+def control(backend, tmp_path):
+    return DeviceControl(config_file=str(tmp_path / "config.json"))
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+def test_clients_share_stream_and_commands_reach_device(backend, control):
+    device = control.list_devices()[0]
+    sim = backend.devices[0]
+
+    async def run():
+        server = RtlTcpServer(control, device, port=0)
+        await server.start()
+        a_reader, a_writer = await asyncio.open_connection("127.0.0.1", server.port)
+        b_reader, b_writer = await asyncio.open_connection("127.0.0.1", server.port)
+
+        header = await a_reader.readexactly(12)
+        assert header[:4] == b"RTL0"
+        assert struct.unpack(">II", header[4:]) == (5, len(R820T_GAINS))
+        await b_reader.readexactly(12)
+        assert len(await a_reader.readexactly(65536)) == 65536
+        assert len(await b_reader.readexactly(65536)) == 65536
+        assert len(control.streams) == 1
+
+        a_writer.write(struct.pack(">BI", 0x01, 433_920_000))
+        b_writer.write(struct.pack(">BI", 0x0D, 3))
+        await a_writer.drain()
+        await b_writer.drain()
+        await wait_for(lambda: sim.center_freq == 433_920_000 and sim.gain == R820T_GAINS[3])
+        a_writer.write(struct.pack(">BI", 0x04, 280))
+        await a_writer.drain()
+        await wait_for(lambda: sim.gain == 280)
+
+        for writer in (a_writer, b_writer):
+            writer.close()
+        await wait_for(lambda: server.clients == 0)
+        await server.stop()
+
+    asyncio.run(run())
+    assert control.get_gain(device) == 280
@@ -0,0 +1,88 @@
+# tests/test_scanner.py
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.scanner import FrequencyScanner
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+
+SAMPLE_RATE = 1_024_000
+TONE_FREQ = 100_100_000
+
+@pytest.fixture
+def backend():
+    device = SimulatedDevice(
+        sample_rate=SAMPLE_RATE, center_freq=100_000_000, tone_freq_hz=TONE_FREQ,
+        settle_time=0.001, serial="SIM00000", seed=1,
+    )
+    backend = SimulatedBackend(devices=[device])
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def test_dwell_and_settle_accounting():
+    retunes = []
+    received = []
+
+    def retune(freq):
+        retunes.append(freq)
+        return 100  # Samples still queued at the old frequency
+
+    scanner = FrequencyScanner(
+        [1, 2], dwell_samples=250, retune=retune,
+        callback=lambda freq, samples: received.append((freq, samples.shape[0] // 2)),
+        settle_samples=50, sweeps=1,
+    )
+    block = np.zeros(2 * 200, dtype=np.uint8)
+    for _ in range(6):
+        scanner(block)
+
+    # 50 settle, 250 at 1 (ends mid-block at 300), rest of that block,
+    # 100 backlog and 50 settle (up to 550), then 250 at 2.
+    assert received == [(1, 150), (1, 100), (2, 50), (2, 200)]
+    assert retunes == [2]
+    assert scanner.finished.is_set()
+    stats = scanner.stats()
+    assert stats["hops"] == 2 and stats["sweeps"] == 1
+    assert stats["samples_used"] == 500
+    assert stats["samples_discarded"] == 1200 - 500
+
+def test_blocks_are_tagged_with_their_frequency(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    plan = [100_000_000, 103_000_000, 99_900_000]
+    samples_by_freq = {freq: [] for freq in plan}
+
+    def collect(freq, samples):
+        samples_by_freq[freq].append(samples.copy())
+
+    scanner = control.start_scan(device, plan, dwell=0.01, callback=collect, settle_time=0.002, sweeps=3, buffer_size=8192)
+    assert scanner.wait(timeout=5)
+    assert control.get_device_info(device)["center_frequency"] == plan[-1]
+    control.stop_scan(device)
+    assert scanner.stats()["hops"] == 9
+
+    for freq, chunks in samples_by_freq.items():
+        raw = np.concatenate(chunks)
+        assert raw.shape[0] == 2 * 3 * int(0.01 * SAMPLE_RATE)
+        assert raw.min() > 0  # Nothing from the PLL settle window
+        iq = (raw.astype(np.float32) - 127.5).view(np.complex64)[:8192]
+        spectrum = np.abs(np.fft.fft(iq - iq.mean()))
+        bins = np.fft.fftfreq(8192, 1 / SAMPLE_RATE)
+        peak = bins[np.argmax(spectrum)]
+        if abs(TONE_FREQ - freq) < SAMPLE_RATE / 2:
+            assert abs(peak - (TONE_FREQ - freq)) < 2 * SAMPLE_RATE / 8192
+        else:
+            assert spectrum.max() < 10 * np.median(spectrum)  # Tone out of band: noise only
+
+def test_scan_refuses_a_busy_device(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    control.start_stream(device, lambda data: None)
+    try:
+        with pytest.raises(RuntimeError):
+            control.start_scan(device, [100_000_000], dwell=0.01, callback=lambda freq, samples: None)
+    finally:
+        control.stop_stream(device)
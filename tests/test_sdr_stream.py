@@ -0,0 +1,69 @@
+# tests/test_sdr_stream.py
+
+import ctypes
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import SDRStream
+
+CALLBACK_FUNC = ctypes.CFUNCTYPE(None, ctypes.POINTER(ctypes.c_uint8), ctypes.c_int, ctypes.py_object)
+
+@pytest.fixture
+def transfer_buffer():
+    buf = (ctypes.c_uint8 * 8)(0, 255, 127, 128, 10, 20, 30, 40)
+    return buf, ctypes.cast(buf, ctypes.POINTER(ctypes.c_uint8))
+
+def deliver(stream, transfer_buffer, times=1):
+    buf, ptr = transfer_buffer
+    c_callback = CALLBACK_FUNC(stream._c_callback)
+    for _ in range(times):
+        c_callback(ptr, len(buf), None)
+
+def test_bytes_format_copies(transfer_buffer):
+    received = []
+    stream = SDRStream(None, 8, received.append)
+    deliver(stream, transfer_buffer)
+    assert received == [bytes(transfer_buffer[0])]
+
+def test_uint8_format_is_a_view(transfer_buffer):
+    received = []
+    stream = SDRStream(None, 8, received.append, output_format="uint8")
+    deliver(stream, transfer_buffer, times=2)
+    buf, _ = transfer_buffer
+    assert received[0] is received[1], "View should be cached per transfer buffer"
+    assert received[0].__array_interface__["data"][0] == ctypes.addressof(buf)
+    np.testing.assert_array_equal(received[0], np.frombuffer(bytes(buf), dtype=np.uint8))
+
+def test_uint8_format_copy_on_request(transfer_buffer):
+    received = []
+    stream = SDRStream(None, 8, received.append, output_format="uint8", copy=True)
+    deliver(stream, transfer_buffer)
+    buf, _ = transfer_buffer
+    assert received[0].flags.owndata
+    assert received[0].__array_interface__["data"][0] != ctypes.addressof(buf)
+
+def test_complex64_format_reuses_output(transfer_buffer):
+    received = []
+    stream = SDRStream(None, 8, received.append, output_format="complex64")
+    deliver(stream, transfer_buffer, times=2)
+    assert received[0] is received[1]
+    assert received[0].dtype == np.complex64
+    raw = np.frombuffer(bytes(transfer_buffer[0]), dtype=np.uint8).astype(np.float32)
+    expected = (raw[0::2] - 127.5) / 127.5 + 1j * (raw[1::2] - 127.5) / 127.5
+    np.testing.assert_allclose(received[0], expected, rtol=1e-6)
+
+def test_invalid_output_format():
+    with pytest.raises(ValueError):
+        SDRStream(None, 8, output_format="float64")
+
+def test_ring_mode_only_copies_on_callback_thread(transfer_buffer):
+    received = []
+    stream = SDRStream(None, 8, received.append, output_format="uint8", ring_depth=2)
+    deliver(stream, transfer_buffer, times=3)
+
+    assert received == [], "Consumer must not run on the librtlsdr thread"
+    stats = stream.stats()
+    assert stats["blocks_written"] == 2
+    assert stats["drops"] == 1
+    np.testing.assert_array_equal(stream.ring.read(timeout=0), np.frombuffer(bytes(transfer_buffer[0]), dtype=np.uint8))
@@ -0,0 +1,73 @@
+# tests/test_simulation.py
+
+import time
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.backend import SDRBackend
+from src.ddrtlsdr.librtlsdr_wrapper import (
+    close_device,
+    get_device_count,
+    get_device_usb_strings,
+    open_device,
+    read_sync,
+    set_backend,
+    set_center_freq,
+    get_center_freq,
+)
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=2, sample_rate=1_000_000)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def test_wrapper_calls_reach_simulated_devices(backend):
+    assert get_device_count() == 2
+    assert get_device_usb_strings(1)[2] == "SIM00001"
+
+    handle = open_device(0)
+    set_center_freq(handle, 433_920_000)
+    assert get_center_freq(handle) == 433_920_000
+    with pytest.raises(IOError):
+        open_device(0)  # Busy, like a claimed USB interface
+    close_device(handle)
+    close_device(open_device(0))
+
+def test_incomplete_backend_fails_when_created():
+    class CountOnly(SDRBackend):
+        def get_device_count(self):
+            return 0
+
+    with pytest.raises(TypeError, match="read_async"):
+        CountOnly()
+    assert isinstance(SimulatedBackend(num_devices=1), SDRBackend)
+
+def test_read_sync_is_paced_by_sample_rate(backend):
+    handle = open_device(0)
+    out = np.zeros(200_000, dtype=np.uint8)  # 100k samples = 100 ms at 1 MS/s
+    start = time.perf_counter()
+    assert read_sync(handle, out.ctypes.data, out.shape[0]) == out.shape[0]
+    assert time.perf_counter() - start >= 0.09
+    assert out.std() > 0
+    close_device(handle)
+
+def test_tone_is_at_configured_offset():
+    device = SimulatedDevice(sample_rate=1_000_000, tone_offset_hz=125_000, noise_level=0.01, seed=0)
+    raw = np.empty(8192, dtype=np.uint8)
+    device.fill(raw, 0)
+    iq = (raw[0::2] - 127.5) + 1j * (raw[1::2] - 127.5)
+    spectrum = np.abs(np.fft.fftshift(np.fft.fft(iq)))
+    freqs = np.fft.fftshift(np.fft.fftfreq(iq.size, 1 / 1_000_000))
+    assert freqs[np.argmax(spectrum)] == pytest.approx(125_000, abs=250)
+
+def test_replays_file_in_a_loop(tmp_path):
+    recording = tmp_path / "capture.cu8"
+    np.arange(10, dtype=np.uint8).tofile(recording)
+    device = SimulatedDevice(signal="file", replay_path=str(recording))
+    out = np.empty(8, dtype=np.uint8)
+    device.fill(out, 3)  # Sample 3 starts at byte 6
+    np.testing.assert_array_equal(out, [6, 7, 8, 9, 0, 1, 2, 3])
@@ -0,0 +1,130 @@
+# tests/test_stream_supervisor.py
+
+import time
+
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl, SDRStream
+from src.ddrtlsdr.librtlsdr_wrapper import close_device, open_device, set_backend
+from src.ddrtlsdr.models import SDRDevice
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+from src.ddrtlsdr.stream_supervisor import StreamSpec, StreamSupervisor
+
+SAMPLE_RATE = 2_048_000
+BUFFER_SIZE = 16384  # 8192 samples, 250 callbacks/s at SAMPLE_RATE
+
+def make_device(i):
+    return SDRDevice(
+        index=i,
+        name=f"Device{i}",
+        serial=f"Serial{i}",
+        manufacturer="Manufacturer",
+        product="Product"
+    )
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=4, sample_rate=SAMPLE_RATE)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+@pytest.fixture
+def factory(backend):
+    def factory(device, spec):
+        return SDRStream(open_device(device.index), **spec.stream_kwargs())
+    return factory
+
+@pytest.fixture
+def release(backend):
+    released = []
+
+    def release(device):
+        released.append(device)
+        close_device(backend.devices[device.index])
+
+    release.released = released
+    return release
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+def test_reports_per_device_throughput(factory, release):
+    supervisor = StreamSupervisor(factory, release=release, poll_interval=0.2)
+    devices = [make_device(i) for i in range(4)]
+    try:
+        for device in devices:
+            supervisor.start(device, StreamSpec(lambda data: None, buffer_size=BUFFER_SIZE, output_format="uint8"))
+        time.sleep(1.0)
+        stats = supervisor.throughput()
+    finally:
+        supervisor.shutdown()
+
+    assert set(stats) == {d.serial for d in devices}
+    for entry in stats.values():
+        assert entry["samples_per_s"] == pytest.approx(SAMPLE_RATE, rel=0.2)
+        assert entry["callbacks_per_s"] == pytest.approx(SAMPLE_RATE / (BUFFER_SIZE // 2), rel=0.2)
+        assert entry["alive"]
+    assert sorted(d.serial for d in release.released) == sorted(d.serial for d in devices)
+    assert supervisor.streams == {}
+
+def test_restarts_dead_stream(backend, factory, release):
+    device = make_device(0)
+    backend.devices[0].fail_after_blocks = 10
+    supervisor = StreamSupervisor(factory, release=release, poll_interval=0.05, max_restarts=2)
+    try:
+        first = supervisor.start(device, StreamSpec(lambda data: None, buffer_size=BUFFER_SIZE))
+        assert wait_for(lambda: supervisor.streams.get(device.serial) not in (None, first))
+    finally:
+        supervisor.shutdown()
+
+def test_gives_up_after_max_restarts(backend, factory, release):
+    device = make_device(0)
+    backend.devices[0].fail_after_blocks = 0
+    supervisor = StreamSupervisor(factory, release=release, poll_interval=0.05, max_restarts=1)
+    try:
+        supervisor.start(device, StreamSpec(lambda data: None, buffer_size=BUFFER_SIZE))
+        assert wait_for(lambda: device.serial not in supervisor.streams)
+    finally:
+        supervisor.shutdown()
+
+def test_duplicate_start_returns_existing_stream(factory, release):
+    device = make_device(0)
+    supervisor = StreamSupervisor(factory, release=release)
+    try:
+        spec = StreamSpec(lambda data: None, buffer_size=BUFFER_SIZE)
+        assert supervisor.start(device, spec) is supervisor.start(device, spec)
+    finally:
+        supervisor.shutdown()
+    assert not supervisor.stop(device)
+
+def test_device_control_streams_simulated_devices(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    devices = control.list_devices()
+    assert [d.serial for d in devices] == [d.serial for d in backend.devices]
+
+    received = {d.serial: 0 for d in devices}
+
+    def counter(serial):
+        def callback(data):
+            received[serial] += 1
+        return callback
+
+    control.supervisor.poll_interval = 0.2
+    try:
+        for device in devices:
+            control.start_stream(device, counter(device.serial), buffer_size=BUFFER_SIZE, output_format="complex64", ring_depth=8)
+        time.sleep(1.0)
+        stats = control.get_stream_throughput()
+    finally:
+        for device in devices:
+            control.stop_stream(device)
+
+    assert all(count > 100 for count in received.values())
+    assert all(entry["drops"] == 0 for entry in stats.values())
+    assert control.open_handles == {}
@@ -0,0 +1,69 @@
+# tests/test_sweep.py
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend, SimulatedDevice
+from src.ddrtlsdr.sweep import SweepPlan, read_sweep_file
+
+TONE_FREQ = 100_300_000
+
+@pytest.fixture
+def backend():
+    device = SimulatedDevice(
+        sample_rate=1_024_000, tone_freq_hz=TONE_FREQ, amplitude=0.5, noise_level=0.01,
+        settle_time=0.001, serial="SIM00000", seed=3,
+    )
+    backend = SimulatedBackend(devices=[device])
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def test_plan_tiles_the_band():
+    plan = SweepPlan(24_000_000, 1_700_000_000, bin_hz=10_000, sample_rate=2_400_000, crop=0.25)
+    assert plan.fft_size == 256 and plan.bin_hz == 2_400_000 / 256
+    assert plan.keep == 192
+    spacing = np.diff(plan.centers)
+    assert np.all(np.abs(spacing - plan.hop_hz) <= 1)  # Kept slices abut exactly
+    assert plan.centers[0] - plan.hop_hz / 2 == pytest.approx(24_000_000, abs=1)
+    assert plan.centers[-1] + plan.hop_hz / 2 >= 1_700_000_000
+    assert plan.frequencies[-1] < 1_700_000_000
+
+def test_binary_sweep_finds_the_tone(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    plan = SweepPlan(99_000_000, 101_000_000, bin_hz=4_000, sample_rate=1_024_000, frames=8)
+    path = str(tmp_path / "sweep.bin")
+    sweep = control.start_sweep(device, plan, output_path=path, output_format="binary", sweeps=2)
+    assert sweep.scanner.wait(timeout=5)
+    control.stop_sweep(device)
+
+    freqs, timestamps, power = read_sweep_file(path)
+    assert power.shape == (2, plan.num_bins) and timestamps.shape == (2,)
+    assert np.allclose(freqs, plan.frequencies)
+    peak = np.argmax(power[-1])
+    assert abs(freqs[peak] - TONE_FREQ) <= 2 * plan.bin_hz
+    assert power[-1, peak] == pytest.approx(20 * np.log10(0.5), abs=2)  # dBFS
+    assert np.median(power[-1]) < power[-1, peak] - 40
+    stats = sweep.stats()
+    assert stats["sweeps"] == 2
+    assert stats["sweep_seconds"] == pytest.approx(sweep.sweep_seconds / 2) and stats["sweep_seconds"] > 0
+
+def test_csv_writes_one_rtl_power_line_per_hop(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    plan = SweepPlan(99_000_000, 101_000_000, bin_hz=4_000, sample_rate=1_024_000, frames=4)
+    path = tmp_path / "sweep.csv"
+    sweep = control.start_sweep(device, plan, output_path=str(path), sweeps=1)
+    assert sweep.scanner.wait(timeout=5)
+    control.stop_sweep(device)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == len(plan)
+    fields = lines[0].split(", ")
+    low, high, step, samples = float(fields[2]), float(fields[3]), float(fields[4]), int(fields[5])
+    assert low == 99_000_000 and samples == plan.dwell_samples
+    assert len(fields) - 6 == plan.keep
+    assert high - low == pytest.approx(step * plan.keep, abs=1)
@@ -0,0 +1,119 @@
+# tests/test_timeline.py
+
+import random
+import time
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+from src.ddrtlsdr.timeline import BlockTimeline
+
+RATE = 2_048_000
+BLOCK = 8192  # Samples per transfer
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1, sample_rate=1_000_000)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def feed(timeline, arrivals):
+    for now in arrivals:
+        timeline.record(now, BLOCK)
+
+def steady_arrivals(count, start=100.0, ppm=0.0, jitter=0.0, seed=1):
+    rng = random.Random(seed)
+    period = BLOCK / RATE * (1 + ppm * 1e-6)
+    return [start + (i + 1) * period + 0.0005 + rng.uniform(0, jitter) for i in range(count)]
+
+def test_sample_clock_fit_tracks_drift_through_jitter():
+    timeline = BlockTimeline(RATE, capacity=512)
+    feed(timeline, steady_arrivals(3000, ppm=40.0, jitter=0.0005))
+    assert timeline.drift_ppm == pytest.approx(40.0, abs=5.0)
+    assert timeline.gaps == 0
+
+    rows = timeline.query()
+    assert len(rows) == 512
+    assert list(rows["seq"]) == list(range(3000 - 512, 3000))
+    assert np.all(np.diff(rows["sample_index"]) == BLOCK)
+    # Sample times are smooth even though arrivals jitter by half a millisecond.
+    spacing = np.diff(rows["sample_time"])
+    assert np.allclose(spacing, BLOCK / RATE, rtol=1e-3)
+    assert np.all(rows["sample_time"] < rows["host_time"])
+
+def test_lost_transfers_are_counted_and_the_clock_moves_on():
+    timeline = BlockTimeline(RATE, capacity=4096)
+    arrivals = steady_arrivals(400, jitter=0.0002)
+    lost = 5
+    period = BLOCK / RATE
+    arrivals = arrivals[:200] + [t + lost * period for t in arrivals[200:]]
+    feed(timeline, arrivals)
+
+    assert timeline.gaps == 1
+    assert timeline.lost_samples == lost * BLOCK
+    gap = timeline.gap_rows()
+    assert list(gap["seq"]) == [200]
+    assert gap["lost_samples"][0] == lost * BLOCK
+    rows = timeline.query()
+    # Delivered samples stay contiguous; sample times jump over the hole.
+    assert rows["sample_index"][200] == 200 * BLOCK
+    # Rows recorded before the gap was confirmed are corrected too.
+    assert rows["lost_total"][199] == 0 and np.all(rows["lost_total"][200:] == lost * BLOCK)
+    assert rows["sample_time"][200] - rows["sample_time"][199] == pytest.approx((lost + 1) * period, rel=0.02)
+    assert rows["sample_time"][205] - rows["sample_time"][204] == pytest.approx(period, rel=0.02)
+
+def test_host_stall_that_catches_up_is_not_a_gap():
+    timeline = BlockTimeline(RATE)
+    arrivals = steady_arrivals(300)
+    # The callback thread stalls for ~5 blocks, then the queued transfers
+    # arrive back to back.
+    stall_end = arrivals[105] + 0.0001
+    arrivals = arrivals[:100] + [stall_end + i * 1e-5 for i in range(6)] + arrivals[106:]
+    feed(timeline, arrivals)
+    assert timeline.gaps == 0
+    assert timeline.lost_samples == 0
+
+def test_stream_callback_gets_block_metadata(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    rows = []
+    control.start_stream(device, lambda data, row: rows.append(row), buffer_size=16384,
+                         output_format="uint8", ring_depth=8, metadata=True)
+    time.sleep(0.4)
+    control.stop_stream(device)
+
+    assert len(rows) > 5
+    seqs = [int(row["seq"]) for row in rows]
+    assert seqs == sorted(set(seqs))
+    assert all(int(row["sample_index"]) == int(row["seq"]) * 8192 for row in rows)
+    assert all(row["sample_time"] < row["host_time"] for row in rows)
+    timeline = control.get_block_timeline(device)
+    assert timeline is not None and timeline.sample_rate == 1_000_000
+    # Blocks the ring had to drop are flagged rather than silently missing.
+    assert timeline.seq >= len(rows) + timeline.dropped
+    assert timeline.lost_samples == 0
+
+def test_samples_dropped_by_the_dongle_show_up_as_a_gap(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    blocks = []
+
+    def slow_once(data):
+        blocks.append(len(data))
+        if len(blocks) == 30:
+            time.sleep(0.3)  # Longer than the simulated USB buffers last
+
+    control.start_stream(device, slow_once, buffer_size=16384, output_format="uint8")
+    time.sleep(0.9)
+    control.stop_stream(device)
+
+    dropped = backend.devices[0].dropped_blocks
+    assert dropped > 0
+    timeline = control.get_block_timeline(device)
+    assert timeline.gaps == 1
+    assert timeline.lost_samples == pytest.approx(dropped * 8192, abs=8192)
+    assert timeline.gap_rows()["seq"][0] == 30
@@ -0,0 +1,75 @@
+# tests/test_worker_pool.py
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.ddrtlsdr.device_control import DeviceControl
+from src.ddrtlsdr.librtlsdr_wrapper import set_backend
+from src.ddrtlsdr.simulation import SimulatedBackend
+from src.ddrtlsdr.worker_pool import DSPWorkerPool
+
+@pytest.fixture
+def backend():
+    backend = SimulatedBackend(num_devices=1)
+    previous = set_backend(backend)
+    yield backend
+    set_backend(previous)
+
+def block_sum(block):
+    # Module-level so spawned workers can unpickle it.
+    if block[0] == 255:
+        raise ValueError("marker block")
+    return int(block.sum(dtype=np.int64))
+
+def test_results_arrive_in_stream_order():
+    results = []
+    pool = DSPWorkerPool(block_sum, lambda seq, result: results.append((seq, result)), num_workers=2, num_slots=8, slot_size=64)
+    rng = np.random.default_rng(0)
+    blocks = [rng.integers(0, 255, 64, dtype=np.uint8) for _ in range(40)]
+    for block in blocks:
+        while pool.in_flight == pool.num_slots:
+            threading.Event().wait(0.001)
+        pool(block)
+    pool.close()
+    assert results == [(seq, int(block.sum(dtype=np.int64))) for seq, block in enumerate(blocks)]
+    assert pool.stats()["drops"] == 0
+
+def test_drops_when_slots_are_exhausted_and_survives_errors():
+    results = []
+    pool = DSPWorkerPool(block_sum, lambda seq, result: results.append(seq), num_workers=1, num_slots=2, slot_size=16)
+    pool(np.full(16, 255, dtype=np.uint8))
+    for _ in range(20):
+        pool(np.ones(16, dtype=np.uint8))
+    pool(np.ones(32, dtype=np.uint8))  # Larger than a slot
+    pool.close()
+    stats = pool.stats()
+    assert stats["errors"] == 1
+    assert stats["drops"] >= 1
+    assert stats["blocks_in"] + stats["drops"] == 22
+    assert stats["blocks_done"] == stats["blocks_in"]
+    assert results == list(range(1, stats["blocks_in"]))
+
+def test_offload_device_stream(backend, tmp_path):
+    control = DeviceControl(config_file=str(tmp_path / "config.json"))
+    device = control.list_devices()[0]
+    done = threading.Event()
+    results = []
+
+    def on_result(seq, result):
+        results.append(result)
+        if len(results) >= 10:
+            done.set()
+
+    pool = control.start_offload(device, block_sum, on_result, num_workers=2, buffer_size=16384)
+    assert done.wait(30)
+    control.stop_offload(device)
+    assert device.serial not in control.streams
+    assert pool.closed
+    assert all(isinstance(result, int) for result in results)
+
+    control.start_stream(device, lambda data: None)
+    with pytest.raises(RuntimeError):
+        control.start_offload(device, block_sum)
+    control.stop_stream(device)